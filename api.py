@@ -0,0 +1,211 @@
+"""헤드리스 날씨 API (ASGI).
+
+Streamlit 페이지를 스크래핑하지 않고도 앱과 같은 조회/캐시/집계 코드(weather_data)로
+현재 날씨, 일별 예보, 시간별 예보를 JSON 또는 CSV로 받을 수 있습니다.
+
+실행:
+    pip install uvicorn
+    uvicorn api:app --host 0.0.0.0 --port 8000
+
+엔드포인트:
+    GET /v1/current?city=서울
+    GET /v1/daily?lat=37.5665&lon=126.978&format=csv
+    GET /v1/hourly?city=Tokyo&hours=48
+    GET /healthz
+
+응답에는 내용 기반 ETag와 캐시 나이로 계산한 Cache-Control(max-age)이 붙으므로,
+호출하는 쪽은 If-None-Match로 조건부 요청을 보내 304 응답을 받을 수 있습니다.
+"""
+
+import asyncio
+import csv
+import hashlib
+import io
+import json
+import time
+from datetime import datetime, timedelta, timezone
+from urllib.parse import parse_qs
+
+import weather_data as weather
+
+ROUTES = ('/v1/current', '/v1/daily', '/v1/hourly')
+
+
+class ApiError(Exception):
+    def __init__(self, status, message):
+        super().__init__(message)
+        self.status = status
+        self.message = message
+
+
+def _local_time(dt, timezone_offset):
+    return (datetime.fromtimestamp(dt, timezone.utc) + timedelta(seconds=timezone_offset)).strftime('%Y-%m-%d %H:%M')
+
+
+def resolve_location(query):
+    """쿼리의 city 또는 lat/lon으로 현재 날씨를 가져옵니다."""
+    city = query.get('city')
+    if city:
+        weather_data = weather.get_weather(city)
+        if not weather_data or str(weather_data.get('cod')) == '404':
+            raise ApiError(404, f"'{city}' 도시를 찾을 수 없습니다.")
+        return weather_data
+
+    try:
+        lat = float(query['lat'])
+        lon = float(query['lon'])
+    except (KeyError, ValueError):
+        raise ApiError(400, "city 또는 lat/lon 파라미터가 필요합니다.")
+    if not (-90 <= lat <= 90 and -180 <= lon <= 180):
+        raise ApiError(400, "좌표 범위가 올바르지 않습니다.")
+
+    weather_data = weather.get_weather_by_coords(lat, lon)
+    if not weather_data:
+        raise ApiError(502, "날씨 정보를 가져올 수 없습니다.")
+    return weather_data
+
+
+def current_rows(weather_data):
+    main = weather_data['main']
+    return [{
+        'name': weather_data['name'],
+        'country': weather_data['sys'].get('country', ''),
+        'lat': weather_data['coord']['lat'],
+        'lon': weather_data['coord']['lon'],
+        'dt': weather_data['dt'],
+        'local_time': _local_time(weather_data['dt'], weather_data.get('timezone', 0)),
+        'temp': main['temp'],
+        'feels_like': main['feels_like'],
+        'temp_min': main['temp_min'],
+        'temp_max': main['temp_max'],
+        'humidity': main['humidity'],
+        'pressure': main['pressure'],
+        'wind_speed': weather_data.get('wind', {}).get('speed'),
+        'description': weather.weather_description(weather_data),
+        'icon': weather_data['weather'][0]['icon']
+    }]
+
+
+def daily_rows(forecast_data):
+    rows = []
+    for date_key, item in weather.aggregate_daily_forecast(forecast_data, days=8):
+        rows.append({
+            'date': date_key,
+            'temp': item['main']['temp'],
+            'temp_min': item['main']['temp_min'],
+            'temp_max': item['main']['temp_max'],
+            'humidity': item['main']['humidity'],
+            'pop': item.get('pop', 0),
+            'description': weather.weather_description(item),
+            'icon': item['weather'][0]['icon']
+        })
+    return rows
+
+
+def hourly_rows(forecast_data, hours):
+    time_index = weather.forecast_time_index(forecast_data)
+    rows = []
+    for position, item in weather.hourly_forecast_entries(forecast_data, hours=hours):
+        rows.append({
+            'dt': item['dt'],
+            'local_time': time_index.local_time(position),
+            'temp': item['main']['temp'],
+            'feels_like': item['main']['feels_like'],
+            'humidity': item['main']['humidity'],
+            'pop': item.get('pop', 0),
+            'description': weather.weather_description(item),
+            'icon': item['weather'][0]['icon']
+        })
+    return rows
+
+
+def build_response(path, query):
+    """(행 목록, 데이터를 가져온 시각)을 반환합니다."""
+    weather_data = resolve_location(query)
+    if path == '/v1/current':
+        return current_rows(weather_data), weather_data.get('fetched_at')
+
+    coord = weather_data['coord']
+    forecast_data = weather.get_forecast_data(coord['lat'], coord['lon'])
+    if not forecast_data:
+        raise ApiError(502, "예보 데이터를 가져올 수 없습니다.")
+    if path == '/v1/daily':
+        return daily_rows(forecast_data), forecast_data.get('fetched_at')
+
+    try:
+        hours = min(max(int(query.get('hours', 24)), 3), 120)
+    except ValueError:
+        raise ApiError(400, "hours는 정수여야 합니다.")
+    return hourly_rows(forecast_data, hours), forecast_data.get('fetched_at')
+
+
+def encode(rows, fmt):
+    if fmt == 'csv':
+        buffer = io.StringIO()
+        if rows:
+            writer = csv.DictWriter(buffer, fieldnames=list(rows[0]))
+            writer.writeheader()
+            writer.writerows(rows)
+        return buffer.getvalue().encode('utf-8'), 'text/csv; charset=utf-8'
+    return json.dumps({'data': rows}, ensure_ascii=False).encode('utf-8'), 'application/json; charset=utf-8'
+
+
+def handle(path, query, if_none_match):
+    """요청 하나를 처리해 (상태 코드, 헤더 목록, 본문)을 반환합니다. 블로킹 함수입니다."""
+    if path == '/healthz':
+        return 200, [(b'content-type', b'text/plain')], b'ok'
+    if path not in ROUTES:
+        return 404, [(b'content-type', b'application/json')], b'{"error": "not found"}'
+
+    fmt = query.get('format', 'json')
+    if fmt not in ('json', 'csv'):
+        return 400, [(b'content-type', b'application/json')], b'{"error": "format must be json or csv"}'
+
+    try:
+        rows, fetched_at = build_response(path, query)
+    except ApiError as e:
+        body = json.dumps({'error': e.message}, ensure_ascii=False).encode('utf-8')
+        return e.status, [(b'content-type', b'application/json; charset=utf-8')], body
+
+    body, content_type = encode(rows, fmt)
+    etag = '"' + hashlib.sha1(body).hexdigest() + '"'
+    # 캐시에 남은 시간만큼만 하위 호출자가 재사용하도록 max-age 계산
+    age = max(0, int(time.time() - fetched_at)) if fetched_at else 0
+    max_age = max(0, weather.CACHE_TTL - age)
+    headers = [
+        (b'etag', etag.encode()),
+        (b'cache-control', f'public, max-age={max_age}'.encode()),
+        (b'age', str(age).encode()),
+    ]
+    if if_none_match and etag in [tag.strip() for tag in if_none_match.split(',')]:
+        return 304, headers, b''
+    return 200, headers + [(b'content-type', content_type.encode())], body
+
+
+async def app(scope, receive, send):
+    """ASGI 진입점."""
+    if scope['type'] == 'lifespan':
+        while True:
+            message = await receive()
+            if message['type'] == 'lifespan.startup':
+                await send({'type': 'lifespan.startup.complete'})
+            elif message['type'] == 'lifespan.shutdown':
+                await send({'type': 'lifespan.shutdown.complete'})
+                return
+
+    if scope['type'] != 'http':
+        return
+    if scope['method'] not in ('GET', 'HEAD'):
+        await send({'type': 'http.response.start', 'status': 405, 'headers': [(b'allow', b'GET, HEAD')]})
+        await send({'type': 'http.response.body', 'body': b''})
+        return
+
+    query = {k: v[0] for k, v in parse_qs(scope.get('query_string', b'').decode('utf-8')).items()}
+    request_headers = dict(scope.get('headers', []))
+    if_none_match = request_headers.get(b'if-none-match', b'').decode('latin-1') or None
+
+    # 조회 함수는 블로킹 HTTP 호출을 하므로 스레드에서 실행
+    status, headers, body = await asyncio.to_thread(handle, scope['path'], query, if_none_match)
+    headers = headers + [(b'content-length', str(len(body)).encode())]
+    await send({'type': 'http.response.start', 'status': status, 'headers': headers})
+    await send({'type': 'http.response.body', 'body': b'' if scope['method'] == 'HEAD' else body})
@@ -1,28 +1,300 @@
+import time
+
+_IMPORT_STARTED = time.perf_counter()
+
 import streamlit as st
-import requests
 from datetime import datetime
-import streamlit.components.v1 as components
 import os
-from dotenv import load_dotenv
-
-# 환경 변수 로드 (로컬 개발용)
-load_dotenv()
-
-# API 키 로드: Streamlit Secrets 우선, 없으면 환경 변수 사용
-try:
-    # Streamlit Cloud 배포 시 st.secrets 사용
-    API_KEY = st.secrets.get("OPENWEATHER_API_KEY")
-except (FileNotFoundError, AttributeError):
-    # 로컬 개발 시 .env 파일 사용
-    API_KEY = os.getenv("OPENWEATHER_API_KEY")
-
-# OpenWeather API 설정
-BASE_URL = "https://api.openweathermap.org/data/2.5/weather"
-FORECAST_URL = "https://api.openweathermap.org/data/2.5/forecast"
-ONECALL_URL = "https://api.openweathermap.org/data/3.0/onecall"
-
-# API 키 검증
-if not API_KEY:
+import logging
+import json
+from string import Template
+from session_registry import SessionRegistry, deep_sizeof, process_rss_bytes
+from weather_data import (
+    DEFAULT_LANGUAGE,
+    DEFAULT_UNITS,
+    LANGUAGES,
+    UNIT_SYSTEMS,
+    WEEKDAY_NAMES,
+    aggregate_daily_forecast,
+    city_not_found_at,
+    city_key,
+    client_ip_from_headers,
+    comfort_label,
+    condition_text,
+    convert_temperature,
+    date_labels,
+    air_quality_grade,
+    get_historical_weather,
+    get_key_pool,
+    get_korean_cities,
+    get_latency_tracker,
+    get_location_by_ip,
+    get_nearby_index,
+    get_prefetcher,
+    get_render_memo,
+    get_setting,
+    get_snapshot,
+    get_tracer,
+    get_weather,
+    get_weather_by_coords,
+    hourly_forecast_columns,
+    ip_location_not_found_at,
+    items_metrics,
+    load_settings as load_data_settings,
+    localize_items,
+    localized_weather,
+    observation_metrics,
+    prefetch_city,
+    round_coord,
+    set_setting_source,
+    span,
+    start_location_fetch,
+    suggest_cities,
+    traced,
+    unit_system,
+)
+
+logger = logging.getLogger(__name__)
+
+APP_DIR = os.path.dirname(os.path.abspath(__file__))
+TEMPLATE_DIR = os.path.join(APP_DIR, "templates")
+
+
+def _secret_setting(name):
+    """Streamlit Secrets에서 설정 값을 읽습니다. Secrets가 없으면 None."""
+    try:
+        return st.secrets.get(name)
+    except (FileNotFoundError, AttributeError):
+        return None
+
+
+# 데이터 계층도 Streamlit Secrets를 환경 변수보다 먼저 확인하도록 등록
+set_setting_source(_secret_setting)
+
+
+@st.cache_resource
+def load_settings():
+    """UI 설정을 프로세스당 한 번만 읽고 결과를 공유합니다.
+    Streamlit은 매 rerun마다 스크립트를 다시 실행하므로, 설정은 여기서 캐시된 값을 사용합니다.
+    API 키, 캐시, 저장소 설정은 weather_data.load_settings()에 있습니다."""
+    # .env는 데이터 계층 설정을 읽을 때 함께 로드됨
+    load_data_settings()
+
+    return {
+        # 지도 타일 URL - tile_proxy.py를 실행했다면 프록시 주소로 설정
+        'tile_url': get_setting("WEATHER_TILE_URL", "https://{s}.tile.openstreetmap.org/{z}/{x}/{y}.png"),
+        # 모듈 로드 시간 예산 (밀리초) - 초과하면 경고 로그를 남김
+        'startup_budget_ms': float(get_setting("WEATHER_STARTUP_BUDGET_MS", "250")),
+        # 세션 상태 키 하나의 최대 크기(바이트) - 넘으면 허용 목록에 없는 키는 세션 상태에서 제거
+        'session_key_max_bytes': int(get_setting("WEATHER_SESSION_KEY_MAX_BYTES", "65536")),
+    }
+
+
+_settings = load_settings()
+STARTUP_BUDGET_MS = _settings['startup_budget_ms']
+TILE_URL = _settings['tile_url']
+SESSION_KEY_MAX_BYTES = _settings['session_key_max_bytes']
+# 진단 정보의 "최근 활동 세션"으로 집계하는 구간 (초)
+SESSION_STATS_WINDOW = 1800
+
+# 세션 상태에 둘 수 있는 가벼운 키 (위치 방식, 입력값, 위젯 상태)
+# 날씨 응답이나 렌더링 결과 같은 큰 데이터는 공유 캐시에서 가져옵니다
+SESSION_STATE_KEYS = {
+    'location_method', 'city_input', 'gps_locator', 'overview_region',
+    'live_mode', 'live_interval', 'gps_btn', 'ip_btn', 'overview_btn'
+}
+
+
+@st.cache_resource
+def get_session_registry():
+    """프로세스 전체의 세션 레지스트리를 반환합니다."""
+    return SessionRegistry(window=SESSION_STATS_WINDOW)
+
+
+def _current_session_id():
+    try:
+        from streamlit.runtime.scriptrunner import get_script_run_ctx
+        ctx = get_script_run_ctx()
+        if ctx is not None:
+            return ctx.session_id
+    except ImportError:
+        pass
+    return "default"
+
+
+def track_session():
+    """세션 상태를 점검하고 레지스트리에 활동을 기록합니다.
+    허용 목록에 없는 키가 SESSION_KEY_MAX_BYTES보다 크면 세션 상태에서 제거합니다."""
+    state_bytes = 0
+    for key in list(st.session_state.keys()):
+        size = deep_sizeof(st.session_state[key])
+        if key not in SESSION_STATE_KEYS and size > SESSION_KEY_MAX_BYTES:
+            logger.warning("세션 상태 키 '%s'(%d바이트)가 너무 커서 제거합니다.", key, size)
+            del st.session_state[key]
+            continue
+        state_bytes += size
+    get_session_registry().touch(_current_session_id(), state_bytes)
+
+
+def _debug_enabled():
+    """URL에 ?debug=1 이 있으면 진단 정보를 표시합니다."""
+    try:
+        return st.query_params.get("debug") == "1"
+    except AttributeError:
+        return st.experimental_get_query_params().get("debug", [""])[0] == "1"
+
+
+def render_diagnostics():
+    """사이드바에 세션/프로세스 메모리 진단 정보를 표시합니다."""
+    with st.sidebar.expander("🔧 진단 정보", expanded=False):
+        stats = get_session_registry().stats()
+        rss = process_rss_bytes()
+        
+        st.markdown("**프로세스**")
+        st.write(f"- RSS: {rss / 1024 / 1024:.1f} MB" if rss else "- RSS: 알 수 없음")
+        st.write(f"- 최근 {SESSION_STATS_WINDOW // 60}분 안에 활동한 세션: {stats['sessions']}")
+        st.write(f"- 세션 상태 합계: {stats['total_bytes'] / 1024:.1f} KB (최대 세션 {stats['max_bytes'] / 1024:.1f} KB)")
+        
+        st.markdown("**API 응답 시간**")
+        for endpoint, row in sorted(get_latency_tracker().stats().items()):
+            st.write(f"- `{endpoint.split('/', 1)[-1]}`: p50 {row['p50_ms']:.0f}ms · p95 {row['p95_ms']:.0f}ms · "
+                     f"타임아웃 {row['timeout_s']:.1f}s · 시간 초과 {row['timeouts']} · "
+                     f"헤지 {row['hedges']}회 (먼저 도착 {row['hedge_wins']})")
+        
+        st.markdown("**API 키 사용량**")
+        for row in get_key_pool().stats():
+            daily_limit = f" / {row['calls_per_day']:,}" if row['calls_per_day'] else ""
+            rejected = ", ".join(f"{status} {count}회" for status, count in sorted(row['rejected'].items())) or "없음"
+            resting = f" · {row['cooldown_s']:.0f}초 휴식 중" if row['cooldown_s'] else ""
+            st.write(f"- `{row['key']}`: 오늘 {row['today']:,}{daily_limit}회 · 누적 {row['requests']:,}회 · "
+                     f"분당 한도 {row['calls_per_minute']} · 거부 {rejected}{resting}")
+        
+        nearby = get_nearby_index().stats()
+        st.markdown("**근처 관측값 재사용**")
+        st.write(f"- 인덱스 지점: {nearby['points']}개 · 재사용 {nearby['hits']}회 · upstream 조회 {nearby['misses']}회")
+        
+        prefetch = get_prefetcher().stats()
+        st.markdown("**선행 조회**")
+        st.write(f"- 적중률 {prefetch['hit_rate']:.0%} (사용됨 {prefetch['hits']} · 만료 {prefetch['wasted']} · "
+                 f"대기 중 {prefetch['pending']} · 한도로 건너뜀 {prefetch['skipped']})")
+        st.write(f"- API 호출 {prefetch['calls']}회 중 낭비 {prefetch['wasted_calls']}회")
+        
+        st.markdown("**섹션 마크업 재사용**")
+        for section, row in sorted(get_render_memo().stats().items()):
+            st.write(f"- `{section}`: 적중률 {row['hit_rate']:.0%} (재사용 {row['hits']}회 · 새로 생성 {row['misses']}회)")
+        
+        slowest = sorted(get_tracer().recent(), key=lambda record: record['duration_ms'], reverse=True)[:5]
+        st.markdown("**느린 실행 (최근 trace)**")
+        if not slowest:
+            st.write("- 기록된 trace 없음")
+        for record in slowest:
+            stages = sorted((span for span in record['spans'][1:] if span['parent_span_id'] == record['spans'][0]['span_id']),
+                            key=lambda span: span['duration_ms'], reverse=True)[:3]
+            detail = ", ".join(f"{span['name']} {span['duration_ms']:.0f}ms" for span in stages)
+            method = record['attributes'].get('location_method', '-')
+            st.write(f"- {record['name']} ({method}) {record['duration_ms']:.0f}ms" + (f": {detail}" if detail else ""))
+        
+        st.markdown("**현재 세션 상태**")
+        sizes = sorted(
+            ((key, deep_sizeof(st.session_state[key])) for key in st.session_state.keys()),
+            key=lambda item: item[1],
+            reverse=True
+        )
+        for key, size in sizes:
+            st.write(f"- `{key}`: {size:,} B")
+
+
+@st.cache_resource
+def load_template(name):
+    """templates/ 아래의 HTML 템플릿을 처음 사용할 때 읽어 캐시합니다."""
+    with open(os.path.join(TEMPLATE_DIR, name), encoding='utf-8') as f:
+        return Template(f.read())
+
+
+@st.cache_resource
+def _gps_locator_component():
+    """GPS 위치를 Python으로 돌려주는 양방향 컴포넌트 (frontend/gps_locator)."""
+    import streamlit.components.v1 as components
+    return components.declare_component(
+        "gps_locator",
+        path=os.path.join(APP_DIR, "frontend", "gps_locator")
+    )
+
+
+def get_location_by_gps(precision=4, watch=False):
+    """HTML5 Geolocation API를 사용하여 휴대폰/브라우저의 GPS 위치를 가져옵니다.
+
+    브라우저가 위치를 소수점 precision자리로 양자화하고, 값이 바뀔 때만 Python으로 전달합니다.
+    위치를 아직 받지 못했으면 None, 실패했으면 {'error': 코드}를 반환합니다.
+    watch=True이면 위치 변화를 계속 추적합니다 (갱신은 디바운스됨).
+    """
+    value = _gps_locator_component()(
+        precision=precision,
+        debounce_ms=1000,
+        watch=watch,
+        key="gps_locator",
+        default=None
+    )
+    if not value or 'error' in value:
+        return value
+    return {
+        'lat': round_coord(value['lat'], precision),
+        'lon': round_coord(value['lon'], precision),
+        'accuracy': value.get('accuracy')
+    }
+
+
+def _since(timestamp):
+    """기록 시각을 '3분 전' 같은 표시용 문자열로 바꿉니다."""
+    seconds = max(0, int(time.time() - timestamp))
+    return f"{seconds}초 전" if seconds < 60 else f"{seconds // 60}분 전"
+
+
+def get_client_ip():
+    """현재 세션 브라우저의 공인 IP 주소를 요청 헤더에서 찾습니다.
+    찾지 못하면(로컬 실행 등) None이며, 이때는 서버의 공인 IP로 위치를 찾습니다."""
+    try:
+        headers = st.context.headers
+    except AttributeError:
+        try:
+            from streamlit.web.server.websocket_headers import _get_websocket_headers
+            headers = _get_websocket_headers()
+        except ImportError:
+            headers = None
+    ip = client_ip_from_headers(headers, load_data_settings()['trusted_proxy_hops'])
+    if ip is None:
+        # Streamlit 1.45 이상은 프록시가 없을 때의 연결 주소를 제공
+        ip = client_ip_from_headers({'X-Real-IP': getattr(getattr(st, 'context', None), 'ip_address', None)})
+    return ip
+
+
+def _choose_city(name):
+    """자동완성 후보 버튼 콜백 - 검색어를 후보 이름으로 바꿉니다 (위젯이 다시 그려지기 전에 실행)."""
+    st.session_state.city_input = name
+
+
+def display_preferences():
+    """세션에서 고른 표시 단위와 날씨 설명 언어 (units, lang)."""
+    return st.session_state.get('units', DEFAULT_UNITS), st.session_state.get('lang', DEFAULT_LANGUAGE)
+
+
+def show_nearby_caption(weather_data):
+    """근처의 최근 관측값으로 응답한 경우 출처 지점과 거리를 알려줍니다."""
+    nearby = weather_data.get('nearby')
+    if not nearby or nearby['distance_km'] < 0.1:
+        return
+    if nearby['points'] > 1:
+        st.caption(f"📡 가까운 관측값 {nearby['points']}개({nearby['source']} 외, 가장 가까운 곳 "
+                   f"{nearby['distance_km']:.1f}km)로 보간한 값입니다 ({_since(weather_data['fetched_at'])} 관측).")
+    else:
+        st.caption(f"📡 {nearby['distance_km']:.1f}km 떨어진 {nearby['source']}의 최근 관측값입니다 "
+                   f"({_since(weather_data['fetched_at'])} 관측).")
+
+
+def check_api_key():
+    """API 키가 없으면 설정 방법을 안내하고 실행을 멈춥니다."""
+    if load_data_settings()['api_key']:
+        return
     st.error("⚠️ OpenWeather API 키가 설정되지 않았습니다.")
     st.info("💡 **로컬 개발**: .env 파일을 생성하고 API 키를 입력하세요.")
     st.info("💡 **Streamlit Cloud**: Settings > Secrets에서 API 키를 설정하세요.")
@@ -33,1008 +305,560 @@ OPENWEATHER_API_KEY = "your_openweather_api_key_here"
     st.stop()
 
 
-def get_location_by_gps():
-    """HTML5 Geolocation API를 사용하여 휴대폰/브라우저의 GPS 위치를 가져옵니다."""
+def render_kakao_map(lat: float, lon: float, city_name: str, show_current_location: bool = False):
+    """Leaflet 지도 컴포넌트를 렌더링합니다 (HTTPS 완전 지원)."""
+    import streamlit.components.v1 as components
     
-    # JavaScript 코드로 GPS 위치 획득
-    gps_html = """
-    <!DOCTYPE html>
-    <html>
-    <head>
-        <meta charset='utf-8'/>
-        <style>
-            body { font-family: system-ui, -apple-system, sans-serif; padding: 20px; }
-            .status { padding: 15px; border-radius: 8px; margin: 10px 0; }
-            .loading { background: #e3f2fd; color: #1976d2; }
-            .success { background: #e8f5e9; color: #2e7d32; }
-            .error { background: #ffebee; color: #c62828; }
-            .btn { 
-                background: linear-gradient(135deg, #667eea 0%, #764ba2 100%);
-                color: white;
-                padding: 12px 24px;
-                border: none;
-                border-radius: 8px;
-                cursor: pointer;
-                font-size: 16px;
-                font-weight: bold;
-            }
-            .btn:hover { opacity: 0.9; }
-            .coordinates { 
-                background: #f5f5f5; 
-                padding: 15px; 
-                border-radius: 8px; 
-                margin: 10px 0;
-                font-family: monospace;
-            }
-        </style>
-    </head>
-    <body>
-        <div id="status"></div>
-        <div id="result"></div>
-        
-        <script>
-            const status = document.getElementById('status');
-            const result = document.getElementById('result');
-            
-            function showStatus(message, type) {
-                status.className = 'status ' + type;
-                status.innerHTML = message;
-            }
-            
-            function getLocation() {
-                if (!navigator.geolocation) {
-                    showStatus('❌ 이 브라우저는 GPS 위치 정보를 지원하지 않습니다.', 'error');
-                    return;
-                }
-                
-                showStatus('📡 GPS 위치를 확인하는 중... 권한을 허용해주세요.', 'loading');
-                
-                const options = {
-                    enableHighAccuracy: true,  // GPS 사용 (배터리 소모 증가)
-                    timeout: 10000,            // 10초 타임아웃
-                    maximumAge: 0              // 캐시 사용 안 함
-                };
-                
-                navigator.geolocation.getCurrentPosition(
-                    function(position) {
-                        const lat = position.coords.latitude;
-                        const lon = position.coords.longitude;
-                        const accuracy = position.coords.accuracy;
-                        
-                        showStatus('✅ GPS 위치를 성공적으로 가져왔습니다!', 'success');
-                        
-                        result.innerHTML = `
-                            <div class="coordinates">
-                                <h3 style="margin-top:0;">📍 GPS 좌표</h3>
-                                <p><strong>위도:</strong> ${lat.toFixed(6)}</p>
-                                <p><strong>경도:</strong> ${lon.toFixed(6)}</p>
-                                <p><strong>정확도:</strong> ±${accuracy.toFixed(0)}m</p>
-                                <p style="font-size:12px; color:#666; margin-top:10px;">
-                                    💡 위 좌표를 복사하여 Streamlit 앱에서 사용하세요.
-                                </p>
-                            </div>
-                        `;
-                        
-                        // Streamlit으로 데이터 전달 (parent window)
-                        window.parent.postMessage({
-                            type: 'gps_location',
-                            lat: lat,
-                            lon: lon,
-                            accuracy: accuracy
-                        }, '*');
-                    },
-                    function(error) {
-                        let errorMsg = '';
-                        switch(error.code) {
-                            case error.PERMISSION_DENIED:
-                                errorMsg = '❌ 위치 정보 권한이 거부되었습니다. 브라우저 설정에서 위치 권한을 허용해주세요.';
-                                break;
-                            case error.POSITION_UNAVAILABLE:
-                                errorMsg = '❌ 위치 정보를 사용할 수 없습니다. GPS가 꺼져있거나 실내에 있을 수 있습니다.';
-                                break;
-                            case error.TIMEOUT:
-                                errorMsg = '❌ 위치 정보 요청 시간이 초과되었습니다. 다시 시도해주세요.';
-                                break;
-                            default:
-                                errorMsg = '❌ 알 수 없는 오류가 발생했습니다.';
-                        }
-                        showStatus(errorMsg, 'error');
-                        
-                        result.innerHTML = `
-                            <div style="padding:15px; background:#fff3cd; border-radius:8px; margin-top:10px;">
-                                <h4 style="margin-top:0;">💡 문제 해결 방법</h4>
-                                <ul style="margin:10px 0;">
-                                    <li>브라우저 주소창의 위치 아이콘을 클릭하여 권한 허용</li>
-                                    <li>HTTPS 또는 localhost에서만 GPS 사용 가능</li>
-                                    <li>실외에서 시도하면 GPS 정확도가 향상됩니다</li>
-                                    <li>Wi-Fi나 모바일 데이터가 켜져있는지 확인</li>
-                                </ul>
-                            </div>
-                        `;
-                    },
-                    options
-                );
-            }
-            
-            // 자동으로 위치 정보 요청
-            getLocation();
-        </script>
-    </body>
-    </html>
+    html_code = get_render_memo().get('map', _map_markup, lat, lon, city_name, show_current_location)
+    components.html(html_code, height=450)
+
+
+def _map_markup(lat, lon, city_name, show_current_location):
+    # Leaflet 지도 템플릿 (templates/map.html)
+    return load_template('map.html').substitute(
+        lat=lat,
+        lon=lon,
+        city_name=city_name,
+        show_current=str(show_current_location).lower(),
+        tile_url=TILE_URL
+    )
+
+
+# 라이브 모드 갱신 간격 선택지 (초) - API 사용량을 고려해 최소 1분
+LIVE_INTERVALS = [60, 120, 300, 600, 900]
+
+# 전국 날씨 지도의 지역별 범위 (남서 위도, 남서 경도, 북동 위도, 북동 경도)
+OVERVIEW_REGIONS = {
+    "전국": (33.0, 124.5, 38.7, 131.0),
+    "수도권": (36.9, 126.3, 38.3, 127.9),
+    "강원": (37.0, 127.4, 38.7, 129.4),
+    "충청": (35.9, 125.9, 37.2, 128.3),
+    "전라": (34.2, 125.9, 36.2, 127.9),
+    "경상": (34.6, 127.5, 37.2, 129.6),
+    "제주": (33.0, 126.0, 33.7, 127.0),
+}
+
+
+@traced()
+def render_overview_map(points):
+    """여러 지점의 날씨를 마커 클러스터 지도로 렌더링합니다.
+
+    points: [위도, 경도, 이름, 기온, 아이콘, 설명] 목록. 하나의 JSON 배열로 컴포넌트에 전달되며,
+    브라우저는 현재 화면 범위 안의 마커만 그리고 확대 수준에 따라 클러스터로 묶습니다.
     """
+    import streamlit.components.v1 as components
     
-    components.html(gps_html, height=300)
+    # </script>가 페이로드 안에 들어가도 스크립트가 끊기지 않도록 이스케이프
+    payload = json.dumps(points, ensure_ascii=False, separators=(',', ':')).replace('</', '<\\/')
+    html_code = load_template('overview_map.html').substitute(payload=payload, tile_url=TILE_URL)
+    components.html(html_code, height=640)
 
 
-def get_location_by_ip():
-    """IP 주소를 기반으로 현재 위치(위도, 경도)를 가져옵니다.
-    여러 무료 IP 위치 서비스를 시도하여 가장 정확한 위치를 반환합니다."""
+@traced()
+def get_overview_points(region="전국"):
+    """스냅샷에서 지역 범위 안의 지도 표시용 지점 목록을 만듭니다 (네트워크 호출 없음)."""
+    snapshot = get_snapshot()
+    if not snapshot:
+        return []
     
-    # 방법 1: ipapi.co (가장 정확하지만 요청 제한 있음)
-    try:
-        response = requests.get('https://ipapi.co/json/', timeout=5)
-        if response.status_code == 200:
-            data = response.json()
-            
-            lat = data.get('latitude')
-            lon = data.get('longitude')
-            city = data.get('city', 'Unknown')
-            country = data.get('country_name', 'Unknown')
-            
-            if lat and lon:
-                return {
-                    'lat': lat,
-                    'lon': lon,
-                    'city': city,
-                    'country': country,
-                    'ip': data.get('ip', 'Unknown'),
-                    'source': 'ipapi.co'
-                }
-    except Exception:
-        pass
+    # 영문 이름 → 대표 한글 이름 (테이블에서 처음 나오는 이름)
+    korean_names = {}
+    for korean, english in get_korean_cities().items():
+        korean_names.setdefault(english, korean)
     
-    # 방법 2: ip-api.com (무료, 요청 제한 느슨)
-    try:
-        response = requests.get('http://ip-api.com/json/?fields=status,message,country,city,lat,lon,query', timeout=5)
-        if response.status_code == 200:
-            data = response.json()
-            
-            if data.get('status') == 'success':
-                return {
-                    'lat': data.get('lat'),
-                    'lon': data.get('lon'),
-                    'city': data.get('city', 'Unknown'),
-                    'country': data.get('country', 'Unknown'),
-                    'ip': data.get('query', 'Unknown'),
-                    'source': 'ip-api.com'
-                }
-    except Exception:
-        pass
-    
-    # 방법 3: ipinfo.io (무료 티어)
-    try:
-        response = requests.get('https://ipinfo.io/json', timeout=5)
-        if response.status_code == 200:
-            data = response.json()
-            
-            loc = data.get('loc', '').split(',')
-            if len(loc) == 2:
-                return {
-                    'lat': float(loc[0]),
-                    'lon': float(loc[1]),
-                    'city': data.get('city', 'Unknown'),
-                    'country': data.get('country', 'Unknown'),
-                    'ip': data.get('ip', 'Unknown'),
-                    'source': 'ipinfo.io'
-                }
-    except Exception:
-        pass
-    
-    return None
+    south, west, north, east = OVERVIEW_REGIONS[region]
+    cities = [(english_city, current) for english_city, current, _ in snapshot.points()
+              if south <= current['lat'] <= north and west <= current['lon'] <= east]
+    # 지역 안 모든 도시의 쾌적도와 표시 단위 기온을 한 번에 계산
+    units, lang = display_preferences()
+    comfort = items_metrics([
+        {'main': {'temp': current['temp'], 'humidity': current['humidity']}, 'wind': {'speed': current['wind_speed']}}
+        for _, current in cities
+    ])['comfort']
+    temps = convert_temperature([current['temp'] for _, current in cities], units)
+    points = []
+    for (english_city, current), code, temp in zip(cities, comfort, temps):
+        label, emoji = comfort_label(code)
+        points.append([
+            round(current['lat'], 4),
+            round(current['lon'], 4),
+            korean_names.get(english_city, current['name']),
+            round(float(temp), 1),
+            current['icon'],
+            f"{condition_text(current['weather_id'], lang, current['description'])} · {emoji} {label}"
+        ])
+    return points
 
 
-def get_weather_by_coords(lat, lon):
-    """위도와 경도로 날씨 정보를 가져옵니다."""
-    params = {
-        'lat': lat,
-        'lon': lon,
-        'appid': API_KEY,
-        'units': 'metric',
-        'lang': 'kr'
-    }
+def display_overview_map():
+    """전국 날씨 지도 화면을 표시합니다."""
+    st.title("🗺️ 전국 날씨 지도")
     
-    try:
-        response = requests.get(BASE_URL, params=params, timeout=10)
-        response.raise_for_status()
-        return response.json()
-    except requests.exceptions.RequestException:
-        return None
+    region = st.radio("지역", list(OVERVIEW_REGIONS), horizontal=True, key="overview_region")
+    points = get_overview_points(region)
+    
+    if not points:
+        st.info("🗂️ 도시 스냅샷이 없거나 오래되어 전국 지도를 표시할 수 없습니다.")
+        st.markdown("💡 `python snapshot_job.py`를 실행해 한국 도시 날씨 스냅샷을 먼저 생성하세요.")
+        return
+    
+    temps = [point[3] for point in points]
+    temp_symbol = unit_system(display_preferences()[0]).temp_symbol
+    col1, col2, col3 = st.columns(3)
+    with col1:
+        st.metric("표시 지점", f"{len(points)}곳")
+    with col2:
+        st.metric("최고", f"{max(temps):.1f}{temp_symbol}")
+    with col3:
+        st.metric("최저", f"{min(temps):.1f}{temp_symbol}")
+    
+    render_overview_map(points)
+    st.caption("💡 확대하면 묶여 있던 지점이 개별 마커로 펼쳐집니다. 마커를 클릭하면 날씨 설명이 표시됩니다.")
 
 
-def get_forecast_data(lat, lon):
-    """위도와 경도로 5일간의 날씨 예보를 가져옵니다 (3시간 간격)."""
-    params = {
-        'lat': lat,
-        'lon': lon,
-        'appid': API_KEY,
-        'units': 'metric',
-        'lang': 'kr',
-        'cnt': 40  # 5일 * 8회 (3시간 간격)
-    }
-    
-    try:
-        response = requests.get(FORECAST_URL, params=params, timeout=10)
-        response.raise_for_status()
-        return response.json()
-    except requests.exceptions.RequestException:
-        return None
+# 헤더에서 매 실행마다 바뀌는 현지 시각이 들어갈 자리 (나머지 마크업은 메모해 재사용)
+CLOCK_SLOT = "<!--clock-->"
 
 
-def get_historical_weather(lat, lon, days_ago):
-    """특정 날짜의 과거 날씨 데이터를 가져옵니다.
-    OpenWeather의 무료 API는 과거 데이터를 제공하지 않으므로,
-    대신 5일 예보 데이터를 사용하여 최근 경향을 표시합니다."""
-    # 무료 API 제한으로 인해 실제 과거 데이터 대신 예보 데이터 사용
-    return None
+def _air_card(title, kind, value, unit="", digits=0):
+    """대기질/자외선 카드 마크업 (환경부/기상청 등급 색으로 표시)."""
+    graded = air_quality_grade(kind, value)
+    if graded is None:
+        shown, label, color = "-", "정보 없음", "#888"
+    else:
+        name, emoji, color = graded
+        shown, label = f"{value:.{digits}f}", f"{emoji} {name}"
+    return f"""
+        <div style='text-align: center; padding: 20px; background-color: #f8f9fa; border-radius: 10px;'>
+            <h3 style='color: #667eea; margin: 0;'>{title}</h3>
+            <p style='font-size: 32px; margin: 10px 0; font-weight: bold; color: {color};'>{shown}</p>
+            <p style='font-size: 14px; color: #888; margin: 0;'>{label}{f" · {unit}" if unit and graded else ""}</p>
+        </div>
+        """
 
 
-def render_kakao_map(lat: float, lon: float, city_name: str, show_current_location: bool = False):
-    """Leaflet 지도 컴포넌트를 렌더링합니다 (HTTPS 완전 지원)."""
-    html_code = f"""
-    <!DOCTYPE html>
-    <html>
-      <head>
-        <meta charset='utf-8'/>
-        <meta name='viewport' content='width=device-width, initial-scale=1'/>
-        <link rel="stylesheet" href="https://unpkg.com/leaflet@1.9.4/dist/leaflet.css"
-          integrity="sha256-p4NxAoJBhIIN+hmNHrzRCf9tD/miZyoHS5obTRR9BMY="
-          crossorigin=""/>
-        <script src="https://unpkg.com/leaflet@1.9.4/dist/leaflet.js"
-          integrity="sha256-20nQCchB9co0qIjJZRGuk2/Z9VM+kNiyxNV1lvTlZBo="
-          crossorigin=""></script>
-        <style>
-          #map {{ width: 100%; height: 420px; border-radius: 12px; z-index: 0; }}
-          .custom-popup {{
-            font-family: system-ui, -apple-system, sans-serif;
-            font-size: 14px;
-            font-weight: bold;
-          }}
-          .leaflet-popup-content-wrapper {{
-            border-radius: 8px;
-          }}
-        </style>
-      </head>
-      <body>
-        <div id='map'></div>
-        <script>
-          try {{
-            // 지도 초기화
-            var map = L.map('map').setView([{lat}, {lon}], 13);
-            
-            // OpenStreetMap 타일 레이어 (HTTPS)
-            L.tileLayer('https://{{s}}.tile.openstreetmap.org/{{z}}/{{x}}/{{y}}.png', {{
-              attribution: '&copy; <a href="https://www.openstreetmap.org/copyright">OpenStreetMap</a> contributors',
-              maxZoom: 19
-            }}).addTo(map);
-            
-            // 목표 위치 마커 (파란색 기본 마커)
-            var targetMarker = L.marker([{lat}, {lon}]).addTo(map);
-            targetMarker.bindPopup('<div class="custom-popup">📍 {city_name}</div>').openPopup();
-            
-            // 현재 위치 표시 옵션
-            var showCurrent = {str(show_current_location).lower()};
-            if (showCurrent && navigator.geolocation) {{
-              navigator.geolocation.getCurrentPosition(function(pos) {{
-                var myLat = pos.coords.latitude;
-                var myLon = pos.coords.longitude;
-                
-                // 현재 위치 마커 (빨간색 커스텀 아이콘)
-                var redIcon = L.icon({{
-                  iconUrl: 'https://raw.githubusercontent.com/pointhi/leaflet-color-markers/master/img/marker-icon-2x-red.png',
-                  shadowUrl: 'https://cdnjs.cloudflare.com/ajax/libs/leaflet/1.9.4/images/marker-shadow.png',
-                  iconSize: [25, 41],
-                  iconAnchor: [12, 41],
-                  popupAnchor: [1, -34],
-                  shadowSize: [41, 41]
-                }});
-                
-                var currentMarker = L.marker([myLat, myLon], {{icon: redIcon}}).addTo(map);
-                currentMarker.bindPopup('<div class="custom-popup">🔴 내 위치</div>');
-                
-                // 두 지점을 잇는 선
-                var latlngs = [
-                  [{lat}, {lon}],
-                  [myLat, myLon]
-                ];
-                var polyline = L.polyline(latlngs, {{
-                  color: '#0A84FF',
-                  weight: 3,
-                  opacity: 0.7,
-                  dashArray: '10, 10'
-                }}).addTo(map);
-                
-                // 두 마커가 모두 보이도록 지도 범위 조정
-                var bounds = L.latLngBounds([
-                  [{lat}, {lon}],
-                  [myLat, myLon]
-                ]);
-                map.fitBounds(bounds, {{padding: [50, 50]}});
-              }}, function(err) {{
-                console.warn('Geolocation error:', err);
-              }});
-            }}
-          }} catch (e) {{
-            document.getElementById('map').innerHTML = 
-              '<div style="padding:20px;color:#b00020;background:#fdecea;border-radius:8px;">지도 로딩 오류: ' + e.message + '</div>';
-          }}
-        </script>
-      </body>
-    </html>
-    """
+def _current_markup(weather_data, units, lang, air=None):
+    """헤더, 현재 기온, 상세 정보, 대기질, 일출/일몰 카드의 마크업을 만듭니다 (같은 데이터/옵션이면 메모에서 재사용).
+    air: get_air_quality() 결과 (없으면 None). 자외선 지수는 One Call 모드의 현재 날씨에만 있습니다."""
+    # 기본 정보
+    city_name = weather_data['name']
+    country = weather_data['sys']['country']
     
-    components.html(html_code, height=450)
+    # 날씨 정보 (선택한 단위/언어로 변환)
+    system = unit_system(units)
+    shown = localized_weather(weather_data, units, lang)
+    temp = shown['temp']
+    feels_like = shown['feels_like']
+    temp_min = shown['temp_min']
+    temp_max = shown['temp_max']
+    humidity = weather_data['main']['humidity']
+    pressure = weather_data['main']['pressure']
+    
+    # 날씨 상태
+    weather_desc = shown['description']
+    weather_icon = weather_data['weather'][0]['icon']
+    
+    # 바람
+    wind_speed = shown['wind_speed']
+    
+    # 체감 지표 (기준 단위로 계산한 뒤 표시 단위로 변환)
+    metrics = observation_metrics(weather_data)
+    apparent, dew_point = convert_temperature([metrics['apparent'], metrics['dew_point']], units)
+    condition, emoji = comfort_label(metrics['comfort'])
+    
+    # 일출/일몰 시간 (검색된 도시 기준)
+    from datetime import timezone as tz, timedelta
+    timezone_offset = weather_data['timezone']  # UTC로부터의 초 단위 오프셋
+    sunrise_utc = datetime.fromtimestamp(weather_data['sys']['sunrise'], tz.utc)
+    sunset_utc = datetime.fromtimestamp(weather_data['sys']['sunset'], tz.utc)
+    sunrise = sunrise_utc + timedelta(seconds=timezone_offset)
+    sunset = sunset_utc + timedelta(seconds=timezone_offset)
+    
+    return {
+        'header': f"""
+    <div style='text-align: center; padding: 20px; background: linear-gradient(135deg, #667eea 0%, #764ba2 100%); border-radius: 10px; margin-bottom: 20px;'>
+        <h1 style='color: white; margin: 0;'>🌤️ {city_name}, {country}</h1>
+        <p style='color: #f0f0f0; font-size: 16px; margin: 10px 0 0 0;'>
+            {CLOCK_SLOT}
+        </p>
+    </div>
+    """,
+        'icon_url': f"http://openweathermap.org/img/wn/{weather_icon}@4x.png",
+        'main': f"""
+        <div style='text-align: center; padding: 20px;'>
+            <h1 style='font-size: 72px; margin: 0; color: #667eea;'>{temp:.1f}{system.temp_symbol}</h1>
+            <p style='font-size: 24px; color: #666; margin: 10px 0;'>{weather_desc.capitalize()}</p>
+            <p style='font-size: 18px; color: #888;'>체감온도: {feels_like:.1f}{system.temp_symbol}</p>
+        </div>
+        """,
+        'temp_max': f"{temp_max:.1f}{system.temp_symbol}",
+        'temp_min': f"{temp_min:.1f}{system.temp_symbol}",
+        'details': [
+            f"""
+        <div style='text-align: center; padding: 20px; background-color: #f8f9fa; border-radius: 10px;'>
+            <h3 style='color: #667eea; margin: 0;'>💧 습도</h3>
+            <p style='font-size: 32px; margin: 10px 0; font-weight: bold;'>{humidity}%</p>
+        </div>
+        """,
+            f"""
+        <div style='text-align: center; padding: 20px; background-color: #f8f9fa; border-radius: 10px;'>
+            <h3 style='color: #667eea; margin: 0;'>🌡️ 기압</h3>
+            <p style='font-size: 32px; margin: 10px 0; font-weight: bold;'>{pressure}</p>
+            <p style='font-size: 14px; color: #888; margin: 0;'>hPa</p>
+        </div>
+        """,
+            f"""
+        <div style='text-align: center; padding: 20px; background-color: #f8f9fa; border-radius: 10px;'>
+            <h3 style='color: #667eea; margin: 0;'>💨 풍속</h3>
+            <p style='font-size: 32px; margin: 10px 0; font-weight: bold;'>{wind_speed:.1f}</p>
+            <p style='font-size: 14px; color: #888; margin: 0;'>{system.speed_symbol}</p>
+        </div>
+        """,
+            # 쾌적도 (열지수/풍속냉각으로 계산한 체감온도와 이슬점 기준)
+            f"""
+        <div style='text-align: center; padding: 20px; background-color: #f8f9fa; border-radius: 10px;'>
+            <h3 style='color: #667eea; margin: 0;'>🌡️ 체감</h3>
+            <p style='font-size: 32px; margin: 10px 0;'>{emoji}</p>
+            <p style='font-size: 14px; color: #888; margin: 0;'>{condition} · {apparent:.1f}{system.temp_symbol}</p>
+            <p style='font-size: 12px; color: #aaa; margin: 0;'>이슬점 {dew_point:.1f}{system.temp_symbol}</p>
+        </div>
+        """,
+        ],
+        'air': [
+            _air_card("🌫️ 미세먼지", 'pm10', (air or {}).get('pm10'), "㎍/㎥"),
+            _air_card("😷 초미세먼지", 'pm2_5', (air or {}).get('pm2_5'), "㎍/㎥"),
+            _air_card("☀️ 자외선", 'uvi', weather_data.get('uvi'), digits=1),
+        ] if air or weather_data.get('uvi') is not None else [],
+        'sunrise': f"""
+        <div style='text-align: center; padding: 30px; background: linear-gradient(135deg, #FFA17F 0%, #FF6B6B 100%); border-radius: 10px;'>
+            <h2 style='color: white; margin: 0;'>🌅 일출</h2>
+            <p style='font-size: 48px; color: white; margin: 10px 0; font-weight: bold;'>{sunrise.strftime('%H:%M')}</p>
+        </div>
+        """,
+        'sunset': f"""
+        <div style='text-align: center; padding: 30px; background: linear-gradient(135deg, #667eea 0%, #764ba2 100%); border-radius: 10px;'>
+            <h2 style='color: white; margin: 0;'>🌇 일몰</h2>
+            <p style='font-size: 48px; color: white; margin: 10px 0; font-weight: bold;'>{sunset.strftime('%H:%M')}</p>
+        </div>
+        """,
+    }
 
 
-# 한글-영문 도시 매핑
-KOREAN_CITIES = {
-    # 서울특별시
-    "서울": "Seoul",
-    "서울특별시": "Seoul",
-    "강남": "Gangnam-gu,Seoul,KR",
-    "강남구": "Gangnam-gu,Seoul,KR",
-    "강동": "Gangdong-gu,Seoul,KR",
-    "강동구": "Gangdong-gu,Seoul,KR",
-    "강북": "Gangbuk-gu,Seoul,KR",
-    "강북구": "Gangbuk-gu,Seoul,KR",
-    "강서": "Gangseo-gu,Seoul,KR",
-    "강서구": "Gangseo-gu,Seoul,KR",
-    "관악": "Gwanak-gu,Seoul,KR",
-    "관악구": "Gwanak-gu,Seoul,KR",
-    "광진": "Gwangjin-gu,Seoul,KR",
-    "광진구": "Gwangjin-gu,Seoul,KR",
-    "구로": "Guro-gu,Seoul,KR",
-    "구로구": "Guro-gu,Seoul,KR",
-    "금천": "Geumcheon-gu,Seoul,KR",
-    "금천구": "Geumcheon-gu,Seoul,KR",
-    "노원": "Nowon-gu,Seoul,KR",
-    "노원구": "Nowon-gu,Seoul,KR",
-    "도봉": "Dobong-gu,Seoul,KR",
-    "도봉구": "Dobong-gu,Seoul,KR",
-    "동대문": "Dongdaemun-gu,Seoul,KR",
-    "동대문구": "Dongdaemun-gu,Seoul,KR",
-    "동작": "Dongjak-gu,Seoul,KR",
-    "동작구": "Dongjak-gu,Seoul,KR",
-    "마포": "Mapo-gu,Seoul,KR",
-    "마포구": "Mapo-gu,Seoul,KR",
-    "서대문": "Seodaemun-gu,Seoul,KR",
-    "서대문구": "Seodaemun-gu,Seoul,KR",
-    "서초": "Seocho-gu,Seoul,KR",
-    "서초구": "Seocho-gu,Seoul,KR",
-    "성동": "Seongdong-gu,Seoul,KR",
-    "성동구": "Seongdong-gu,Seoul,KR",
-    "성북": "Seongbuk-gu,Seoul,KR",
-    "성북구": "Seongbuk-gu,Seoul,KR",
-    "송파": "Songpa-gu,Seoul,KR",
-    "송파구": "Songpa-gu,Seoul,KR",
-    "양천": "Yangcheon-gu,Seoul,KR",
-    "양천구": "Yangcheon-gu,Seoul,KR",
-    "영등포": "Yeongdeungpo-gu,Seoul,KR",
-    "영등포구": "Yeongdeungpo-gu,Seoul,KR",
-    "용산": "Yongsan-gu,Seoul,KR",
-    "용산구": "Yongsan-gu,Seoul,KR",
-    "은평": "Eunpyeong-gu,Seoul,KR",
-    "은평구": "Eunpyeong-gu,Seoul,KR",
-    "종로": "Jongno-gu,Seoul,KR",
-    "종로구": "Jongno-gu,Seoul,KR",
-    "중구": "Jung-gu,Seoul,KR",
-    "중랑": "Jungnang-gu,Seoul,KR",
-    "중랑구": "Jungnang-gu,Seoul,KR",
+def _clock_text(timezone_offset):
+    """도시 현지 날짜, 요일, 시각과 UTC 오프셋 (헤더에서 매 실행마다 새로 채우는 부분)."""
+    from datetime import timezone as tz, timedelta
+    local_time = datetime.now(tz.utc) + timedelta(seconds=timezone_offset)
+    weekday_display = f"{WEEKDAY_NAMES[local_time.weekday()]}요일"
     
-    # 부산광역시
-    "부산": "Busan",
-    "부산광역시": "Busan",
-    "해운대": "Haeundae-gu,Busan,KR",
-    "해운대구": "Haeundae-gu,Busan,KR",
-    "부산진": "Busanjin-gu,Busan,KR",
-    "부산진구": "Busanjin-gu,Busan,KR",
-    "동래": "Dongnae-gu,Busan,KR",
-    "동래구": "Dongnae-gu,Busan,KR",
-    "남구": "Nam-gu,Busan,KR",
-    "북구": "Buk-gu,Busan,KR",
-    "수영": "Suyeong-gu,Busan,KR",
-    "수영구": "Suyeong-gu,Busan,KR",
-    "사상": "Sasang-gu,Busan,KR",
-    "사상구": "Sasang-gu,Busan,KR",
-    "연제": "Yeonje-gu,Busan,KR",
-    "연제구": "Yeonje-gu,Busan,KR",
-    "서구": "Seo-gu,Busan,KR",
-    "금정": "Geumjeong-gu,Busan,KR",
-    "금정구": "Geumjeong-gu,Busan,KR",
-    "기장": "Gijang-gun,Busan,KR",
-    "기장군": "Gijang-gun,Busan,KR",
+    # 타임존 표시 (UTC 오프셋)
+    tz_hours = timezone_offset // 3600
+    tz_minutes = abs(timezone_offset % 3600) // 60
+    if tz_minutes == 0:
+        tz_display = f"UTC{tz_hours:+d}"
+    else:
+        tz_display = f"UTC{tz_hours:+d}:{tz_minutes:02d}"
+    return f"📅 {local_time.strftime('%Y년 %m월 %d일')} {weekday_display} | 🕐 {local_time.strftime('%H:%M:%S')} ({tz_display})"
+
+
+@traced("render_current")
+def _render_current_section(weather_data, air=None):
+    """헤더, 현재 기온, 상세 정보, 대기질, 일출/일몰 카드를 표시합니다 (라이브 모드에서 주기적으로 다시 그려지는 부분)."""
+    markup = get_render_memo().get('current', _current_markup, weather_data, *display_preferences(), air)
     
-    # 대구광역시
-    "대구": "Daegu",
-    "대구광역시": "Daegu",
-    "수성": "Suseong-gu,Daegu,KR",
-    "수성구": "Suseong-gu,Daegu,KR",
-    "달서": "Dalseo-gu,Daegu,KR",
-    "달서구": "Dalseo-gu,Daegu,KR",
+    # 화면 표시 - 헤더 (현지 시각만 매번 새로 채움)
+    st.markdown(markup['header'].replace(CLOCK_SLOT, _clock_text(weather_data['timezone'])), unsafe_allow_html=True)
     
-    # 인천광역시
-    "인천": "Incheon",
-    "인천광역시": "Incheon",
-    "남동": "Namdong-gu,Incheon,KR",
-    "남동구": "Namdong-gu,Incheon,KR",
-    "부평": "Bupyeong-gu,Incheon,KR",
-    "부평구": "Bupyeong-gu,Incheon,KR",
-    "연수": "Yeonsu-gu,Incheon,KR",
-    "연수구": "Yeonsu-gu,Incheon,KR",
-    "중구": "Jung-gu,Incheon,KR",
-    "계양": "Gyeyang-gu,Incheon,KR",
-    "계양구": "Gyeyang-gu,Incheon,KR",
-    "서구": "Seo-gu,Incheon,KR",
-    "동구": "Dong-gu,Incheon,KR",
-    "미추홀": "Michuhol-gu,Incheon,KR",
-    "미추홀구": "Michuhol-gu,Incheon,KR",
-    "송도": "Songdo,Incheon,KR",
-    "강화": "Ganghwa-gun,Incheon,KR",
-    "강화군": "Ganghwa-gun,Incheon,KR",
+    # 날씨 아이콘과 주요 정보
+    col1, col2, col3 = st.columns([1, 2, 1])
     
-    # 광주광역시
-    "광주": "Gwangju",
-    "광주광역시": "Gwangju",
-    "광산": "Gwangsan-gu,Gwangju,KR",
-    "광산구": "Gwangsan-gu,Gwangju,KR",
+    with col1:
+        st.image(markup['icon_url'], width=150)
     
-    # 대전광역시
-    "대전": "Daejeon",
-    "대전광역시": "Daejeon",
-    "유성": "Yuseong-gu,Daejeon,KR",
-    "유성구": "Yuseong-gu,Daejeon,KR",
-    "서구": "Seo-gu,Daejeon,KR",
-    "중구": "Jung-gu,Daejeon,KR",
-    "동구": "Dong-gu,Daejeon,KR",
-    "대덕": "Daedeok-gu,Daejeon,KR",
-    "대덕구": "Daedeok-gu,Daejeon,KR",
+    with col2:
+        st.markdown(markup['main'], unsafe_allow_html=True)
     
-    # 울산광역시
-    "울산": "Ulsan",
-    "울산광역시": "Ulsan",
-    "남구": "Nam-gu,Ulsan,KR",
-    "동구": "Dong-gu,Ulsan,KR",
-    "북구": "Buk-gu,Ulsan,KR",
-    "중구": "Jung-gu,Ulsan,KR",
-    "울주": "Ulju-gun,Ulsan,KR",
-    "울주군": "Ulju-gun,Ulsan,KR",
+    with col3:
+        st.metric("최고", markup['temp_max'], None)
+        st.metric("최저", markup['temp_min'], None)
     
-    # 세종특별자치시
-    "세종": "Sejong",
-    "세종시": "Sejong",
-    "세종특별자치시": "Sejong",
+    st.markdown("---")
     
-    # 경기도
-    "수원": "Suwon",
-    "장안구": "Jangan-gu,Suwon,KR",
-    "권선구": "Gwonseon-gu,Suwon,KR",
-    "팔달구": "Paldal-gu,Suwon,KR",
-    "영통구": "Yeongtong-gu,Suwon,KR",
-    "성남": "Seongnam",
-    "분당": "Bundang-gu,Seongnam,KR",
-    "분당구": "Bundang-gu,Seongnam,KR",
-    "수정구": "Sujeong-gu,Seongnam,KR",
-    "중원구": "Jungwon-gu,Seongnam,KR",
-    "고양": "Goyang",
-    "일산": "Ilsandong-gu,Goyang,KR",
-    "일산동구": "Ilsandong-gu,Goyang,KR",
-    "일산서구": "Ilsanseo-gu,Goyang,KR",
-    "덕양구": "Deogyang-gu,Goyang,KR",
-    "용인": "Yongin",
-    "기흥구": "Giheung-gu,Yongin,KR",
-    "수지구": "Suji-gu,Yongin,KR",
-    "처인구": "Cheoin-gu,Yongin,KR",
-    "부천": "Bucheon",
-    "안산": "Ansan",
-    "단원구": "Danwon-gu,Ansan,KR",
-    "상록구": "Sangnok-gu,Ansan,KR",
-    "안양": "Anyang",
-    "만안구": "Manan-gu,Anyang,KR",
-    "동안구": "Dongan-gu,Anyang,KR",
-    "남양주": "Namyangju",
-    "화성": "Hwaseong",
-    "평택": "Pyeongtaek",
-    "의정부": "Uijeongbu",
-    "시흥": "Siheung",
-    "파주": "Paju",
-    "김포": "Gimpo",
-    "광명": "Gwangmyeong",
-    "광주시": "Gwangju-si,Gyeonggi,KR",
-    "군포": "Gunpo",
-    "하남": "Hanam",
-    "오산": "Osan",
-    "양주": "Yangju",
-    "이천": "Icheon",
-    "구리": "Guri",
-    "안성": "Anseong",
-    "포천": "Pocheon",
-    "의왕": "Uiwang",
-    "양평": "Yangpyeong",
-    "여주": "Yeoju",
-    "동두천": "Dongducheon",
-    "과천": "Gwacheon",
-    "가평": "Gapyeong",
-    "연천": "Yeoncheon",
+    # 상세 정보
+    st.subheader("📊 상세 날씨 정보")
     
-    # 강원도
-    "춘천": "Chuncheon",
-    "원주": "Wonju",
-    "강릉": "Gangneung",
-    "동해": "Donghae",
-    "태백": "Taebaek",
-    "속초": "Sokcho",
-    "삼척": "Samcheok",
-    "홍천": "Hongcheon",
-    "횡성": "Hoengseong",
-    "영월": "Yeongwol",
-    "평창": "Pyeongchang",
-    "정선": "Jeongseon",
-    "철원": "Cheorwon",
-    "화천": "Hwacheon",
-    "양구": "Yanggu",
-    "인제": "Inje",
-    "고성": "Goseong",
-    "양양": "Yangyang",
-    "강원도": "Gangwon-do",
+    for col, card in zip(st.columns(4), markup['details']):
+        with col:
+            st.markdown(card, unsafe_allow_html=True)
     
-    # 충청북도
-    "청주": "Cheongju",
-    "상당구": "Sangdang-gu,Cheongju,KR",
-    "서원구": "Seowon-gu,Cheongju,KR",
-    "흥덕구": "Heungdeok-gu,Cheongju,KR",
-    "청원구": "Cheongwon-gu,Cheongju,KR",
-    "충주": "Chungju",
-    "제천": "Jecheon",
-    "보은": "Boeun",
-    "옥천": "Okcheon",
-    "영동": "Yeongdong",
-    "증평": "Jeungpyeong",
-    "진천": "Jincheon",
-    "괴산": "Goesan",
-    "음성": "Eumseong",
-    "단양": "Danyang",
-    "충청북도": "Chungcheongbuk-do",
+    # 대기질과 자외선 (예보와 함께 동시에 요청한 결과)
+    if markup['air']:
+        st.write("")
+        for col, card in zip(st.columns(len(markup['air'])), markup['air']):
+            with col:
+                st.markdown(card, unsafe_allow_html=True)
     
-    # 충청남도
-    "천안": "Cheonan",
-    "동남구": "Dongnam-gu,Cheonan,KR",
-    "서북구": "Seobuk-gu,Cheonan,KR",
-    "공주": "Gongju",
-    "보령": "Boryeong",
-    "아산": "Asan",
-    "서산": "Seosan",
-    "논산": "Nonsan",
-    "계룡": "Gyeryong",
-    "당진": "Dangjin",
-    "금산": "Geumsan",
-    "부여": "Buyeo",
-    "서천": "Seocheon",
-    "청양": "Cheongyang",
-    "홍성": "Hongseong",
-    "예산": "Yesan",
-    "태안": "Taean",
-    "충청남도": "Chungcheongnam-do",
+    st.markdown("---")
     
-    # 전라북도
-    "전주": "Jeonju",
-    "완산구": "Wansan-gu,Jeonju,KR",
-    "덕진구": "Deokjin-gu,Jeonju,KR",
-    "군산": "Gunsan",
-    "익산": "Iksan",
-    "정읍": "Jeongeup",
-    "남원": "Namwon",
-    "김제": "Gimje",
-    "완주": "Wanju",
-    "진안": "Jinan",
-    "무주": "Muju",
-    "장수": "Jangsu",
-    "임실": "Imsil",
-    "순창": "Sunchang",
-    "고창": "Gochang",
-    "부안": "Buan",
-    "전라북도": "Jeollabuk-do",
+    # 일출/일몰 정보
+    st.subheader("🌅 일출 · 일몰 정보")
+    col1, col2 = st.columns(2)
     
-    # 전라남도
-    "목포": "Mokpo",
-    "여수": "Yeosu",
-    "순천": "Suncheon",
-    "나주": "Naju",
-    "광양": "Gwangyang",
-    "담양": "Damyang",
-    "곡성": "Gokseong",
-    "구례": "Gurye",
-    "고흥": "Goheung",
-    "보성": "Boseong",
-    "화순": "Hwasun",
-    "장흥": "Jangheung",
-    "강진": "Gangjin",
-    "해남": "Haenam",
-    "영암": "Yeongam",
-    "무안": "Muan",
-    "함평": "Hampyeong",
-    "영광": "Yeonggwang",
-    "장성": "Jangseong",
-    "완도": "Wando",
-    "진도": "Jindo",
-    "신안": "Sinan",
-    "전라남도": "Jeollanam-do",
+    with col1:
+        st.markdown(markup['sunrise'], unsafe_allow_html=True)
     
-    # 경상북도
-    "포항": "Pohang",
-    "남구": "Nam-gu,Pohang,KR",
-    "북구": "Buk-gu,Pohang,KR",
-    "경주": "Gyeongju",
-    "김천": "Gimcheon",
-    "안동": "Andong",
-    "구미": "Gumi",
-    "영주": "Yeongju",
-    "영천": "Yeongcheon",
-    "상주": "Sangju",
-    "문경": "Mungyeong",
-    "경산": "Gyeongsan",
-    "군위": "Gunwi",
-    "의성": "Uiseong",
-    "청송": "Cheongsong",
-    "영양": "Yeongyang",
-    "영덕": "Yeongdeok",
-    "청도": "Cheongdo",
-    "고령": "Goryeong",
-    "성주": "Seongju",
-    "칠곡": "Chilgok",
-    "예천": "Yecheon",
-    "봉화": "Bonghwa",
-    "울진": "Uljin",
-    "울릉": "Ulleung",
-    "울릉도": "Ulleungdo",
-    "경상북도": "Gyeongsangbuk-do",
+    with col2:
+        st.markdown(markup['sunset'], unsafe_allow_html=True)
+
+
+def _weekly_markup(forecast_data, units, lang):
+    """주간 예보 카드 마크업 {'cards': [(요일 라벨, 아이콘 URL, 기온/설명), ...]} (최대 7일)."""
+    forecast_items = aggregate_daily_forecast(forecast_data, days=7)
+    if not forecast_items:
+        return {'cards': []}
     
-    # 경상남도
-    "창원": "Changwon",
-    "의창구": "Uichang-gu,Changwon,KR",
-    "성산구": "Seongsan-gu,Changwon,KR",
-    "마산": "Masan,Changwon,KR",
-    "마산합포구": "Masanhappo-gu,Changwon,KR",
-    "마산회원구": "Masanhoewon-gu,Changwon,KR",
-    "진해": "Jinhae-gu,Changwon,KR",
-    "진해구": "Jinhae-gu,Changwon,KR",
-    "진주": "Jinju",
-    "통영": "Tongyeong",
-    "사천": "Sacheon",
-    "김해": "Gimhae",
-    "밀양": "Miryang",
-    "거제": "Geoje",
-    "양산": "Yangsan",
-    "의령": "Uiryeong",
-    "함안": "Haman",
-    "창녕": "Changnyeong",
-    "고성군": "Goseong-gun,Gyeongnam,KR",
-    "남해": "Namhae",
-    "하동": "Hadong",
-    "산청": "Sancheong",
-    "함양": "Hamyang",
-    "거창": "Geochang",
-    "합천": "Hapcheon",
-    "경상남도": "Gyeongsangnam-do",
+    # 날짜별 대표 항목의 쾌적도와 표시 값을 한 번에 계산
+    comfort = items_metrics([item for _, item in forecast_items])['comfort']
+    shown = localize_items([item for _, item in forecast_items], units, lang)
     
-    # 제주특별자치도
-    "제주": "Jeju",
-    "제주시": "Jeju City",
-    "서귀포": "Seogwipo",
-    "제주도": "Jeju",
-}
+    cards = []
+    for idx, (date_key, item) in enumerate(forecast_items):
+        temp = shown['temp'][idx]
+        temp_min = shown['temp_min'][idx]
+        temp_max = shown['temp_max'][idx]
+        weather_desc = shown['description'][idx]
+        weather_icon = item['weather'][0]['icon']
+        condition, emoji = comfort_label(comfort[idx])
+        
+        # 날짜와 요일 (도시 현지 날짜 기준, 캐시된 표에서 조회)
+        date_display, weekday_display = date_labels(date_key)
+        
+        # 카드 형태로 표시
+        cards.append((
+            f"""
+                                <div style='text-align: center; padding: 12px; background: linear-gradient(135deg, #e0e7ff 0%, #f3f4f6 100%); border-radius: 10px; margin-bottom: 8px;'>
+                                    <p style='font-weight: bold; margin: 0; color: #667eea; font-size: 14px;'>{weekday_display}요일</p>
+                                    <p style='margin: 4px 0; color: #888; font-size: 12px;'>{date_display}</p>
+                                </div>
+                                """,
+            f"http://openweathermap.org/img/wn/{weather_icon}@2x.png",
+            f"""
+                                <div style='text-align: center;'>
+                                    <p style='font-size: 20px; font-weight: bold; margin: 4px 0; color: #667eea;'>{temp:.0f}°</p>
+                                    <p style='font-size: 11px; color: #888; margin: 2px 0;'>최고 {temp_max:.0f}°</p>
+                                    <p style='font-size: 11px; color: #888; margin: 2px 0;'>최저 {temp_min:.0f}°</p>
+                                    <p style='font-size: 11px; color: #666; margin: 4px 0;'>{weather_desc}</p>
+                                    <p style='font-size: 11px; color: #666; margin: 2px 0;'>{emoji} {condition}</p>
+                                </div>
+                                """
+        ))
+    return {'cards': cards}
+
+
+# 시간대별 예보 범위 선택지 (시간). 받은 예보 전체(None)는 실제 데이터 길이로 이름을 붙임
+HOURLY_RANGES = {24: "24시간", 48: "48시간"}
 
-def get_weather(city):
-    """도시 이름으로 날씨 정보를 가져옵니다."""
-    # 한글 도시명을 영문으로 변환
-    if city in KOREAN_CITIES:
-        english_city = KOREAN_CITIES[city]
+
+def _hourly_ranges(forecast_data):
+    """예보 길이에 맞는 범위 선택지 {시간 또는 None: 이름}.
+    예보 전체보다 짧은 범위만 남기고 마지막에 전체를 둡니다 (5일 예보: 120시간, One Call: 48시간)."""
+    items = forecast_data['list']
+    interval = items[1]['dt'] - items[0]['dt'] if len(items) > 1 else 3600
+    span_hours = round((items[-1]['dt'] - items[0]['dt'] + interval) / 3600)
+    ranges = {hours: label for hours, label in HOURLY_RANGES.items() if hours < span_hours}
+    if span_hours > 48 and span_hours % 24 == 0:
+        ranges[None] = f"전체 ({span_hours // 24}일)"
     else:
-        english_city = city
+        ranges[None] = f"전체 ({span_hours}시간)"
+    return ranges
+
+
+def _hourly_view(forecast_data, units, lang, hours):
+    """시간대별 예보 차트(Vega-Lite 명세)와 표 컬럼을 컬럼형 예보 데이터에서 한 번에 만듭니다."""
+    columns = hourly_forecast_columns(forecast_data, hours, units, lang)
+    temp_symbol = unit_system(units).temp_symbol
     
-    params = {
-        'q': english_city,
-        'appid': API_KEY,
-        'units': 'metric',  # 섭씨 온도 사용
-        'lang': 'kr'  # 한국어 설명
+    # 기온/체감온도는 왼쪽 축, 강수확률은 오른쪽 축 (마우스를 올리면 그 시각의 값 표시)
+    records = [
+        {'시각': time_label, '기온': temp, '체감온도': feels_like, '강수확률': pop, '날씨': description}
+        for time_label, temp, feels_like, pop, description in zip(
+            columns['time'], columns['temp'], columns['feels_like'], columns['pop'], columns['description']
+        )
+    ]
+    tooltip = [
+        {'field': '시각', 'type': 'nominal'},
+        {'field': '기온', 'type': 'quantitative', 'format': '.1f'},
+        {'field': '체감온도', 'type': 'quantitative', 'format': '.1f'},
+        {'field': '강수확률', 'type': 'quantitative'},
+        {'field': '날씨', 'type': 'nominal'},
+    ]
+    chart = {
+        'data': {'values': records},
+        'height': 280,
+        'encoding': {
+            'x': {'field': '시각', 'type': 'ordinal', 'sort': None, 'title': None, 'axis': {'labelAngle': -45}}
+        },
+        'layer': [
+            {
+                'transform': [{'fold': ['기온', '체감온도'], 'as': ['구분', '값']}],
+                'mark': {'type': 'line', 'point': True},
+                'encoding': {
+                    'y': {'field': '값', 'type': 'quantitative', 'title': f"기온 ({temp_symbol})",
+                          'scale': {'zero': False}},
+                    'color': {'field': '구분', 'type': 'nominal', 'title': None,
+                              'scale': {'range': ['#667eea', '#ff8787']}},
+                    'tooltip': tooltip,
+                },
+            },
+            {
+                'mark': {'type': 'line', 'strokeDash': [4, 3], 'color': '#4dabf7', 'point': True},
+                'encoding': {
+                    'y': {'field': '강수확률', 'type': 'quantitative', 'title': '강수확률 (%)',
+                          'scale': {'domain': [0, 100]}},
+                    'tooltip': tooltip,
+                },
+            },
+        ],
+        'resolve': {'scale': {'y': 'independent'}},
     }
-    
-    try:
-        response = requests.get(BASE_URL, params=params)
-        response.raise_for_status()
-        return response.json()
-    except requests.exceptions.RequestException as e:
-        return None
+    table = {
+        '시각': columns['time'],
+        f'기온 ({temp_symbol})': columns['temp'],
+        f'체감 ({temp_symbol})': columns['feels_like'],
+        '강수확률 (%)': columns['pop'],
+        '습도 (%)': columns['humidity'],
+        f'풍속 ({unit_system(units).speed_symbol})': columns['wind_speed'],
+        '날씨': columns['description'],
+        '쾌적도': columns['comfort'],
+    }
+    return {'chart': chart, 'table': table}
 
-def display_weather(weather_data, show_current_location: bool = False):
+
+@traced("render_hourly")
+def _render_hourly_section(forecast_data):
+    """시간대별 상세 예보를 표시합니다 (라이브 모드에서 주기적으로 다시 그려지는 부분).
+    범위와 관계없이 차트 하나와 표 하나만 내보냅니다."""
+    with st.expander("🕐 시간대별 상세 예보 보기"):
+        if forecast_data and forecast_data.get('list'):
+            ranges = _hourly_ranges(forecast_data)
+            # 이전 도시에서 고른 범위가 이번 예보의 선택지에 없으면(예: One Call의 48시간) 첫 선택지로 되돌림
+            if st.session_state.get('hourly_hours', next(iter(ranges))) not in ranges:
+                st.session_state['hourly_hours'] = next(iter(ranges))
+            hours = st.radio("범위", list(ranges), format_func=ranges.get, horizontal=True, key="hourly_hours")
+            view = get_render_memo().get('hourly', _hourly_view, forecast_data, *display_preferences(), hours)
+            
+            st.markdown(f"### 📈 향후 {ranges[hours]} 날씨")
+            st.vega_lite_chart(view['chart'], use_container_width=True)
+            st.dataframe(view['table'], hide_index=True, use_container_width=True)
+
+
+def _run_live(render, interval):
+    """render를 interval초마다 해당 부분만 다시 실행되는 fragment로 실행합니다.
+    fragment를 지원하지 않는 Streamlit 버전에서는 한 번만 그립니다."""
+    fragment = getattr(st, "fragment", None) or getattr(st, "experimental_fragment", None)
+    if fragment is None:
+        render()
+        return
+    fragment(render, run_every=interval)()
+
+
+def display_weather(weather_data, show_current_location: bool = False, live_interval=None):
     """날씨 정보를 화면에 표시합니다.
 
     show_current_location: 지도에 브라우저의 현재 위치도 함께 표시할지 여부
+    live_interval: 라이브 모드 갱신 간격(초). 지정하면 현재 날씨와 시간대별 예보만
+        fragment로 주기적으로 갱신하며, 같은 간격의 화면들은 같은 캐시 항목을 공유합니다.
     """
     if weather_data:
-        # 기본 정보
         city_name = weather_data['name']
         country = weather_data['sys']['country']
         lat = weather_data.get('coord', {}).get('lat')
         lon = weather_data.get('coord', {}).get('lon')
+        live = bool(live_interval) and lat is not None and lon is not None
+        # 라이브 모드의 현재 갱신 구간 번호 (캐시 키로 사용)
+        bucket = int(time.time() // live_interval) if live else None
         
-        # 날씨 정보
-        temp = weather_data['main']['temp']
-        feels_like = weather_data['main']['feels_like']
-        temp_min = weather_data['main']['temp_min']
-        temp_max = weather_data['main']['temp_max']
-        humidity = weather_data['main']['humidity']
-        pressure = weather_data['main']['pressure']
-        
-        # 날씨 상태
-        weather_main = weather_data['weather'][0]['main']
-        weather_desc = weather_data['weather'][0]['description']
-        weather_icon = weather_data['weather'][0]['icon']
-        
-        # 바람
-        wind_speed = weather_data['wind']['speed']
-        
-        # 시간 정보 (검색된 도시의 타임존 기준)
-        timezone_offset = weather_data['timezone']  # UTC로부터의 초 단위 오프셋
+        # 예보와 대기질을 동시에 요청해 두고 필요한 섹션에서 결과를 기다림 (대기 시간 = 가장 느린 호출 하나)
+        pending = start_location_fetch(lat, lon, bucket) if lat is not None and lon is not None else None
         
-        # UTC 시간 기준으로 현재 시각 계산
-        from datetime import timezone as tz, timedelta
-        utc_now = datetime.now(tz.utc)
-        local_time = utc_now + timedelta(seconds=timezone_offset)
-        
-        # 일출/일몰 시간 (검색된 도시 기준)
-        sunrise_utc = datetime.fromtimestamp(weather_data['sys']['sunrise'], tz.utc)
-        sunset_utc = datetime.fromtimestamp(weather_data['sys']['sunset'], tz.utc)
-        sunrise = sunrise_utc + timedelta(seconds=timezone_offset)
-        sunset = sunset_utc + timedelta(seconds=timezone_offset)
-        
-        # 요일 한글 변환
-        weekday_kr = {
-            'Monday': '월요일',
-            'Tuesday': '화요일', 
-            'Wednesday': '수요일',
-            'Thursday': '목요일',
-            'Friday': '금요일',
-            'Saturday': '토요일',
-            'Sunday': '일요일'
-        }
-        weekday_eng = local_time.strftime('%A')
-        weekday_display = weekday_kr.get(weekday_eng, weekday_eng)
-        
-        # 타임존 표시 (UTC 오프셋)
-        tz_hours = timezone_offset // 3600
-        tz_minutes = abs(timezone_offset % 3600) // 60
-        if tz_minutes == 0:
-            tz_display = f"UTC{tz_hours:+d}"
+        if live:
+            def render_live_current():
+                # fragment 갱신만 일어나는 화면도 활동 중인 세션으로 기록
+                track_session()
+                # fragment 갱신은 main() 밖에서 실행되므로 별도 trace로 기록
+                with get_tracer().trace("live_current", location_method="live"):
+                    # 갱신 구간 번호가 캐시 키에 들어가므로 여러 화면이 열려 있어도 구간당 한 번만 호출
+                    live_bucket = int(time.time() // live_interval)
+                    # 예보는 시간대별 fragment가 가져오므로 여기서는 대기질만 함께 시작
+                    live_pending = start_location_fetch(lat, lon, live_bucket, forecast=False)
+                    fresh = get_weather_by_coords(lat, lon, city_name, country, bucket=live_bucket) or weather_data
+                    # 좌표 조회 결과의 지명 대신 처음 표시한 이름을 유지 (캐시된 값은 공유되므로 복사해서 변경)
+                    fresh = dict(fresh, name=city_name, sys=dict(fresh['sys'], country=country))
+                    _render_current_section(fresh, live_pending['air'].result())
+                st.caption(f"🔴 라이브 모드 · {live_interval}초마다 갱신 · "
+                           f"마지막 갱신 {datetime.now().strftime('%H:%M:%S')}")
+            
+            _run_live(render_live_current, live_interval)
         else:
-            tz_display = f"UTC{tz_hours:+d}:{tz_minutes:02d}"
-        
-        # 화면 표시 - 헤더
-        st.markdown(f"""
-        <div style='text-align: center; padding: 20px; background: linear-gradient(135deg, #667eea 0%, #764ba2 100%); border-radius: 10px; margin-bottom: 20px;'>
-            <h1 style='color: white; margin: 0;'>🌤️ {city_name}, {country}</h1>
-            <p style='color: #f0f0f0; font-size: 16px; margin: 10px 0 0 0;'>
-                📅 {local_time.strftime('%Y년 %m월 %d일')} {weekday_display} | 🕐 {local_time.strftime('%H:%M:%S')} ({tz_display})
-            </p>
-        </div>
-        """, unsafe_allow_html=True)
-        
-        # 날씨 아이콘과 주요 정보
-        icon_url = f"http://openweathermap.org/img/wn/{weather_icon}@4x.png"
-        
-        col1, col2, col3 = st.columns([1, 2, 1])
-        
-        with col1:
-            st.image(icon_url, width=150)
-        
-        with col2:
-            st.markdown(f"""
-            <div style='text-align: center; padding: 20px;'>
-                <h1 style='font-size: 72px; margin: 0; color: #667eea;'>{temp:.1f}°C</h1>
-                <p style='font-size: 24px; color: #666; margin: 10px 0;'>{weather_desc.capitalize()}</p>
-                <p style='font-size: 18px; color: #888;'>체감온도: {feels_like:.1f}°C</p>
-            </div>
-            """, unsafe_allow_html=True)
-        
-        with col3:
-            st.metric("최고", f"{temp_max:.1f}°C", None)
-            st.metric("최저", f"{temp_min:.1f}°C", None)
-        
-        st.markdown("---")
-        
-        # 상세 정보
-        st.subheader("📊 상세 날씨 정보")
-        
-        col1, col2, col3, col4 = st.columns(4)
-        
-        with col1:
-            st.markdown(f"""
-            <div style='text-align: center; padding: 20px; background-color: #f8f9fa; border-radius: 10px;'>
-                <h3 style='color: #667eea; margin: 0;'>💧 습도</h3>
-                <p style='font-size: 32px; margin: 10px 0; font-weight: bold;'>{humidity}%</p>
-            </div>
-            """, unsafe_allow_html=True)
-        
-        with col2:
-            st.markdown(f"""
-            <div style='text-align: center; padding: 20px; background-color: #f8f9fa; border-radius: 10px;'>
-                <h3 style='color: #667eea; margin: 0;'>🌡️ 기압</h3>
-                <p style='font-size: 32px; margin: 10px 0; font-weight: bold;'>{pressure}</p>
-                <p style='font-size: 14px; color: #888; margin: 0;'>hPa</p>
-            </div>
-            """, unsafe_allow_html=True)
-        
-        with col3:
-            st.markdown(f"""
-            <div style='text-align: center; padding: 20px; background-color: #f8f9fa; border-radius: 10px;'>
-                <h3 style='color: #667eea; margin: 0;'>💨 풍속</h3>
-                <p style='font-size: 32px; margin: 10px 0; font-weight: bold;'>{wind_speed}</p>
-                <p style='font-size: 14px; color: #888; margin: 0;'>m/s</p>
-            </div>
-            """, unsafe_allow_html=True)
-        
-        with col4:
-            # 체감 지수 계산 (간단한 예시)
-            if temp < 0:
-                condition = "매우 추움"
-                emoji = "🥶"
-            elif temp < 10:
-                condition = "추움"
-                emoji = "😰"
-            elif temp < 20:
-                condition = "쾌적"
-                emoji = "😊"
-            elif temp < 28:
-                condition = "따뜻함"
-                emoji = "🙂"
-            else:
-                condition = "더움"
-                emoji = "🥵"
-                
-            st.markdown(f"""
-            <div style='text-align: center; padding: 20px; background-color: #f8f9fa; border-radius: 10px;'>
-                <h3 style='color: #667eea; margin: 0;'>🌡️ 체감</h3>
-                <p style='font-size: 32px; margin: 10px 0;'>{emoji}</p>
-                <p style='font-size: 14px; color: #888; margin: 0;'>{condition}</p>
-            </div>
-            """, unsafe_allow_html=True)
-        
-        st.markdown("---")
-        
-        # 일출/일몰 정보
-        st.subheader("🌅 일출 · 일몰 정보")
-        col1, col2 = st.columns(2)
-        
-        with col1:
-            st.markdown(f"""
-            <div style='text-align: center; padding: 30px; background: linear-gradient(135deg, #FFA17F 0%, #FF6B6B 100%); border-radius: 10px;'>
-                <h2 style='color: white; margin: 0;'>🌅 일출</h2>
-                <p style='font-size: 48px; color: white; margin: 10px 0; font-weight: bold;'>{sunrise.strftime('%H:%M')}</p>
-            </div>
-            """, unsafe_allow_html=True)
+            _render_current_section(weather_data, pending['air'].result() if pending else None)
         
-        with col2:
-            st.markdown(f"""
-            <div style='text-align: center; padding: 30px; background: linear-gradient(135deg, #667eea 0%, #764ba2 100%); border-radius: 10px;'>
-                <h2 style='color: white; margin: 0;'>🌇 일몰</h2>
-                <p style='font-size: 48px; color: white; margin: 10px 0; font-weight: bold;'>{sunset.strftime('%H:%M')}</p>
-            </div>
-            """, unsafe_allow_html=True)
+        # 최근 기록 섹션 (앱이 저장한 관측값이 있을 때만 표시)
+        if lat is not None and lon is not None:
+            with span("history"):
+                history = [get_historical_weather(lat, lon, days_ago) for days_ago in range(7, 0, -1)]
+                history = [day for day in history if day]
+            if history:
+                st.markdown("---")
+                st.subheader("📈 최근 기온 기록")
+                units = display_preferences()[0]
+                st.line_chart(
+                    {
+                        '날짜': [day['date'] for day in history],
+                        '최고': convert_temperature([day['temp_max'] for day in history], units).round(1),
+                        '최저': convert_temperature([day['temp_min'] for day in history], units).round(1)
+                    },
+                    x='날짜',
+                    y=['최고', '최저']
+                )
+                st.caption(f"💾 이 앱이 기록한 관측값 기준 (최근 {len(history)}일, 추가 API 호출 없음)")
 
         # 주간 날씨 예보 섹션
         if lat is not None and lon is not None:
             st.markdown("---")
             st.subheader("📅 주간 날씨 예보")
             
-            with st.spinner('📊 예보 데이터를 가져오는 중...'):
-                forecast_data = get_forecast_data(lat, lon)
+            with st.spinner('📊 예보 데이터를 가져오는 중...'), span("weekly_section") as weekly_span:
+                forecast_data = pending['forecast'].result()
                 
-                if forecast_data and forecast_data.get('list'):
-                    # 일별로 데이터 그룹화 (하루에 하나씩만 표시)
-                    daily_forecasts = {}
-                    for item in forecast_data['list']:
-                        dt = datetime.fromtimestamp(item['dt'])
-                        date_key = dt.strftime('%Y-%m-%d')
-                        
-                        # 각 날짜의 정오(12시) 데이터 우선 선택, 없으면 첫 데이터
-                        if date_key not in daily_forecasts:
-                            daily_forecasts[date_key] = item
-                        elif dt.hour == 12:  # 정오 데이터 우선
-                            daily_forecasts[date_key] = item
-                    
-                    # 최대 7일치 표시
-                    forecast_items = list(daily_forecasts.items())[:7]
-                    
+                weekly = get_render_memo().get('weekly', _weekly_markup, forecast_data, *display_preferences())
+                weekly_span.set(days=len(weekly['cards']), forecast_items=len((forecast_data or {}).get('list', [])))
+                
+                if weekly['cards']:
                     # 7개의 컬럼으로 표시
-                    cols = st.columns(min(7, len(forecast_items)))
+                    for col, (label, icon_url, body) in zip(st.columns(len(weekly['cards'])), weekly['cards']):
+                        with col:
+                            st.markdown(label, unsafe_allow_html=True)
+                            st.image(icon_url, width=60)
+                            st.markdown(body, unsafe_allow_html=True)
                     
-                    for idx, (date_key, item) in enumerate(forecast_items):
-                        if idx < len(cols):
-                            with cols[idx]:
-                                dt = datetime.fromtimestamp(item['dt'])
-                                temp = item['main']['temp']
-                                temp_min = item['main']['temp_min']
-                                temp_max = item['main']['temp_max']
-                                weather_desc = item['weather'][0]['description']
-                                weather_icon = item['weather'][0]['icon']
-                                
-                                # 요일 표시
-                                weekday = dt.strftime('%a')
-                                weekday_kr = {'Mon': '월', 'Tue': '화', 'Wed': '수', 
-                                            'Thu': '목', 'Fri': '금', 'Sat': '토', 'Sun': '일'}
-                                weekday_display = weekday_kr.get(weekday, weekday)
-                                
-                                # 날짜 표시
-                                date_display = dt.strftime('%m/%d')
-                                
-                                # 아이콘 URL
-                                icon_url = f"http://openweathermap.org/img/wn/{weather_icon}@2x.png"
-                                
-                                # 카드 형태로 표시
-                                st.markdown(f"""
-                                <div style='text-align: center; padding: 12px; background: linear-gradient(135deg, #e0e7ff 0%, #f3f4f6 100%); border-radius: 10px; margin-bottom: 8px;'>
-                                    <p style='font-weight: bold; margin: 0; color: #667eea; font-size: 14px;'>{weekday_display}요일</p>
-                                    <p style='margin: 4px 0; color: #888; font-size: 12px;'>{date_display}</p>
-                                </div>
-                                """, unsafe_allow_html=True)
-                                
-                                st.image(icon_url, width=60)
-                                
-                                st.markdown(f"""
-                                <div style='text-align: center;'>
-                                    <p style='font-size: 20px; font-weight: bold; margin: 4px 0; color: #667eea;'>{temp:.0f}°</p>
-                                    <p style='font-size: 11px; color: #888; margin: 2px 0;'>최고 {temp_max:.0f}°</p>
-                                    <p style='font-size: 11px; color: #888; margin: 2px 0;'>최저 {temp_min:.0f}°</p>
-                                    <p style='font-size: 11px; color: #666; margin: 4px 0;'>{weather_desc}</p>
-                                </div>
-                                """, unsafe_allow_html=True)
-                    
-                    st.caption("💡 OpenWeather API 무료 버전은 5일간의 3시간 간격 예보를 제공합니다.")
+                    if forecast_data.get('daily'):
+                        st.caption("💡 One Call 3.0 API로 최대 7일간의 일별 예보를 제공합니다.")
+                    else:
+                        st.caption("💡 OpenWeather API 무료 버전은 5일간의 3시간 간격 예보를 제공합니다.")
                 else:
                     st.info("📊 예보 데이터를 가져올 수 없습니다.")
             
             # 시간대별 상세 예보 (선택적으로 표시)
-            with st.expander("🕐 시간대별 상세 예보 보기"):
-                if forecast_data and forecast_data.get('list'):
-                    st.markdown("### 📈 향후 24시간 날씨")
-                    
-                    # 향후 24시간 (8개 데이터 포인트 = 3시간 * 8)
-                    hourly_data = forecast_data['list'][:8]
-                    
-                    for item in hourly_data:
-                        dt = datetime.fromtimestamp(item['dt'])
-                        temp = item['main']['temp']
-                        feels_like = item['main']['feels_like']
-                        humidity = item['main']['humidity']
-                        weather_desc = item['weather'][0]['description']
-                        weather_icon = item['weather'][0]['icon']
-                        pop = item.get('pop', 0) * 100  # 강수 확률
-                        
-                        icon_url = f"http://openweathermap.org/img/wn/{weather_icon}.png"
-                        
-                        col1, col2, col3, col4, col5 = st.columns([2, 1, 2, 2, 2])
-                        
-                        with col1:
-                            st.markdown(f"**{dt.strftime('%m/%d %H:%M')}**")
-                        with col2:
-                            st.image(icon_url, width=40)
-                        with col3:
-                            st.markdown(f"🌡️ {temp:.1f}°C (체감 {feels_like:.1f}°C)")
-                        with col4:
-                            st.markdown(f"💧 습도 {humidity}%")
-                        with col5:
-                            st.markdown(f"☔ 강수확률 {pop:.0f}%")
-                        
-                        st.caption(f"📝 {weather_desc}")
-                        st.markdown("---")
+            if live:
+                def render_live_hourly():
+                    with get_tracer().trace("live_hourly", location_method="live"):
+                        # 같은 구간의 예보 조회가 진행 중이면 (다른 화면, 첫 실행의 예보 등) 그 결과를 함께 기다림
+                        live_bucket = int(time.time() // live_interval)
+                        fresh_forecast = start_location_fetch(lat, lon, live_bucket, air=False)['forecast'].result()
+                        _render_hourly_section(fresh_forecast or forecast_data)
+                
+                _run_live(render_live_hourly, live_interval)
+            else:
+                _render_hourly_section(forecast_data)
 
         # 지도 섹션
         if lat is not None and lon is not None:
@@ -1043,7 +867,8 @@ def display_weather(weather_data, show_current_location: bool = False):
             st.caption(f"📍 좌표: 위도 {lat:.4f}, 경도 {lon:.4f}")
             
             try:
-                render_kakao_map(lat, lon, city_name, show_current_location)
+                with span("render_map"):
+                    render_kakao_map(lat, lon, city_name, show_current_location)
                 
                 # 지도 도움말
                 with st.expander("💡 지도 정보"):
@@ -1073,16 +898,32 @@ def display_weather(weather_data, show_current_location: bool = False):
                 st.info("💡 페이지를 새로고침하거나 나중에 다시 시도해주세요.")
 
 def main():
+    """페이지를 그립니다. 표본으로 뽑힌 실행(?debug=1이면 항상)은 단계별 span을 기록합니다."""
+    with get_tracer().trace("main", force=_debug_enabled()) as root:
+        try:
+            render_page()
+        finally:
+            city = st.session_state.get('city_input')
+            root.set(location_method=st.session_state.get('location_method') or ("search" if city else "home"))
+
+
+def render_page():
     st.set_page_config(
         page_title="날씨 앱",
         page_icon="🌤️",
         layout="wide"
     )
     
+    # API 키 검증
+    check_api_key()
+    
     # 세션 스테이트 초기화 (선택된 위치 방식 추적)
     if 'location_method' not in st.session_state:
         st.session_state.location_method = None
     
+    # 세션 상태 크기 점검 및 활동 기록
+    track_session()
+    
     # 사이드바
     st.sidebar.title("🌍 날씨 검색")
     st.sidebar.write("전세계 도시의 실시간 날씨를 확인하세요!")
@@ -1113,12 +954,23 @@ def main():
             key="ip_btn"
         )
     
+    # 전국 날씨 지도 버튼
+    overview_button = st.sidebar.button(
+        "🗺️ 전국 날씨 지도" if st.session_state.location_method != "MAP" else "✅ 전국 날씨 지도",
+        type="primary" if st.session_state.location_method == "MAP" else "secondary",
+        use_container_width=True,
+        help="한국 주요 도시의 현재 날씨를 한 지도에서 확인",
+        key="overview_btn"
+    )
+    
     # 현재 선택된 방식 표시
     if st.session_state.location_method:
         if st.session_state.location_method == "GPS":
             st.sidebar.info("🛰️ **GPS 모드** 활성화")
         elif st.session_state.location_method == "IP":
             st.sidebar.info("🌐 **IP 모드** 활성화")
+        elif st.session_state.location_method == "MAP":
+            st.sidebar.info("🗺️ **전국 지도** 표시 중")
     
     st.sidebar.markdown("---")
     st.sidebar.markdown("### 🔍 도시 검색")
@@ -1126,15 +978,46 @@ def main():
     # 도시 입력
     city = st.sidebar.text_input(
         "도시 이름을 입력하세요 (한글/영문)",
-        placeholder="예: 강남구, 해운대구, 분당구, 일산, Seoul"
+        placeholder="예: 강남구, 해운대구, 분당구, 일산, Seoul",
+        key="city_input"
     )
     
+    # 자동완성 후보 - 입력이 정확한 한국 도시 이름이 아니면 후보를 보여줌
+    candidates = suggest_cities(city) if city and city not in get_korean_cities() else []
+    if candidates:
+        st.sidebar.caption("혹시 이 지역인가요?")
+        for candidate in candidates:
+            st.sidebar.button(candidate, key=f"suggest_{candidate}", on_click=_choose_city, args=(candidate,))
+    
     # 검색 버튼
     search_button = st.sidebar.button("🔍 검색", type="primary")
     
+    # 첫 후보를 미리 조회 - 검색 버튼을 눌렀거나 입력이 이미 첫 후보와 같은 이름(예: Seoul → 서울)이면
+    # 이번 실행의 검색이 바로 같은 조회를 하므로 건너뜀
+    if candidates and not search_button and city_key(candidates[0]) != city_key(city):
+        get_prefetcher().submit(_current_session_id(), city_key(candidates[0]), prefetch_city, candidates[0])
+    
     # 지도 옵션
     show_current_location = st.sidebar.checkbox("지도에 현재 위치도 표시", value=False)
     
+    # 라이브 모드 (벽걸이 화면 등에서 현재 날씨와 시간대별 예보만 주기적으로 갱신)
+    live_mode = st.sidebar.checkbox("🔴 라이브 모드 (자동 갱신)", value=False, key="live_mode")
+    live_interval = None
+    if live_mode:
+        live_interval = st.sidebar.select_slider(
+            "갱신 간격",
+            options=LIVE_INTERVALS,
+            value=300,
+            format_func=lambda seconds: f"{seconds // 60}분",
+            key="live_interval"
+        )
+    
+    # 표시 단위와 날씨 설명 언어 (화면에 그릴 때만 변환하므로 바꿔도 API 호출과 캐시 항목이 늘지 않음)
+    st.sidebar.markdown("### ⚙️ 표시 설정")
+    st.sidebar.radio("단위", list(UNIT_SYSTEMS), format_func=lambda units: UNIT_SYSTEMS[units].label,
+                     horizontal=True, key="units")
+    st.sidebar.selectbox("날씨 설명 언어", list(LANGUAGES), format_func=LANGUAGES.get, key="lang")
+    
     # 버튼 클릭 처리
     if gps_location_button:
         st.session_state.location_method = "GPS"
@@ -1144,6 +1027,10 @@ def main():
         st.session_state.location_method = "IP"
         st.rerun()
     
+    if overview_button:
+        st.session_state.location_method = "MAP"
+        st.rerun()
+    
     # 도시 검색 시 위치 방식 초기화
     if search_button or city:
         st.session_state.location_method = None
@@ -1161,14 +1048,31 @@ def main():
         
         st.markdown("---")
         
-        # GPS 위치 획득 컴포넌트
-        get_location_by_gps()
+        # GPS 위치 획득 컴포넌트 - 위치를 받으면 바로 해당 좌표의 날씨를 표시
+        gps_location = get_location_by_gps()
         
         st.markdown("---")
         
-        # 수동 입력 옵션
-        with st.expander("📝 GPS 좌표를 직접 입력하기"):
-            st.info("위의 GPS 좌표를 복사하여 아래에 입력하거나, 직접 위도/경도를 입력하세요.")
+        if gps_location and 'error' not in gps_location:
+            with st.spinner('🌤️ 날씨 정보를 가져오는 중...'):
+                # 현재 날씨를 기다리는 동안 예보와 대기질도 함께 요청
+                weather_data = start_location_fetch(gps_location['lat'], gps_location['lon'], weather=True)['weather'].result()
+            
+            if weather_data and str(weather_data.get('cod')) != '404':
+                # 브라우저가 정확도를 알려주지 않으면 표시하지 않음
+                accuracy = f", ±{gps_location['accuracy']:.0f}m" if gps_location.get('accuracy') is not None else ""
+                st.success(f"✅ GPS 좌표 ({gps_location['lat']:.4f}, {gps_location['lon']:.4f}{accuracy})의 "
+                           f"날씨 정보를 불러왔습니다!")
+                show_nearby_caption(weather_data)
+                display_weather(weather_data, show_current_location=False, live_interval=live_interval)
+            else:
+                st.error("❌ 현재 위치의 날씨 정보를 가져올 수 없습니다.")
+            
+            st.markdown("---")
+        
+        # 수동 입력 옵션 (GPS를 사용할 수 없는 경우)
+        with st.expander("📝 GPS 좌표를 직접 입력하기", expanded=bool(gps_location and 'error' in gps_location)):
+            st.info("GPS를 사용할 수 없다면 위도/경도를 직접 입력하세요.")
             
             col1, col2 = st.columns(2)
             with col1:
@@ -1178,20 +1082,27 @@ def main():
             
             if st.button("🌤️ 이 좌표의 날씨 보기", type="primary"):
                 with st.spinner('🌤️ 날씨 정보를 가져오는 중...'):
-                    weather_data = get_weather_by_coords(manual_lat, manual_lon)
+                    weather_data = start_location_fetch(manual_lat, manual_lon, weather=True)['weather'].result()
                     
                     if weather_data and str(weather_data.get('cod')) != '404':
                         city_name = weather_data.get('name', 'Unknown')
                         st.success(f"✅ GPS 좌표 ({manual_lat:.4f}, {manual_lon:.4f})의 날씨 정보를 불러왔습니다!")
+                        show_nearby_caption(weather_data)
                         display_weather(weather_data, show_current_location=False)
                     else:
                         st.error("❌ 해당 좌표의 날씨 정보를 가져올 수 없습니다.")
                         st.warning("💡 좌표가 정확한지 확인해주세요.")
     
+    # 전국 날씨 지도
+    elif st.session_state.location_method == "MAP":
+        display_overview_map()
+    
     # IP 모드 실행
     elif st.session_state.location_method == "IP":
         with st.spinner('📡 현재 위치를 확인하는 중... (IP 주소 기반)'):
-            location_info = get_location_by_ip()
+            searched_at = time.time()
+            client_ip = get_client_ip()
+            location_info = get_location_by_ip(client_ip)
             
             if location_info:
                 # 위치 정보 표시
@@ -1206,16 +1117,21 @@ def main():
                 st.caption(f"📌 좌표: 위도 {location_info['lat']:.4f}, 경도 {location_info['lon']:.4f}")
                 
                 with st.spinner('🌤️ 날씨 정보를 가져오는 중...'):
-                    weather_data = get_weather_by_coords(location_info['lat'], location_info['lon'])
+                    weather_data = start_location_fetch(location_info['lat'], location_info['lon'], weather=True)['weather'].result()
                     
                     if weather_data and str(weather_data.get('cod')) != '404':
                         st.success(f"✅ {location_info['city']}의 날씨 정보를 불러왔습니다!")
-                        display_weather(weather_data, show_current_location=False)
+                        show_nearby_caption(weather_data)
+                        display_weather(weather_data, show_current_location=False, live_interval=live_interval)
                     else:
                         st.error("❌ 현재 위치의 날씨 정보를 가져올 수 없습니다.")
                         st.warning("💡 OpenWeather API에서 해당 좌표의 날씨 데이터를 찾을 수 없습니다.")
             else:
                 st.error("❌ 현재 위치를 확인할 수 없습니다.")
+                missed_at = ip_location_not_found_at(client_ip)
+                if missed_at and missed_at < searched_at:
+                    st.caption(f"🕒 {_since(missed_at)} 위치 서비스가 이 네트워크의 위치를 찾지 못해 다시 요청하지 않았습니다. "
+                               "잠시 후 다시 시도해주세요.")
                 st.warning("**가능한 원인:**")
                 st.markdown("""
                 - 네트워크 연결 불안정
@@ -1309,23 +1225,47 @@ def main():
     elif city:
         # 입력된 도시명 표시 (한글인 경우)
         display_city = city
-        if city in KOREAN_CITIES:
-            display_city = f"{city} ({KOREAN_CITIES[city]})"
+        korean_cities = get_korean_cities()
+        if city in korean_cities:
+            display_city = f"{city} ({korean_cities[city]})"
             
         with st.spinner(f'{display_city}의 날씨 정보를 가져오는 중...'):
+            searched_at = time.time()
+            get_prefetcher().claim(city_key(city))
             weather_data = get_weather(city)
+            missed_at = city_not_found_at(city)
             
             if weather_data and weather_data.get('cod') != '404':
-                display_weather(weather_data, show_current_location=show_current_location)
-            else:
+                if 'snapshot_version' in weather_data:
+                    st.caption(f"🗂️ 미리 계산된 스냅샷 v{weather_data['snapshot_version']}의 데이터입니다.")
+                display_weather(weather_data, show_current_location=show_current_location, live_interval=live_interval)
+            elif missed_at:
                 st.error(f"❌ '{city}' 도시를 찾을 수 없습니다. 정확한 도시 이름을 입력해주세요.")
+                if missed_at < searched_at:
+                    st.caption(f"🕒 {_since(missed_at)} 조회했을 때 찾지 못한 이름이라 다시 요청하지 않았습니다.")
                 st.info("💡 한국 지역 예시: 서울, 강남구, 송파구, 부산, 해운대구, 분당구, 일산, 제주 등")
                 st.info("💡 해외 도시 예시: Seoul, Tokyo, London, Paris, New York 등")
+            else:
+                # 시간 초과나 서버 오류는 '없음'으로 기억하지 않으므로 다시 검색하면 새로 요청
+                st.error(f"❌ '{city}'의 날씨 정보를 가져오지 못했습니다.")
+                st.warning("💡 날씨 서버 응답이 늦거나 일시적인 오류가 발생했습니다. 잠시 후 다시 검색해주세요.")
     
     # 푸터
     st.sidebar.markdown("---")
     st.sidebar.caption("Powered by OpenWeather API")
     st.sidebar.caption(f"마지막 업데이트: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}")
+    snapshot = get_snapshot()
+    if snapshot:
+        generated = datetime.fromtimestamp(snapshot.generated_at).strftime('%Y-%m-%d %H:%M')
+        st.sidebar.caption(f"🗂️ 도시 스냅샷 v{snapshot.version} ({generated} 생성, {len(snapshot)}개 도시)")
+    
+    if _debug_enabled():
+        render_diagnostics()
+
+# 모듈 로드 시간 확인 (무거운 작업은 모두 첫 사용 시점으로 미뤄져 있어야 함)
+STARTUP_MS = (time.perf_counter() - _IMPORT_STARTED) * 1000
+if STARTUP_MS > STARTUP_BUDGET_MS:
+    logger.warning("app.py 로드에 %.0fms가 걸려 예산 %.0fms를 초과했습니다.", STARTUP_MS, STARTUP_BUDGET_MS)
 
 if __name__ == "__main__":
     main()
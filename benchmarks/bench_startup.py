@@ -0,0 +1,86 @@
+"""시작 시간 벤치마크.
+
+새 파이썬 프로세스에서 `python -X importtime -c "import app"`를 실행해
+모듈별 import 시간(누적 기준 상위 N개)과 전체 로드 시간을 보고하고,
+시작 시간 예산(WEATHER_STARTUP_BUDGET_MS)을 넘으면 종료 코드 1을 반환합니다.
+--module weather_data로 Streamlit 없이 쓰는 데이터 계층만 잴 수도 있습니다.
+
+사용법:
+    python benchmarks/bench_startup.py
+    python benchmarks/bench_startup.py --runs 5 --top 20
+    python benchmarks/bench_startup.py --module weather_data
+"""
+
+import argparse
+import os
+import subprocess
+import sys
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def parse_importtime(stderr):
+    """-X importtime 출력에서 (모듈, self us, cumulative us) 목록을 추출합니다."""
+    rows = []
+    for line in stderr.splitlines():
+        if not line.startswith('import time:') or 'self [us]' in line:
+            continue
+        try:
+            _, values = line.split(':', 1)
+            self_us, cumulative_us, module = values.split('|', 2)
+            rows.append((module.rstrip(), int(self_us), int(cumulative_us)))
+        except ValueError:
+            continue
+    return rows
+
+
+def run_once(env, module='app'):
+    """새 프로세스에서 module을 import하고 (벽시계 ms, importtime 행 목록)을 반환합니다."""
+    started = time.perf_counter()
+    result = subprocess.run(
+        [sys.executable, '-X', 'importtime', '-c', f'import {module}'],
+        cwd=ROOT, env=env, capture_output=True, text=True
+    )
+    elapsed_ms = (time.perf_counter() - started) * 1000
+    if result.returncode != 0:
+        raise RuntimeError(result.stderr.strip().splitlines()[-1] if result.stderr else "import 실패")
+    return elapsed_ms, parse_importtime(result.stderr)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="app.py import 시간 프로파일")
+    parser.add_argument('--module', default='app', help="측정할 모듈 (app 또는 weather_data)")
+    parser.add_argument('--runs', type=int, default=3, help="반복 횟수 (최솟값을 보고)")
+    parser.add_argument('--top', type=int, default=15, help="표시할 모듈 수")
+    parser.add_argument('--budget-ms', type=float,
+                        default=float(os.getenv('WEATHER_STARTUP_BUDGET_MS', '250')),
+                        help="측정 모듈 자체의 누적 import 시간 예산 (ms)")
+    args = parser.parse_args()
+
+    env = dict(os.environ)
+    # API 키 검증 단계에서 멈추지 않도록 더미 키 사용 (네트워크 호출 없음)
+    env.setdefault('OPENWEATHER_API_KEY', 'benchmark')
+
+    results = [run_once(env, args.module) for _ in range(args.runs)]
+    wall_ms, rows = min(results, key=lambda r: r[0])
+
+    print(f"프로세스 시작 + import {args.module} (최소 {args.runs}회 중): {wall_ms:.1f} ms")
+    print()
+    print(f"{'cumulative ms':>14} {'self ms':>9}  module")
+    for module, self_us, cumulative_us in sorted(rows, key=lambda r: r[2], reverse=True)[:args.top]:
+        print(f"{cumulative_us / 1000:>14.1f} {self_us / 1000:>9.1f}  {module}")
+
+    module_rows = [r for r in rows if r[0].strip() == args.module]
+    if not module_rows:
+        print(f"{args.module} 모듈의 import 시간을 찾을 수 없습니다.")
+        return 1
+    module_ms = module_rows[0][2] / 1000
+    status = "OK" if module_ms <= args.budget_ms else "예산 초과"
+    print()
+    print(f"{args.module} 누적 import 시간: {module_ms:.1f} ms / 예산 {args.budget_ms:.0f} ms → {status}")
+    return 0 if module_ms <= args.budget_ms else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,58 @@
+"""과거 관측 저장소의 지점 분리 확인.
+
+같은 0.1° 버킷에 들어가는 두 지점(강남구 역삼동, 서초구 반포동)의 관측값을 며칠에 걸쳐 기록한 뒤,
+봉인된 세그먼트와 head.log 양쪽에서 각 지점의 조회/일별 요약이 다른 지점의 값을 섞지 않는지 확인합니다.
+네트워크 호출 없이 임시 디렉터리에서 실행하며, 어긋나면 종료 코드 1을 반환합니다.
+
+사용법:
+    python benchmarks/check_history_locations.py
+"""
+
+import os
+import sys
+import tempfile
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from history_store import HistoryStore, bucket_key  # noqa: E402
+
+KST = 32400
+# (이름, 위도, 경도, 기록할 기온)
+LOCATIONS = (
+    ('강남구 역삼동', 37.5172, 127.0473, 10.0),
+    ('서초구 반포동', 37.5045, 127.0110, 20.0),
+)
+
+
+def observation(dt, lat, lon, temp):
+    return {'dt': dt, 'tz': KST, 'temp': temp, 'feels_like': temp, 'humidity': 50.0,
+            'pressure': 1013.0, 'wind_speed': 1.0, 'weather_id': 800, 'lat': lat, 'lon': lon}
+
+
+def main():
+    assert len({bucket_key(lat, lon) for _, lat, lon, _ in LOCATIONS}) == 1, "두 지점이 같은 버킷이어야 합니다"
+
+    store = HistoryStore(tempfile.mkdtemp(prefix='weather-history-check-'))
+    now = time.time()
+    # 3일 전부터 지금까지 한 시간 간격으로 두 지점을 번갈아 기록 (지난 날짜는 세그먼트로 봉인됨)
+    for hours_ago in range(72, -1, -1):
+        for _, lat, lon, temp in LOCATIONS:
+            store.record(lat, lon, observation(int(now - hours_ago * 3600), lat, lon, temp))
+
+    failures = 0
+    for name, lat, lon, temp in LOCATIONS:
+        for days_ago in (0, 1, 2):
+            summary = store.daily_summary(lat, lon, days_ago, now)
+            ok = summary is not None and summary['temp_min'] == summary['temp_max'] == temp
+            failures += not ok
+            detail = f"{summary['temp_min']}~{summary['temp_max']}°C, {summary['count']}개" if summary else "없음"
+            print(f"{name} {days_ago}일 전: {detail} → {'OK' if ok else '다른 지점 값 섞임'}")
+
+    print("모든 지점이 분리되어 있습니다." if not failures else f"실패 {failures}건")
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
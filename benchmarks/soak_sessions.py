@@ -0,0 +1,117 @@
+"""세션 메모리 소크 테스트.
+
+가짜 OpenWeather 응답(네트워크 호출 없음)을 돌려주도록 HTTP 세션을 바꿔 놓고
+streamlit.testing의 AppTest로 많은 세션을 차례로 열어 도시를 검색한 뒤,
+워밍업 이후 프로세스 RSS 증가량이 한도 안에 머무는지 확인합니다.
+각 세션은 끝나면 버리므로(연결이 끊긴 세션을 Streamlit이 정리하는 것과 같음), 증가량은 세션이 끝나도
+남는 프로세스 공유 상태(캐시, 레지스트리, 공간 인덱스 등)가 세션 수에 비례해 커지는지를 보여줍니다.
+
+사용법:
+    python benchmarks/soak_sessions.py --sessions 300 --max-growth-mb 64
+"""
+
+import argparse
+import gc
+import json
+import os
+import sys
+import tempfile
+from unittest import mock
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+CITIES = ["서울", "부산", "대구", "인천", "광주", "대전", "울산", "제주", "Tokyo", "London"]
+
+
+def fake_weather(params):
+    name = params.get('q') or f"{params.get('lat')},{params.get('lon')}"
+    return {
+        'coord': {'lat': 37.5665, 'lon': 126.978},
+        'weather': [{'id': 800, 'main': 'Clear', 'description': '맑음', 'icon': '01d'}],
+        'main': {'temp': 21.3, 'feels_like': 20.8, 'temp_min': 18.0, 'temp_max': 24.1,
+                 'humidity': 55, 'pressure': 1014},
+        'wind': {'speed': 2.1},
+        'dt': 1760850000,
+        'sys': {'country': 'KR', 'sunrise': 1760823000, 'sunset': 1760863000},
+        'timezone': 32400,
+        'id': abs(hash(name)) % 10 ** 7,
+        'name': name,
+        'cod': 200
+    }
+
+
+def fake_forecast(params):
+    items = []
+    for i in range(40):
+        items.append({
+            'dt': 1760850000 + i * 10800,
+            'main': {'temp': 20 + i % 5, 'feels_like': 19 + i % 5, 'temp_min': 18, 'temp_max': 25, 'humidity': 60},
+            'weather': [{'id': 801, 'main': 'Clouds', 'description': '구름 조금', 'icon': '02d'}],
+            'pop': 0.1
+        })
+    return {'list': items, 'city': {'timezone': 32400}}
+
+
+def fake_get(self, url, params=None, **kwargs):
+    import requests
+    params = params or {}
+    if 'forecast' in url:
+        payload = fake_forecast(params)
+    elif 'weather' in url:
+        payload = fake_weather(params)
+    else:
+        payload = {}
+    response = requests.Response()
+    response.status_code = 200
+    response._content = json.dumps(payload).encode('utf-8')
+    response.url = url
+    return response
+
+
+def main():
+    parser = argparse.ArgumentParser(description="세션 메모리 소크 테스트")
+    parser.add_argument('--sessions', type=int, default=300)
+    parser.add_argument('--warmup', type=int, default=30, help="기준 RSS를 재기 전에 여는 세션 수")
+    parser.add_argument('--max-growth-mb', type=float, default=64.0, help="허용하는 워밍업 이후 RSS 증가량")
+    args = parser.parse_args()
+
+    os.environ.setdefault('OPENWEATHER_API_KEY', 'soak-test')
+    os.environ['WEATHER_HISTORY_DIR'] = tempfile.mkdtemp(prefix='weather-soak-')
+    os.environ['WEATHER_SNAPSHOT_PATH'] = os.path.join(os.environ['WEATHER_HISTORY_DIR'], 'none.json.gz')
+
+    import requests
+    from streamlit.testing.v1 import AppTest
+    from session_registry import process_rss_bytes
+
+    baseline = None
+    with mock.patch.object(requests.Session, 'get', fake_get):
+        for i in range(args.sessions):
+            at = AppTest.from_file(os.path.join(ROOT, 'app.py'), default_timeout=30)
+            at.run()
+            at.text_input(key="city_input").input(CITIES[i % len(CITIES)]).run()
+            if at.exception:
+                print(f"세션 {i}에서 예외 발생: {at.exception}")
+                return 1
+            del at
+            if i + 1 == args.warmup:
+                gc.collect()
+                baseline = process_rss_bytes()
+            if (i + 1) % 50 == 0:
+                rss = process_rss_bytes()
+                print(f"  세션 {i + 1}개: RSS {rss / 1024 / 1024:.1f} MB" if rss else f"  세션 {i + 1}개")
+
+    gc.collect()
+    final = process_rss_bytes()
+    if baseline is None or final is None:
+        print("RSS를 측정할 수 없습니다.")
+        return 1
+
+    growth_mb = (final - baseline) / 1024 / 1024
+    status = "OK" if growth_mb <= args.max_growth_mb else "한도 초과"
+    print(f"워밍업 이후 RSS 증가: {growth_mb:.1f} MB / 한도 {args.max_growth_mb:.0f} MB → {status}")
+    return 0 if growth_mb <= args.max_growth_mb else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
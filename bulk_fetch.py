@@ -0,0 +1,275 @@
+"""많은 지점의 현재 날씨를 한 번에 가져오는 명령줄 도구.
+
+사용법:
+    python bulk_fetch.py stores.csv -o stores_weather.jsonl
+    python bulk_fetch.py stores.csv -o stores_weather.csv --workers 8
+    python bulk_fetch.py stores.csv -o stores_weather --format parquet   # pyarrow 필요
+
+입력 CSV에는 name 컬럼(도시/구 이름) 또는 lat, lon 컬럼이 있어야 합니다.
+둘 다 있으면 좌표를 우선 사용하고 name은 표시 이름으로 씁니다.
+한글 이름은 KOREAN_CITIES로 영문 이름을 찾고, 없으면 입력한 이름 그대로 조회합니다.
+
+조회는 앱과 같은 캐시와 호출 속도 제한(OPENWEATHER_CALLS_PER_MINUTE)을 거치며,
+완료된 행 번호는 <출력>.ckpt에 기록됩니다. 중간에 중단되더라도 같은 명령을 다시 실행하면
+이미 끝난 행은 건너뛰고 이어서 가져오므로 API 호출 한도를 다시 쓰지 않습니다.
+"""
+
+import argparse
+import csv
+import json
+import os
+import sys
+import time
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+
+from weather_data import get_korean_cities, get_weather, get_weather_by_coords, weather_description
+
+OUTPUT_FIELDS = ['status', 'name', 'country', 'lat', 'lon', 'dt', 'temp', 'feels_like',
+                 'humidity', 'pressure', 'wind_speed', 'description']
+
+
+def read_rows(path):
+    """입력 CSV를 한 행씩 (행 번호, dict)로 읽습니다. 파일 전체를 메모리에 올리지 않습니다."""
+    with open(path, newline='', encoding='utf-8-sig') as f:
+        reader = csv.DictReader(f)
+        columns = set(reader.fieldnames or [])
+        if 'name' not in columns and not {'lat', 'lon'} <= columns:
+            raise ValueError("입력 CSV에 name 컬럼 또는 lat, lon 컬럼이 필요합니다.")
+        for index, row in enumerate(reader):
+            yield index, row
+
+
+def fetch_row(row):
+    """입력 행 하나의 현재 날씨를 가져와 출력 레코드(dict)를 반환합니다."""
+    name = (row.get('name') or '').strip()
+    lat, lon = (row.get('lat') or '').strip(), (row.get('lon') or '').strip()
+
+    if lat and lon:
+        try:
+            weather_data = get_weather_by_coords(float(lat), float(lon), name=name or None)
+        except ValueError:
+            weather_data = None
+    elif name:
+        weather_data = get_weather(name)
+    else:
+        weather_data = None
+
+    record = {f'input_{key}': value for key, value in row.items()}
+    if not weather_data or str(weather_data.get('cod', 200)) == '404':
+        record['status'] = 'failed'
+        return record
+
+    main = weather_data['main']
+    record.update({
+        'status': 'ok',
+        'name': name or weather_data.get('name', ''),
+        'country': weather_data.get('sys', {}).get('country', ''),
+        'lat': weather_data['coord']['lat'],
+        'lon': weather_data['coord']['lon'],
+        'dt': weather_data['dt'],
+        'temp': main['temp'],
+        'feels_like': main['feels_like'],
+        'humidity': main['humidity'],
+        'pressure': main['pressure'],
+        'wind_speed': weather_data.get('wind', {}).get('speed'),
+        'description': weather_description(weather_data)
+    })
+    return record
+
+
+def _drop_partial_line(path):
+    """중단으로 마지막 줄이 잘린 텍스트 파일을 마지막 줄바꿈까지 되돌립니다."""
+    if not os.path.exists(path) or os.path.getsize(path) == 0:
+        return
+    with open(path, 'rb+') as f:
+        f.seek(0, os.SEEK_END)
+        end = f.tell()
+        f.seek(max(0, end - 65536))
+        tail = f.read()
+        if tail.endswith(b'\n'):
+            return
+        cut = tail.rfind(b'\n')
+        f.truncate(end - len(tail) + cut + 1 if cut >= 0 else 0)
+
+
+class JsonlWriter:
+    def __init__(self, path, fieldnames):
+        _drop_partial_line(path)
+        self.file = open(path, 'a', encoding='utf-8')
+
+    def write(self, records):
+        for record in records:
+            self.file.write(json.dumps(record, ensure_ascii=False) + '\n')
+        self.file.flush()
+        os.fsync(self.file.fileno())
+
+    def close(self):
+        self.file.close()
+
+
+class CsvWriter:
+    def __init__(self, path, fieldnames):
+        _drop_partial_line(path)
+        is_new = not os.path.exists(path) or os.path.getsize(path) == 0
+        self.file = open(path, 'a', newline='', encoding='utf-8')
+        self.writer = csv.DictWriter(self.file, fieldnames=fieldnames, extrasaction='ignore')
+        if is_new:
+            self.writer.writeheader()
+
+    def write(self, records):
+        self.writer.writerows(records)
+        self.file.flush()
+        os.fsync(self.file.fileno())
+
+    def close(self):
+        self.file.close()
+
+
+class ParquetWriter:
+    """배치마다 출력 디렉터리에 part-NNNNN.parquet 파일을 하나씩 씁니다.
+    파일은 임시 이름으로 쓴 뒤 교체하므로 중단되어도 완성된 파일만 남습니다."""
+
+    def __init__(self, path, fieldnames):
+        try:
+            import pyarrow
+            import pyarrow.parquet
+        except ImportError:
+            raise SystemExit("Parquet 출력에는 pyarrow가 필요합니다: pip install pyarrow")
+        self.pa, self.pq = pyarrow, pyarrow.parquet
+        self.path = path
+        self.fieldnames = fieldnames
+        os.makedirs(path, exist_ok=True)
+        existing = [name for name in os.listdir(path) if name.startswith('part-') and name.endswith('.parquet')]
+        self.part = len(existing)
+
+    def write(self, records):
+        table = self.pa.Table.from_pylist([{key: record.get(key) for key in self.fieldnames} for record in records])
+        target = os.path.join(self.path, f'part-{self.part:05d}.parquet')
+        self.pq.write_table(table, target + '.tmp')
+        os.replace(target + '.tmp', target)
+        self.part += 1
+
+    def close(self):
+        pass
+
+
+WRITERS = {'jsonl': JsonlWriter, 'csv': CsvWriter, 'parquet': ParquetWriter}
+
+
+class Checkpoint:
+    """완료된 입력 행 번호를 한 줄에 하나씩 기록하는 체크포인트 파일."""
+
+    def __init__(self, path):
+        self.path = path
+        self.done = {}
+        if os.path.exists(path):
+            with open(path, encoding='utf-8') as f:
+                for line in f:
+                    try:
+                        entry = json.loads(line)
+                    except ValueError:
+                        continue  # 중단으로 잘린 마지막 줄
+                    self.done[entry['row']] = entry['status']
+        _drop_partial_line(path)
+        self.file = open(path, 'a', encoding='utf-8')
+
+    def should_skip(self, index, retry_failed=False):
+        status = self.done.get(index)
+        return status == 'ok' or (status is not None and not retry_failed)
+
+    def mark(self, entries):
+        for index, status in entries:
+            self.file.write(json.dumps({'row': index, 'status': status}) + '\n')
+            self.done[index] = status
+        self.file.flush()
+        os.fsync(self.file.fileno())
+
+    def close(self):
+        self.file.close()
+
+
+def _output_fields(input_path):
+    with open(input_path, newline='', encoding='utf-8-sig') as f:
+        columns = next(csv.reader(f), [])
+    return [f'input_{column}' for column in columns] + OUTPUT_FIELDS
+
+
+def run(input_path, output_path, fmt, workers=8, batch_size=100, retry_failed=False):
+    """입력 파일 전체를 처리하고 (성공, 실패, 건너뜀) 개수를 반환합니다."""
+    fieldnames = _output_fields(input_path)
+    checkpoint = Checkpoint(output_path.rstrip('/') + '.ckpt')
+    writer = WRITERS[fmt](output_path, fieldnames)
+    get_korean_cities()  # 스레드에서 동시에 불러오지 않도록 미리 로드
+
+    counts = {'ok': 0, 'failed': 0, 'skipped': 0}
+    pending_records, pending_marks = [], []
+
+    def flush():
+        # 출력을 디스크에 쓴 뒤에만 체크포인트를 남겨, 체크포인트에 있는 행은 반드시 출력에 있도록 함
+        if pending_records:
+            writer.write(pending_records)
+            checkpoint.mark(pending_marks)
+            pending_records.clear()
+            pending_marks.clear()
+
+    def collect(done):
+        for future in done:
+            index, record = futures.pop(future), future.result()
+            counts[record['status']] += 1
+            pending_records.append(record)
+            pending_marks.append((index, record['status']))
+        if len(pending_records) >= batch_size:
+            flush()
+
+    started = time.time()
+    rows = read_rows(input_path)
+    futures = {}
+    reported = 0
+    try:
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            for index, row in rows:
+                if checkpoint.should_skip(index, retry_failed):
+                    counts['skipped'] += 1
+                    continue
+                futures[executor.submit(fetch_row, row)] = index
+                # 입력 전체를 한꺼번에 제출하지 않고 진행 중인 작업 수를 제한
+                if len(futures) >= workers * 4:
+                    done, _ = wait(futures, return_when=FIRST_COMPLETED)
+                    collect(done)
+                processed = counts['ok'] + counts['failed']
+                if processed - reported >= 500:
+                    reported = processed
+                    print(f"  {processed}행 처리 ({time.time() - started:.0f}초)", file=sys.stderr)
+            while futures:
+                done, _ = wait(futures, return_when=FIRST_COMPLETED)
+                collect(done)
+    finally:
+        flush()
+        writer.close()
+        checkpoint.close()
+    return counts
+
+
+def main():
+    parser = argparse.ArgumentParser(description="CSV의 여러 지점 현재 날씨를 한 번에 가져옵니다")
+    parser.add_argument('input', help="name 또는 lat, lon 컬럼이 있는 CSV 파일")
+    parser.add_argument('-o', '--output', required=True, help="출력 파일 (parquet은 디렉터리)")
+    parser.add_argument('--format', choices=sorted(WRITERS), help="출력 형식 (기본값: 출력 확장자로 판단, 없으면 jsonl)")
+    parser.add_argument('--workers', type=int, default=8, help="동시 요청 수")
+    parser.add_argument('--batch-size', type=int, default=100, help="출력과 체크포인트를 기록하는 행 단위")
+    parser.add_argument('--retry-failed', action='store_true', help="이전 실행에서 실패한 행을 다시 조회")
+    args = parser.parse_args()
+
+    fmt = args.format or {'.csv': 'csv', '.parquet': 'parquet'}.get(os.path.splitext(args.output)[1], 'jsonl')
+    try:
+        counts = run(args.input, args.output, fmt, args.workers, args.batch_size, args.retry_failed)
+    except (OSError, ValueError) as e:
+        print(f"오류: {e}", file=sys.stderr)
+        return 1
+
+    print(f"완료: 성공 {counts['ok']}, 실패 {counts['failed']}, 이전 실행에서 완료되어 건너뜀 {counts['skipped']}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
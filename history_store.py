@@ -0,0 +1,434 @@
+"""로컬 시계열 저장소 - 앱이 가져온 현재 날씨 관측값을 기록하고 과거 추이를 제공합니다.
+
+저장 구조 (위치 버킷 = 위도/경도 0.1° 격자, 약 11km):
+
+    <root>/<bucket>/head.log        아직 봉인되지 않은 관측값 (JSON Lines, 추가 전용)
+    <root>/<bucket>/<YYYYMMDD>.seg  하루 단위로 봉인된 컬럼형 세그먼트 (컬럼별 zlib 압축)
+    <root>/<bucket>/index.json      이미 시간 단위로 다운샘플링한 세그먼트 날짜 목록
+    <root>/<bucket>/.lock           여러 프로세스의 추가/봉인을 직렬화하는 잠금 파일
+
+하루가 지나면 head.log의 지난 날짜 관측값이 세그먼트로 봉인되고,
+오래된 세그먼트는 시간 단위로 다운샘플링되거나 보존 기간이 지나면 삭제됩니다.
+한 버킷(격자 칸)에는 여러 지점이 들어갈 수 있으므로 관측값은 (위도, 경도, 관측 시각)으로 구분합니다.
+
+app.py, api.py, bulk_fetch.py가 같은 디렉터리에 동시에 기록할 수 있으므로, 추가와 봉인은 버킷별
+파일 잠금(fcntl, 없는 플랫폼에서는 프로세스 안에서만 직렬화) 안에서 디스크의 최신 head.log를 다시 읽은 뒤 수행합니다.
+조회는 파일 수정 시각이 바뀌었을 때만 head.log와 세그먼트를 다시 읽고, 디코딩된 세그먼트는 LRU 캐시에 둡니다.
+"""
+
+import contextlib
+import json
+import math
+import os
+import struct
+import threading
+import time
+import zlib
+from array import array
+from collections import OrderedDict
+from datetime import datetime, timedelta, timezone
+
+try:
+    import fcntl
+except ImportError:  # Windows - 프로세스 안의 잠금만 사용
+    fcntl = None
+
+# 컬럼 이름과 array 타입 코드
+COLUMNS = (
+    ('dt', 'q'),
+    ('tz', 'i'),
+    ('temp', 'd'),
+    ('feels_like', 'd'),
+    ('humidity', 'd'),
+    ('pressure', 'd'),
+    ('wind_speed', 'd'),
+    ('weather_id', 'i'),
+    ('lat', 'd'),
+    ('lon', 'd'),
+)
+
+SEGMENT_MAGIC = b'WTS1'
+HEAD_FILE = 'head.log'
+INDEX_FILE = 'index.json'
+LOCK_FILE = '.lock'
+
+
+def bucket_key(lat, lon):
+    """좌표를 0.1° 격자 버킷 이름으로 변환합니다."""
+    return f"{round(float(lat), 1):.1f}_{round(float(lon), 1):.1f}"
+
+
+def local_day(dt, tz_offset):
+    """관측 시각(UTC 초)과 타임존 오프셋으로 현지 날짜 키(YYYYMMDD 정수)를 계산합니다."""
+    local = datetime.fromtimestamp(dt + tz_offset, timezone.utc)
+    return local.year * 10000 + local.month * 100 + local.day
+
+
+def _row_key(row):
+    """같은 관측값인지 판단하는 키 (지점, 관측 시각). 지점 없이 기록된 예전 행은 위도/경도가 NaN."""
+    lat, lon = row.get('lat'), row.get('lon')
+    return (None if lat is None or math.isnan(lat) else round(lat, 4),
+            None if lon is None or math.isnan(lon) else round(lon, 4),
+            int(row['dt']))
+
+
+def observation_from_weather(weather_data):
+    """/weather 형태의 응답에서 저장할 관측값 한 행을 만듭니다."""
+    main = weather_data['main']
+    coord = weather_data.get('coord', {})
+    return {
+        'dt': int(weather_data['dt']),
+        'tz': int(weather_data.get('timezone', 0)),
+        'temp': float(main['temp']),
+        'feels_like': float(main['feels_like']),
+        'humidity': float(main['humidity']),
+        'pressure': float(main['pressure']),
+        'wind_speed': float(weather_data.get('wind', {}).get('speed', 0)),
+        'weather_id': int(weather_data['weather'][0]['id']) if weather_data.get('weather') else 0,
+        'lat': round(float(coord.get('lat', math.nan)), 4),
+        'lon': round(float(coord.get('lon', math.nan)), 4),
+    }
+
+
+def encode_segment(columns, resolution='raw'):
+    """컬럼 딕셔너리를 컬럼별로 압축된 세그먼트 바이트로 인코딩합니다."""
+    blocks = []
+    header_columns = []
+    for name, typecode in COLUMNS:
+        block = zlib.compress(array(typecode, columns[name]).tobytes(), 6)
+        blocks.append(block)
+        header_columns.append([name, typecode, len(block)])
+    header = json.dumps({
+        'columns': header_columns,
+        'rows': len(columns['dt']),
+        'resolution': resolution
+    }).encode('utf-8')
+    return SEGMENT_MAGIC + struct.pack('<I', len(header)) + header + b''.join(blocks)
+
+
+def decode_segment(payload):
+    """세그먼트 바이트를 (컬럼 딕셔너리, 해상도)로 디코딩합니다."""
+    if payload[:4] != SEGMENT_MAGIC:
+        raise ValueError("올바른 시계열 세그먼트가 아닙니다.")
+    header_len = struct.unpack('<I', payload[4:8])[0]
+    header = json.loads(payload[8:8 + header_len].decode('utf-8'))
+    offset = 8 + header_len
+    columns = {}
+    for name, typecode, size in header['columns']:
+        values = array(typecode)
+        values.frombytes(zlib.decompress(payload[offset:offset + size]))
+        columns[name] = values
+        offset += size
+    # 지점 컬럼이 생기기 전의 세그먼트는 위도/경도를 NaN으로 채움
+    for name, typecode in COLUMNS:
+        if name not in columns:
+            columns[name] = array(typecode, [math.nan] * header['rows'])
+    return columns, header.get('resolution', 'raw')
+
+
+def _empty_columns():
+    return {name: array(typecode) for name, typecode in COLUMNS}
+
+
+def _row_value(row, name):
+    return row.get(name, math.nan) if name in ('lat', 'lon') else row[name]
+
+
+def _rows_to_columns(rows):
+    columns = _empty_columns()
+    for row in sorted(rows, key=lambda r: r['dt']):
+        for name, _ in COLUMNS:
+            columns[name].append(_row_value(row, name))
+    return columns
+
+
+def _columns_to_rows(columns):
+    return [{name: columns[name][i] for name, _ in COLUMNS} for i in range(len(columns['dt']))]
+
+
+def downsample_hourly(columns):
+    """관측값을 지점별 한 시간 단위 평균으로 줄입니다 (dt는 각 시간의 시작, 날씨 코드는 마지막 값)."""
+    groups = OrderedDict()
+    for i, dt in enumerate(columns['dt']):
+        lat, lon, _ = _row_key({'lat': columns['lat'][i], 'lon': columns['lon'][i], 'dt': dt})
+        groups.setdefault((lat, lon, dt - dt % 3600), []).append(i)
+
+    result = _empty_columns()
+    for (_, _, hour_start), indexes in sorted(groups.items(), key=lambda item: item[0][2]):
+        result['dt'].append(hour_start)
+        for name in ('tz', 'weather_id', 'lat', 'lon'):
+            result[name].append(columns[name][indexes[-1]])
+        for name in ('temp', 'feels_like', 'humidity', 'pressure', 'wind_speed'):
+            result[name].append(sum(columns[name][i] for i in indexes) / len(indexes))
+    return result
+
+
+class HistoryStore:
+    """위치 버킷별 추가 전용 시계열 저장소.
+
+    retention_days: 이 기간보다 오래된 세그먼트는 삭제
+    downsample_after_days: 이 기간보다 오래된 세그먼트는 시간 단위 평균으로 축소
+    match_degrees: 조회 시 요청 좌표와 위도/경도 차이가 이 값(도) 이하인 지점의 관측값만 사용
+        (버킷 하나에 여러 지점이 섞여 있으므로, 기본 0.01° ≈ 1km)
+    """
+
+    def __init__(self, root, retention_days=365, downsample_after_days=30, cache_size=256, match_degrees=0.01):
+        self.root = root
+        self.match_degrees = match_degrees
+        self.retention_days = retention_days
+        self.downsample_after_days = downsample_after_days
+        self.cache_size = cache_size
+        self._lock = threading.Lock()
+        self._index = {}        # bucket -> 봉인된 세그먼트 날짜 집합
+        self._downsampled = {}  # bucket -> 시간 단위로 줄인 세그먼트 날짜 집합 (index.json)
+        self._heads = {}        # bucket -> head.log의 관측값 목록
+        self._versions = {}     # bucket -> (디렉터리 mtime, head.log (mtime, 크기)) - 다시 읽을지 판단
+        self._segments = OrderedDict()  # (bucket, day) -> (세그먼트 mtime, 디코딩된 컬럼) (LRU)
+
+    # ----- 내부 경로/인덱스 -----
+
+    def _bucket_dir(self, bucket):
+        return os.path.join(self.root, bucket)
+
+    def _segment_path(self, bucket, day):
+        return os.path.join(self._bucket_dir(bucket), f"{day}.seg")
+
+    @contextlib.contextmanager
+    def _file_lock(self, bucket):
+        """버킷의 추가/봉인을 다른 프로세스와 직렬화합니다."""
+        os.makedirs(self._bucket_dir(bucket), exist_ok=True)
+        if fcntl is None:
+            yield
+            return
+        with open(os.path.join(self._bucket_dir(bucket), LOCK_FILE), 'a') as lock_file:
+            fcntl.flock(lock_file.fileno(), fcntl.LOCK_EX)
+            try:
+                yield
+            finally:
+                fcntl.flock(lock_file.fileno(), fcntl.LOCK_UN)
+
+    @staticmethod
+    def _stat(path):
+        try:
+            info = os.stat(path)
+        except OSError:
+            return None
+        return info.st_mtime_ns, info.st_size
+
+    def _load_bucket(self, bucket):
+        """버킷의 세그먼트 인덱스와 head.log를 불러옵니다.
+        다른 프로세스가 파일을 바꿨을 때(수정 시각/크기 변경)만 다시 읽습니다."""
+        directory = self._bucket_dir(bucket)
+        version = (self._stat(directory), self._stat(os.path.join(directory, HEAD_FILE)))
+        if bucket in self._index and self._versions.get(bucket) == version:
+            return
+        days = set()
+        downsampled = set()
+        rows = []
+        if os.path.isdir(directory):
+            for filename in os.listdir(directory):
+                if filename.endswith('.seg') and filename[:-4].isdigit():
+                    days.add(int(filename[:-4]))
+            try:
+                with open(os.path.join(directory, INDEX_FILE), encoding='utf-8') as f:
+                    downsampled = set(json.load(f).get('hourly', [])) & days
+            except (OSError, ValueError):
+                pass
+            head_path = os.path.join(directory, HEAD_FILE)
+            if os.path.exists(head_path):
+                with open(head_path, encoding='utf-8') as f:
+                    for line in f:
+                        line = line.strip()
+                        if line:
+                            try:
+                                rows.append(json.loads(line))
+                            except ValueError:
+                                # 비정상 종료로 잘린 마지막 줄은 무시
+                                continue
+        self._index[bucket] = days
+        self._downsampled[bucket] = downsampled
+        self._heads[bucket] = rows
+        self._versions[bucket] = version
+
+    def _read_segment(self, bucket, day):
+        key = (bucket, day)
+        path = self._segment_path(bucket, day)
+        mtime = self._stat(path)
+        cached = self._segments.get(key)
+        if cached is not None and cached[0] == mtime:
+            self._segments.move_to_end(key)
+            return cached[1]
+        with open(path, 'rb') as f:
+            columns, _ = decode_segment(f.read())
+        self._segments[key] = (mtime, columns)
+        self._segments.move_to_end(key)
+        if len(self._segments) > self.cache_size:
+            self._segments.popitem(last=False)
+        return columns
+
+    def _write_segment(self, bucket, day, columns, resolution='raw'):
+        path = self._segment_path(bucket, day)
+        tmp_path = path + '.tmp'
+        with open(tmp_path, 'wb') as f:
+            f.write(encode_segment(columns, resolution))
+        os.replace(tmp_path, path)
+        self._index[bucket].add(day)
+        self._segments.pop((bucket, day), None)
+        if resolution == 'raw':
+            self._downsampled[bucket].discard(day)
+        else:
+            self._downsampled[bucket].add(day)
+
+    def _write_index(self, bucket):
+        path = os.path.join(self._bucket_dir(bucket), INDEX_FILE)
+        tmp_path = path + '.tmp'
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump({'hourly': sorted(self._downsampled[bucket])}, f)
+        os.replace(tmp_path, path)
+
+    def _rewrite_head(self, bucket):
+        path = os.path.join(self._bucket_dir(bucket), HEAD_FILE)
+        tmp_path = path + '.tmp'
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            for row in self._heads[bucket]:
+                f.write(json.dumps(row) + '\n')
+        os.replace(tmp_path, path)
+
+    def _seal(self, bucket, today):
+        """today 이전 날짜의 head 관측값을 하루 단위 세그먼트로 봉인합니다 (파일 잠금 안에서 호출)."""
+        by_day = {}
+        remaining = []
+        for row in self._heads[bucket]:
+            day = local_day(row['dt'], row['tz'])
+            if day < today:
+                by_day.setdefault(day, []).append(row)
+            else:
+                remaining.append(row)
+        if not by_day:
+            return
+
+        for day, rows in by_day.items():
+            resolution = 'raw'
+            if day in self._index[bucket]:
+                # 늦게 도착한 관측값은 기존 세그먼트와 병합 (같은 지점·시각은 하나만)
+                rows = _columns_to_rows(self._read_segment(bucket, day)) + rows
+                rows = list({_row_key(row): row for row in rows}.values())
+                if day in self._downsampled[bucket]:
+                    resolution = 'hourly'
+                    columns = downsample_hourly(_rows_to_columns(rows))
+                    self._write_segment(bucket, day, columns, resolution)
+                    continue
+            self._write_segment(bucket, day, _rows_to_columns(rows), resolution)
+
+        self._heads[bucket] = remaining
+        self._rewrite_head(bucket)
+        self._apply_policies(bucket, today)
+
+    def _apply_policies(self, bucket, today):
+        """보존 기간과 다운샘플링 정책을 적용합니다. 이미 다운샘플링한 세그먼트는 다시 읽지 않습니다."""
+        today_date = datetime.strptime(str(today), '%Y%m%d')
+        retention_cutoff = int((today_date - timedelta(days=self.retention_days)).strftime('%Y%m%d'))
+        downsample_cutoff = int((today_date - timedelta(days=self.downsample_after_days)).strftime('%Y%m%d'))
+
+        changed = False
+        for day in sorted(self._index[bucket]):
+            if day < retention_cutoff:
+                os.remove(self._segment_path(bucket, day))
+                self._index[bucket].discard(day)
+                self._downsampled[bucket].discard(day)
+                self._segments.pop((bucket, day), None)
+                changed = True
+            elif day < downsample_cutoff and day not in self._downsampled[bucket]:
+                with open(self._segment_path(bucket, day), 'rb') as f:
+                    columns, resolution = decode_segment(f.read())
+                if resolution == 'raw':
+                    self._write_segment(bucket, day, downsample_hourly(columns), 'hourly')
+                else:
+                    self._downsampled[bucket].add(day)
+                changed = True
+        if changed:
+            self._write_index(bucket)
+
+    # ----- 공개 API -----
+
+    def record(self, lat, lon, observation):
+        """관측값 한 행을 기록합니다. 같은 지점·같은 관측 시각(dt)의 중복 기록은 무시합니다."""
+        bucket = bucket_key(lat, lon)
+        observation = dict(observation)
+        if math.isnan(observation.get('lat', math.nan)) or math.isnan(observation.get('lon', math.nan)):
+            observation['lat'], observation['lon'] = round(float(lat), 4), round(float(lon), 4)
+        key = _row_key(observation)
+        with self._lock, self._file_lock(bucket):
+            # 다른 프로세스가 추가/봉인했을 수 있으므로 잠금 안에서 최신 상태를 다시 읽음
+            self._load_bucket(bucket)
+            head = self._heads[bucket]
+            if any(_row_key(row) == key for row in reversed(head)):
+                return False
+
+            with open(os.path.join(self._bucket_dir(bucket), HEAD_FILE), 'a', encoding='utf-8') as f:
+                f.write(json.dumps(observation) + '\n')
+            head.append(observation)
+            self._seal(bucket, local_day(observation['dt'], observation['tz']))
+            # 직접 쓴 변경으로 다시 읽지 않도록 현재 파일 상태를 기록
+            directory = self._bucket_dir(bucket)
+            self._versions[bucket] = (self._stat(directory), self._stat(os.path.join(directory, HEAD_FILE)))
+            return True
+
+    def _matches(self, lat, lon, row_lat, row_lon):
+        # 지점 없이 기록된 예전 행(NaN)은 어느 지점과도 일치하지 않음
+        return abs(row_lat - lat) <= self.match_degrees and abs(row_lon - lon) <= self.match_degrees
+
+    def query(self, lat, lon, start_day, end_day):
+        """[start_day, end_day] 범위(YYYYMMDD 정수)에서 요청 좌표 근처(match_degrees 안) 지점의
+        관측값을 시간순 컬럼 딕셔너리로 반환합니다."""
+        bucket = bucket_key(lat, lon)
+        lat, lon = float(lat), float(lon)
+        result = _empty_columns()
+        with self._lock:
+            self._load_bucket(bucket)
+            for day in sorted(d for d in self._index[bucket] if start_day <= d <= end_day):
+                columns = self._read_segment(bucket, day)
+                for i in range(len(columns['dt'])):
+                    if self._matches(lat, lon, columns['lat'][i], columns['lon'][i]):
+                        for name, _ in COLUMNS:
+                            result[name].append(columns[name][i])
+            head_rows = [
+                row for row in self._heads[bucket]
+                if start_day <= local_day(row['dt'], row['tz']) <= end_day
+                and self._matches(lat, lon, _row_value(row, 'lat'), _row_value(row, 'lon'))
+            ]
+        for row in head_rows:
+            for name, _ in COLUMNS:
+                result[name].append(_row_value(row, name))
+        return result
+
+    def daily_summary(self, lat, lon, days_ago, now=None):
+        """요청 좌표 근처 지점의 현지 날짜 기준 days_ago일 전 요약(최저/최고/평균 기온, 평균 습도)을 반환합니다."""
+        bucket = bucket_key(lat, lon)
+        with self._lock:
+            self._load_bucket(bucket)
+            head = self._heads[bucket]
+            if head:
+                tz_offset = head[-1]['tz']
+            elif self._index[bucket]:
+                tz_offset = self._read_segment(bucket, max(self._index[bucket]))['tz'][-1]
+            else:
+                return None
+
+        now = time.time() if now is None else now
+        local_now = datetime.fromtimestamp(now + tz_offset, timezone.utc)
+        target = local_now - timedelta(days=days_ago)
+        day = target.year * 10000 + target.month * 100 + target.day
+
+        columns = self.query(lat, lon, day, day)
+        count = len(columns['dt'])
+        if not count:
+            return None
+        return {
+            'date': target.strftime('%Y-%m-%d'),
+            'temp_min': min(columns['temp']),
+            'temp_max': max(columns['temp']),
+            'temp_avg': sum(columns['temp']) / count,
+            'humidity_avg': sum(columns['humidity']) / count,
+            'count': count
+        }
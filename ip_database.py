@@ -0,0 +1,232 @@
+"""로컬 IP 위치 데이터베이스 - 사용자 IP 주소를 네트워크 요청 없이 위치로 변환합니다.
+
+두 가지 형식을 지원합니다.
+
+- 정렬 배열 파일(.bin): 이 모듈의 build 명령으로 DB-IP "IP to City Lite" CSV에서 만듭니다.
+  파일을 mmap으로 열어 IP 범위 시작 주소를 이진 탐색하므로 조회 한 번이 수 마이크로초이고,
+  범위 배열은 메모리로 읽어 들이지 않아 프로세스 여러 개가 페이지 캐시를 공유합니다.
+- MMDB 파일(.mmdb): MaxMind GeoLite2-City / DB-IP mmdb. maxminddb 패키지가 필요합니다.
+
+파일 구조 (.bin, 리틀 엔디언):
+
+    헤더       magic(8) | IPv4 범위 수(u32) | IPv6 범위 수(u32) | 위치 표 오프셋(u64)
+    IPv4 범위  시작(u32) | 끝(u32) | 위치 번호(u32)                 시작 주소 오름차순
+    IPv6 범위  시작(16바이트, 빅 엔디언) | 끝(16바이트) | 위치 번호(u32)
+    위치 표    JSON [[도시, 국가 코드, 위도, 경도], ...]
+
+사용 예:
+    python ip_database.py build dbip-city-lite-2024-06.csv.gz -o data/ipdb.bin
+    python ip_database.py lookup 211.234.10.1
+"""
+
+import argparse
+import csv
+import gzip
+import ipaddress
+import json
+import mmap
+import os
+import struct
+import sys
+import time
+
+MAGIC = b'WIPDB\x00\x01\x00'
+HEADER = struct.Struct('<8sIIQ')
+V4_RECORD = struct.Struct('<III')
+V6_RECORD = struct.Struct('<16s16sI')
+_V4_START = struct.Struct('<I')
+
+
+def parse_ip(value):
+    """문자열 IP를 (버전, 값)으로 바꿉니다. IPv4는 정수, IPv6는 16바이트. IPv4 매핑 IPv6는 IPv4로 취급합니다."""
+    address = ipaddress.ip_address(value.strip())
+    if address.version == 6 and address.ipv4_mapped:
+        address = address.ipv4_mapped
+    if address.version == 4:
+        return 4, int(address)
+    return 6, address.packed
+
+
+class IPRangeDatabase:
+    """build_ip_database()로 만든 정렬 배열 파일을 mmap으로 열어 조회합니다."""
+
+    source = 'local-db'
+
+    def __init__(self, path):
+        with open(path, 'rb') as f:
+            self._mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        magic, self.v4_count, self.v6_count, locations_offset = HEADER.unpack_from(self._mm, 0)
+        if magic != MAGIC:
+            self._mm.close()
+            raise ValueError(f"IP 데이터베이스 형식이 아닙니다: {path}")
+        self._v4_base = HEADER.size
+        self._v6_base = self._v4_base + self.v4_count * V4_RECORD.size
+        self.locations = json.loads(self._mm[locations_offset:].decode('utf-8'))
+
+    def __len__(self):
+        return self.v4_count + self.v6_count
+
+    def _find_v4(self, ip):
+        lo, hi = 0, self.v4_count
+        while lo < hi:
+            mid = (lo + hi) // 2
+            if _V4_START.unpack_from(self._mm, self._v4_base + mid * V4_RECORD.size)[0] <= ip:
+                lo = mid + 1
+            else:
+                hi = mid
+        if lo == 0:
+            return None
+        _, end, location = V4_RECORD.unpack_from(self._mm, self._v4_base + (lo - 1) * V4_RECORD.size)
+        return location if ip <= end else None
+
+    def _find_v6(self, ip):
+        mm, base, size = self._mm, self._v6_base, V6_RECORD.size
+        lo, hi = 0, self.v6_count
+        while lo < hi:
+            mid = (lo + hi) // 2
+            offset = base + mid * size
+            if mm[offset:offset + 16] <= ip:
+                lo = mid + 1
+            else:
+                hi = mid
+        if lo == 0:
+            return None
+        _, end, location = V6_RECORD.unpack_from(mm, base + (lo - 1) * size)
+        return location if ip <= end else None
+
+    def lookup(self, ip):
+        """IP 주소의 위치 {'city', 'country', 'lat', 'lon'}를 반환합니다. 없으면 None."""
+        try:
+            version, value = parse_ip(ip)
+        except ValueError:
+            return None
+        location = self._find_v4(value) if version == 4 else self._find_v6(value)
+        if location is None:
+            return None
+        city, country, lat, lon = self.locations[location]
+        return {'city': city or 'Unknown', 'country': country or 'Unknown', 'lat': lat, 'lon': lon}
+
+    def close(self):
+        self._mm.close()
+
+
+class MMDBDatabase:
+    """MaxMind 형식(.mmdb) City 데이터베이스를 조회합니다 (maxminddb 패키지 필요)."""
+
+    source = 'local-mmdb'
+
+    def __init__(self, path):
+        try:
+            import maxminddb
+        except ImportError:
+            raise RuntimeError("mmdb 파일을 사용하려면 pip install maxminddb 가 필요합니다.")
+        self._reader = maxminddb.open_database(path, maxminddb.MODE_MMAP)
+
+    def lookup(self, ip):
+        try:
+            record = self._reader.get(ip.strip())
+        except ValueError:
+            return None
+        location = (record or {}).get('location') or {}
+        if location.get('latitude') is None or location.get('longitude') is None:
+            return None
+        city = (record.get('city') or {}).get('names', {}).get('en')
+        country = (record.get('country') or {}).get('iso_code')
+        return {
+            'city': city or 'Unknown',
+            'country': country or 'Unknown',
+            'lat': location['latitude'],
+            'lon': location['longitude']
+        }
+
+    def close(self):
+        self._reader.close()
+
+
+def open_ip_database(path):
+    """확장자에 맞는 데이터베이스를 엽니다. .mmdb가 아니면 정렬 배열 파일로 엽니다."""
+    if path.endswith('.mmdb'):
+        return MMDBDatabase(path)
+    return IPRangeDatabase(path)
+
+
+def read_dbip_csv(path):
+    """DB-IP City Lite CSV(.csv 또는 .csv.gz)를 (시작, 끝, 도시, 국가 코드, 위도, 경도)로 읽습니다.
+    열 순서: 시작 IP, 끝 IP, 대륙, 국가 코드, 시/도, 도시, 위도, 경도 (헤더 없음)"""
+    opener = gzip.open if path.endswith('.gz') else open
+    with opener(path, 'rt', encoding='utf-8', newline='') as f:
+        for row in csv.reader(f):
+            if len(row) < 8:
+                continue
+            yield row[0], row[1], row[5], row[3], float(row[6]), float(row[7])
+
+
+def build_ip_database(rows, path):
+    """(시작, 끝, 도시, 국가 코드, 위도, 경도) 범위 목록으로 정렬 배열 파일을 만듭니다.
+    범위는 주소 버전별로 시작 주소 오름차순이어야 하며 (DB-IP CSV는 이미 정렬되어 있음),
+    같은 위치는 위치 표에서 한 번만 저장합니다. 임시 파일에 쓴 뒤 원자적으로 교체합니다."""
+    v4, v6 = bytearray(), bytearray()
+    last = {4: -1, 6: b''}
+    locations, location_ids = [], {}
+    for start, end, city, country, lat, lon in rows:
+        version, start_value = parse_ip(start)
+        end_version, end_value = parse_ip(end)
+        if version != end_version or end_value < start_value:
+            raise ValueError(f"잘못된 범위: {start} - {end}")
+        if start_value <= last[version]:
+            raise ValueError(f"범위가 시작 주소 순으로 정렬되어 있지 않습니다: {start}")
+        last[version] = end_value
+        key = (city, country, round(lat, 4), round(lon, 4))
+        location = location_ids.get(key)
+        if location is None:
+            location = location_ids[key] = len(locations)
+            locations.append(list(key))
+        if version == 4:
+            v4 += V4_RECORD.pack(start_value, end_value, location)
+        else:
+            v6 += V6_RECORD.pack(start_value, end_value, location)
+
+    v4_count, v6_count = len(v4) // V4_RECORD.size, len(v6) // V6_RECORD.size
+    locations_offset = HEADER.size + len(v4) + len(v6)
+    directory = os.path.dirname(os.path.abspath(path))
+    os.makedirs(directory, exist_ok=True)
+    tmp_path = f"{path}.{os.getpid()}.tmp"
+    with open(tmp_path, 'wb') as f:
+        f.write(HEADER.pack(MAGIC, v4_count, v6_count, locations_offset))
+        f.write(v4)
+        f.write(v6)
+        f.write(json.dumps(locations, ensure_ascii=False, separators=(',', ':')).encode('utf-8'))
+    os.replace(tmp_path, path)
+    return v4_count, v6_count, len(locations)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="로컬 IP 위치 데이터베이스 생성/조회")
+    sub = parser.add_subparsers(dest='command', required=True)
+
+    build = sub.add_parser('build', help="DB-IP City Lite CSV로 정렬 배열 파일 생성")
+    build.add_argument('csv', help="dbip-city-lite-YYYY-MM.csv(.gz)")
+    build.add_argument('-o', '--output', default=os.path.join('data', 'ipdb.bin'))
+
+    lookup = sub.add_parser('lookup', help="IP 주소의 위치 조회")
+    lookup.add_argument('ip', nargs='+')
+    lookup.add_argument('--db', default=os.path.join('data', 'ipdb.bin'))
+
+    args = parser.parse_args()
+    if args.command == 'build':
+        started = time.time()
+        v4_count, v6_count, location_count = build_ip_database(read_dbip_csv(args.csv), args.output)
+        print(f"{args.output}: IPv4 {v4_count:,}개, IPv6 {v6_count:,}개 범위, "
+              f"위치 {location_count:,}개 ({time.time() - started:.1f}초)")
+        return 0
+
+    database = open_ip_database(args.db)
+    for ip in args.ip:
+        started = time.perf_counter()
+        location = database.lookup(ip)
+        print(f"{ip}: {location} ({(time.perf_counter() - started) * 1e6:.0f}µs)")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
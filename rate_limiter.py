@@ -0,0 +1,50 @@
+"""OpenWeather 호출 속도 제한 (토큰 버킷).
+
+API 키마다 하나씩 두고(weather_data.keypool), 키 풀이 업스트림 요청 직전에 try_acquire()로 토큰을 얻거나
+wait_time()만큼 기다린 뒤 다시 시도합니다. 캐시에서 응답하는 경우에는 토큰을 쓰지 않습니다.
+"""
+
+import threading
+import time
+
+
+class RateLimiter:
+    """분당 calls_per_minute회까지 허용하는 스레드 안전 토큰 버킷.
+
+    calls_per_minute: 1 이상이어야 합니다
+    burst: 한 번에 몰아서 보낼 수 있는 최대 요청 수 (기본값은 분당 한도의 1/6, 최소 1)
+    """
+
+    def __init__(self, calls_per_minute, burst=None):
+        if calls_per_minute <= 0:
+            raise ValueError(f"분당 호출 한도는 1 이상이어야 합니다: {calls_per_minute}")
+        self.rate = calls_per_minute / 60.0
+        self.capacity = burst or max(1, calls_per_minute // 6)
+        self._tokens = float(self.capacity)
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def _refill(self, now):
+        self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+        self._updated = now
+
+    def try_acquire(self):
+        """토큰이 있으면 바로 사용하고 True, 없으면 False를 반환합니다."""
+        with self._lock:
+            self._refill(time.monotonic())
+            if self._tokens >= 1:
+                self._tokens -= 1
+                return True
+            return False
+
+    def available(self):
+        """지금 바로 쓸 수 있는 토큰 수."""
+        with self._lock:
+            self._refill(time.monotonic())
+            return int(self._tokens)
+
+    def wait_time(self):
+        """다음 토큰을 얻을 수 있을 때까지 남은 시간(초). 지금 얻을 수 있으면 0."""
+        with self._lock:
+            self._refill(time.monotonic())
+            return max(0.0, (1 - self._tokens) / self.rate)
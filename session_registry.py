@@ -0,0 +1,89 @@
+"""세션별 메모리 사용량 집계 (진단용).
+
+앱은 세션 상태에 가벼운 키만 두고 큰 객체(날씨 응답, 예보 JSON, 렌더링된 HTML)는 프로세스 공유 캐시에서
+가져옵니다. 이 레지스트리는 최근 활동한 세션마다 마지막 활동 시각과 세션 상태 크기만 기록해 진단 정보로
+보여줄 뿐, 세션이나 세션 상태를 해제하지는 않습니다 (세션 상태는 Streamlit이 끝난 세션을 정리할 때 해제됩니다).
+"""
+
+import os
+import sys
+import threading
+import time
+from collections import OrderedDict
+
+
+def deep_sizeof(obj, _seen=None):
+    """객체가 참조하는 컨테이너까지 포함한 대략적인 메모리 크기(바이트)를 계산합니다."""
+    if _seen is None:
+        _seen = set()
+    if id(obj) in _seen:
+        return 0
+    _seen.add(id(obj))
+
+    size = sys.getsizeof(obj, 0)
+    if isinstance(obj, dict):
+        size += sum(deep_sizeof(k, _seen) + deep_sizeof(v, _seen) for k, v in obj.items())
+    elif isinstance(obj, (list, tuple, set, frozenset)):
+        size += sum(deep_sizeof(item, _seen) for item in obj)
+    elif hasattr(obj, '__dict__'):
+        size += deep_sizeof(vars(obj), _seen)
+    return size
+
+
+def process_rss_bytes():
+    """현재 프로세스의 상주 메모리(RSS)를 바이트로 반환합니다. 알 수 없으면 None."""
+    try:
+        with open('/proc/self/statm') as f:
+            return int(f.read().split()[1]) * os.sysconf('SC_PAGE_SIZE')
+    except (OSError, ValueError, IndexError):
+        pass
+    try:
+        import resource
+        peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        # macOS는 바이트, Linux는 KB 단위 (최대값이므로 근사치)
+        return peak if sys.platform == 'darwin' else peak * 1024
+    except (ImportError, OSError):
+        return None
+
+
+class SessionRegistry:
+    """최근 활동한 세션의 활동 시각과 세션 상태 크기를 집계합니다.
+
+    window: 이 시간(초) 안에 활동한 세션만 집계 (그보다 오래된 기록은 집계에서 지워 레지스트리 크기를 제한)
+    """
+
+    def __init__(self, window=1800):
+        self.window = window
+        self._lock = threading.Lock()
+        self._sessions = OrderedDict()  # session_id -> {'last_seen', 'reruns', 'state_bytes'} (오래된 활동 순)
+
+    def touch(self, session_id, state_bytes=None):
+        """세션 활동을 기록합니다."""
+        now = time.time()
+        with self._lock:
+            record = self._sessions.pop(session_id, None) or {'reruns': 0, 'state_bytes': 0}
+            record['last_seen'] = now
+            record['reruns'] += 1
+            if state_bytes is not None:
+                record['state_bytes'] = state_bytes
+            self._sessions[session_id] = record
+            self._forget_inactive(now)
+
+    def _forget_inactive(self, now):
+        # 가장 오래 활동하지 않은 세션이 앞에 있음
+        while self._sessions:
+            record = next(iter(self._sessions.values()))
+            if now - record['last_seen'] <= self.window:
+                break
+            self._sessions.popitem(last=False)
+
+    def stats(self):
+        """최근 window초 안에 활동한 세션 수, 세션 상태 총 크기, 최대 세션 상태 크기를 반환합니다."""
+        with self._lock:
+            self._forget_inactive(time.time())
+            sizes = [record['state_bytes'] for record in self._sessions.values()]
+            return {
+                'sessions': len(sizes),
+                'total_bytes': sum(sizes),
+                'max_bytes': max(sizes) if sizes else 0
+            }
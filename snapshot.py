@@ -0,0 +1,203 @@
+"""KOREAN_CITIES 전체의 현재 날씨/예보를 미리 계산해 둔 스냅샷 파일.
+
+스냅샷은 gzip으로 압축된 하나의 JSON 파일이며, 항목은 화면 표시에 필요한 값만 담은
+압축 형태(compact)로 저장됩니다. 갱신 시에는 임시 파일에 쓴 뒤 os.replace로 교체하므로
+읽는 쪽은 항상 완전한 이전 버전이나 새 버전 중 하나만 보게 됩니다.
+
+파일 구조:
+
+    {
+      "format": 2,
+      "version": 12,                 # 갱신할 때마다 1씩 증가
+      "generated_at": 1760850000,    # 생성 시각 (UTC 초)
+      "cities": {"Seoul": {"id": 1835848, "fetched_at": 1760849990, "current": [...], "forecast": [...]}, ...}
+    }
+
+갱신에 실패한 도시는 이전 항목을 그대로 이어받으므로, 최신 여부는 파일 전체의 generated_at이 아니라
+항목별 fetched_at(그 도시를 실제로 가져온 시각)으로 판단합니다.
+"""
+
+import gzip
+import json
+import os
+import time
+
+SNAPSHOT_FORMAT = 2  # 2: 예보 행에 풍속 추가
+
+# current 배열의 필드 순서
+CURRENT_FIELDS = (
+    'id', 'name', 'country', 'lat', 'lon', 'dt', 'timezone', 'sunrise', 'sunset',
+    'temp', 'feels_like', 'temp_min', 'temp_max', 'humidity', 'pressure', 'wind_speed',
+    'weather_id', 'main', 'description', 'icon'
+)
+
+# forecast 배열 각 행의 필드 순서
+FORECAST_FIELDS = (
+    'dt', 'temp', 'feels_like', 'temp_min', 'temp_max', 'humidity', 'wind_speed',
+    'weather_id', 'main', 'description', 'icon', 'pop'
+)
+
+
+def compact_current(weather_data):
+    """/weather 응답을 스냅샷용 배열로 줄입니다."""
+    main = weather_data['main']
+    weather = weather_data['weather'][0]
+    return [
+        weather_data.get('id', 0),
+        weather_data['name'],
+        weather_data['sys'].get('country', ''),
+        weather_data['coord']['lat'],
+        weather_data['coord']['lon'],
+        weather_data['dt'],
+        weather_data.get('timezone', 0),
+        weather_data['sys'].get('sunrise', weather_data['dt']),
+        weather_data['sys'].get('sunset', weather_data['dt']),
+        main['temp'],
+        main['feels_like'],
+        main['temp_min'],
+        main['temp_max'],
+        main['humidity'],
+        main['pressure'],
+        weather_data.get('wind', {}).get('speed', 0),
+        weather['id'],
+        weather['main'],
+        weather['description'],
+        weather['icon'],
+    ]
+
+
+def expand_current(row):
+    """스냅샷 배열을 /weather 응답과 같은 형태로 되돌립니다."""
+    v = dict(zip(CURRENT_FIELDS, row))
+    return {
+        'id': v['id'],
+        'name': v['name'],
+        'coord': {'lat': v['lat'], 'lon': v['lon']},
+        'weather': [{'id': v['weather_id'], 'main': v['main'], 'description': v['description'], 'icon': v['icon']}],
+        'main': {
+            'temp': v['temp'],
+            'feels_like': v['feels_like'],
+            'temp_min': v['temp_min'],
+            'temp_max': v['temp_max'],
+            'humidity': v['humidity'],
+            'pressure': v['pressure']
+        },
+        'wind': {'speed': v['wind_speed']},
+        'dt': v['dt'],
+        'sys': {'country': v['country'], 'sunrise': v['sunrise'], 'sunset': v['sunset']},
+        'timezone': v['timezone'],
+        'cod': 200
+    }
+
+
+def compact_forecast(forecast_data):
+    """/forecast 응답의 list를 스냅샷용 2차원 배열로 줄입니다."""
+    rows = []
+    for item in forecast_data.get('list', []):
+        main = item['main']
+        weather = item['weather'][0]
+        rows.append([
+            item['dt'], main['temp'], main['feels_like'], main['temp_min'], main['temp_max'],
+            main['humidity'], item.get('wind', {}).get('speed', 0), weather['id'], weather['main'], weather['description'], weather['icon'],
+            item.get('pop', 0)
+        ])
+    return rows
+
+
+def expand_forecast(rows, timezone_offset=0):
+    """스냅샷 배열을 /forecast 응답과 같은 형태로 되돌립니다."""
+    items = []
+    for row in rows:
+        v = dict(zip(FORECAST_FIELDS, row))
+        items.append({
+            'dt': v['dt'],
+            'main': {
+                'temp': v['temp'],
+                'feels_like': v['feels_like'],
+                'temp_min': v['temp_min'],
+                'temp_max': v['temp_max'],
+                'humidity': v['humidity']
+            },
+            'weather': [{'id': v['weather_id'], 'main': v['main'], 'description': v['description'], 'icon': v['icon']}],
+            'wind': {'speed': v['wind_speed']},
+            'pop': v['pop']
+        })
+    return {'list': items, 'city': {'timezone': timezone_offset}}
+
+
+def write_snapshot(path, snapshot):
+    """스냅샷을 임시 파일에 쓴 뒤 원자적으로 교체합니다."""
+    directory = os.path.dirname(os.path.abspath(path))
+    os.makedirs(directory, exist_ok=True)
+    tmp_path = f"{path}.{os.getpid()}.tmp"
+    payload = json.dumps(snapshot, ensure_ascii=False, separators=(',', ':')).encode('utf-8')
+    with gzip.open(tmp_path, 'wb', compresslevel=6) as f:
+        f.write(payload)
+    os.replace(tmp_path, path)
+
+
+def read_snapshot(path):
+    """스냅샷 파일을 읽습니다. 파일이 없거나 형식이 다르면 None을 반환합니다."""
+    try:
+        with gzip.open(path, 'rb') as f:
+            snapshot = json.loads(f.read().decode('utf-8'))
+    except (OSError, ValueError):
+        return None
+    if snapshot.get('format') != SNAPSHOT_FORMAT:
+        return None
+    return snapshot
+
+
+def entry_is_fresh(entry, max_age, now=None):
+    """항목을 가져온 지 max_age초가 지나지 않았는지 (max_age가 None이면 항상 True)."""
+    if max_age is None:
+        return True
+    now = time.time() if now is None else now
+    return now - entry.get('fetched_at', 0) <= max_age
+
+
+class SnapshotIndex:
+    """스냅샷을 도시 이름과 좌표로 O(1) 조회할 수 있도록 인덱싱합니다.
+    max_age초보다 오래전에 가져온 도시 항목은 없는 것으로 취급합니다."""
+
+    def __init__(self, snapshot, max_age=None):
+        self.version = snapshot.get('version', 0)
+        self.generated_at = snapshot.get('generated_at', 0)
+        self.max_age = max_age
+        self._by_city = snapshot.get('cities', {})
+        self._by_coord = {}
+        for city, entry in self._by_city.items():
+            current = dict(zip(CURRENT_FIELDS, entry['current']))
+            self._by_coord[(round(current['lat'], 4), round(current['lon'], 4))] = city
+
+    def __len__(self):
+        return len(self._by_city)
+
+    def _entry(self, english_city, fresh=True):
+        entry = self._by_city.get(english_city)
+        if entry is None or (fresh and not entry_is_fresh(entry, self.max_age)):
+            return None
+        return entry
+
+    def current(self, english_city, fresh=True):
+        """도시의 현재 날씨 (fetched_at 포함). 없거나 (fresh일 때) 오래된 항목이면 None."""
+        entry = self._entry(english_city, fresh)
+        if entry is None:
+            return None
+        return dict(expand_current(entry['current']), fetched_at=entry['fetched_at'])
+
+    def points(self):
+        """지도 표시용으로 최신 도시들의 (영문 이름, 현재 날씨 필드 딕셔너리, 가져온 시각)을 순회합니다."""
+        for city in self._by_city:
+            entry = self._entry(city)
+            if entry is not None:
+                yield city, dict(zip(CURRENT_FIELDS, entry['current'])), entry['fetched_at']
+
+    def forecast(self, lat, lon):
+        """좌표가 스냅샷 도시와 같으면 그 도시의 예보 (fetched_at 포함). 없거나 오래된 항목이면 None."""
+        city = self._by_coord.get((round(float(lat), 4), round(float(lon), 4)))
+        entry = self._entry(city) if city is not None else None
+        if entry is None or not entry.get('forecast'):
+            return None
+        timezone_offset = dict(zip(CURRENT_FIELDS, entry['current']))['timezone']
+        return dict(expand_forecast(entry['forecast'], timezone_offset), fetched_at=entry['fetched_at'])
@@ -0,0 +1,144 @@
+"""KOREAN_CITIES 전체의 날씨 스냅샷을 생성하는 주기 작업.
+
+사용법:
+    python snapshot_job.py                    # 한 번 생성
+    python snapshot_job.py --interval 600     # 10분마다 계속 갱신
+
+cron 예시 (10분마다):
+    */10 * * * * cd /path/to/weather00 && python snapshot_job.py
+
+이전 스냅샷에 저장된 도시 ID가 있으면 /group 엔드포인트로 최대 20개 도시씩 묶어
+현재 날씨를 가져오고, ID를 모르는 도시만 이름으로 개별 조회합니다.
+"""
+
+import argparse
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import requests
+
+from weather_data import BASE_URL, FORECAST_URL, api_get, load_settings
+from korean_cities import KOREAN_CITIES
+from snapshot import (SNAPSHOT_FORMAT, compact_current, compact_forecast, entry_is_fresh, read_snapshot,
+                      write_snapshot)
+
+GROUP_URL = "https://api.openweathermap.org/data/2.5/group"
+GROUP_SIZE = 20  # /group 엔드포인트의 최대 도시 수
+
+
+def _get(url, params):
+    params = dict(params, units='metric')
+    response = api_get(url, params, timeout=60)
+    response.raise_for_status()
+    return response.json()
+
+
+def fetch_group(city_ids):
+    """도시 ID 목록의 현재 날씨를 /group 요청 한 번으로 가져옵니다."""
+    data = _get(GROUP_URL, {'id': ','.join(str(i) for i in city_ids)})
+    return data.get('list', [])
+
+
+def fetch_current_by_name(english_city):
+    try:
+        return _get(BASE_URL, {'q': english_city})
+    except requests.exceptions.RequestException:
+        return None
+
+
+def fetch_forecast(lat, lon):
+    try:
+        return _get(FORECAST_URL, {'lat': lat, 'lon': lon, 'cnt': 40})
+    except requests.exceptions.RequestException:
+        return None
+
+
+def build_snapshot(previous=None, workers=8, max_age=None):
+    """모든 KOREAN_CITIES 항목의 현재 날씨와 예보로 새 스냅샷을 만듭니다.
+    이번에 가져오지 못한 도시는 이전 항목을 이어받되, 가져온 지 max_age초가 지난 항목은 버립니다."""
+    cities = sorted(set(KOREAN_CITIES.values()))
+    previous_cities = (previous or {}).get('cities', {})
+    known_ids = {city: entry['id'] for city, entry in previous_cities.items() if entry.get('id')}
+
+    current = {}
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        # 1) ID를 아는 도시는 /group으로 묶어서 조회
+        id_to_city = {known_ids[city]: city for city in cities if city in known_ids}
+        ids = list(id_to_city)
+        chunks = [ids[i:i + GROUP_SIZE] for i in range(0, len(ids), GROUP_SIZE)]
+        for future in [executor.submit(fetch_group, chunk) for chunk in chunks]:
+            try:
+                for weather_data in future.result():
+                    city = id_to_city.get(weather_data.get('id'))
+                    if city:
+                        current[city] = weather_data
+            except requests.exceptions.RequestException:
+                continue
+
+        # 2) 나머지는 이름으로 개별 조회 (다음 갱신부터는 ID로 묶어서 조회됨)
+        missing = [city for city in cities if city not in current]
+        for city, weather_data in zip(missing, executor.map(fetch_current_by_name, missing)):
+            if weather_data:
+                current[city] = weather_data
+
+        # 3) 예보는 묶음 조회가 없으므로 도시별로 병렬 조회
+        names = list(current)
+        forecasts = executor.map(
+            lambda city: fetch_forecast(current[city]['coord']['lat'], current[city]['coord']['lon']),
+            names
+        )
+        entries = {}
+        fetched_at = int(time.time())
+        for city, forecast_data in zip(names, forecasts):
+            weather_data = current[city]
+            # /group 응답에는 timezone이 없으므로 예보의 값을 사용
+            if 'timezone' not in weather_data and forecast_data:
+                weather_data['timezone'] = forecast_data.get('city', {}).get('timezone', 0)
+            entries[city] = {
+                'id': weather_data.get('id', 0),
+                'fetched_at': fetched_at,
+                'current': compact_current(weather_data),
+                'forecast': compact_forecast(forecast_data) if forecast_data else []
+            }
+
+    # 이번에 가져오지 못한 도시는 아직 최신인 이전 값만 유지 (앱도 항목별 fetched_at으로 다시 확인)
+    for city, entry in previous_cities.items():
+        if city not in entries and entry_is_fresh(entry, max_age):
+            entries[city] = entry
+
+    return {
+        'format': SNAPSHOT_FORMAT,
+        'version': (previous or {}).get('version', 0) + 1,
+        'generated_at': int(time.time()),
+        'cities': entries
+    }
+
+
+def run_once(path, workers, max_age=None):
+    started = time.time()
+    snapshot = build_snapshot(read_snapshot(path), workers=workers, max_age=max_age)
+    write_snapshot(path, snapshot)
+    print(f"스냅샷 v{snapshot['version']} 생성 완료: {len(snapshot['cities'])}개 도시, "
+          f"{time.time() - started:.1f}초 → {path}")
+
+
+def main():
+    settings = load_settings()
+    parser = argparse.ArgumentParser(description="KOREAN_CITIES 날씨 스냅샷 생성")
+    parser.add_argument('--path', default=settings['snapshot_path'], help="스냅샷 파일 경로")
+    parser.add_argument('--interval', type=int, default=0, help="갱신 간격(초). 0이면 한 번만 실행")
+    parser.add_argument('--workers', type=int, default=8, help="동시 요청 수")
+    args = parser.parse_args()
+
+    while True:
+        try:
+            run_once(args.path, args.workers, settings['snapshot_max_age'])
+        except Exception as e:
+            print(f"스냅샷 생성 실패: {e}")
+        if args.interval <= 0:
+            break
+        time.sleep(args.interval)
+
+
+if __name__ == "__main__":
+    main()
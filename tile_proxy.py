@@ -0,0 +1,293 @@
+"""지도 타일 캐싱 프록시.
+
+Leaflet 지도가 OpenStreetMap 타일 서버 대신 이 프록시를 바라보도록 하면,
+한 번 받은 타일은 디스크 캐시(z/x/y.png)에서 바로 응답합니다.
+
+- 캐시 용량이 --max-mb를 넘으면 가장 오래 사용하지 않은 타일부터 삭제 (LRU)
+- --max-age보다 오래된 타일은 ETag(If-None-Match)로 원본 서버에 재검증
+- 원본 서버 장애 시 오래된 타일이라도 캐시에 있으면 그대로 응답
+
+사용법:
+    python tile_proxy.py serve --port 8765
+    python tile_proxy.py seed --min-zoom 6 --max-zoom 13 --upstream https://tiles.example.com/{z}/{x}/{y}.png
+
+앱에서는 WEATHER_TILE_URL=http://<프록시 주소>:8765/{z}/{x}/{y}.png 로 설정합니다.
+타일은 브라우저가 직접 요청하므로 사용자 브라우저에서 접근 가능한 주소여야 합니다.
+
+⚠️ OpenStreetMap 타일 사용 정책상 tile.openstreetmap.org에서의 대량 사전 다운로드(seed)는
+금지되어 있습니다. seed는 대량 다운로드를 허용하는 타일 서버(자체 타일 서버 등)를 --upstream으로 지정해 사용하세요
+(원본이 tile.openstreetmap.org이면 seed는 실행을 거부합니다).
+"""
+
+import argparse
+import json
+import math
+import os
+import re
+import threading
+import time
+from collections import OrderedDict
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import urlsplit
+
+import requests
+
+DEFAULT_UPSTREAM = "https://tile.openstreetmap.org/{z}/{x}/{y}.png"
+OSM_TILE_HOST = "tile.openstreetmap.org"  # seed 금지 (a/b/c. 하위 도메인 포함)
+DEFAULT_CACHE_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "data", "tiles")
+USER_AGENT = "weather00-tile-proxy/1.0 (+https://github.com/lucielkim1004/weather00)"
+
+# 한국 전체 범위 (남, 서, 북, 동)
+KOREA_BBOX = (33.0, 124.5, 38.7, 131.0)
+
+TILE_PATH = re.compile(r'^/(\d+)/(\d+)/(\d+)\.png$')
+
+
+def lonlat_to_tile(lat, lon, zoom):
+    """위도/경도를 해당 확대 수준의 타일 좌표로 변환합니다 (Web Mercator)."""
+    n = 2 ** zoom
+    x = int((lon + 180.0) / 360.0 * n)
+    lat_rad = math.radians(lat)
+    y = int((1.0 - math.asinh(math.tan(lat_rad)) / math.pi) / 2.0 * n)
+    return min(max(x, 0), n - 1), min(max(y, 0), n - 1)
+
+
+def is_osm_upstream(upstream):
+    """원본 타일 URL이 OpenStreetMap 공용 타일 서버인지."""
+    host = (urlsplit(upstream).hostname or '').lower()
+    return host == OSM_TILE_HOST or host.endswith('.' + OSM_TILE_HOST)
+
+
+def tiles_in_bbox(bbox, min_zoom, max_zoom):
+    """범위 안의 모든 (z, x, y) 타일을 생성합니다."""
+    south, west, north, east = bbox
+    for z in range(min_zoom, max_zoom + 1):
+        x0, y0 = lonlat_to_tile(north, west, z)
+        x1, y1 = lonlat_to_tile(south, east, z)
+        for x in range(x0, x1 + 1):
+            for y in range(y0, y1 + 1):
+                yield z, x, y
+
+
+class TileCache:
+    """z/x/y로 저장하는 디스크 타일 캐시 (크기 기준 LRU)."""
+
+    def __init__(self, root, max_bytes, max_age, upstream=DEFAULT_UPSTREAM):
+        self.root = root
+        self.max_bytes = max_bytes
+        self.max_age = max_age
+        self.upstream = upstream
+        self._lock = threading.Lock()
+        self._entries = OrderedDict()  # 상대 경로 -> 크기 (오래 사용하지 않은 순)
+        self._total = 0
+        self._session = requests.Session()
+        self._session.headers['User-Agent'] = USER_AGENT
+        # 여러 요청 처리 스레드가 함께 갱신하므로 _count/snapshot_stats로만 접근
+        self.stats = {'hit': 0, 'miss': 0, 'revalidated': 0, 'stale': 0, 'evicted': 0}
+        self._scan()
+
+    def _scan(self):
+        """시작 시 디스크의 타일을 마지막 접근 시각 순으로 LRU 목록에 올립니다."""
+        found = []
+        for dirpath, _, filenames in os.walk(self.root):
+            for filename in filenames:
+                if filename.endswith('.png'):
+                    path = os.path.join(dirpath, filename)
+                    stat = os.stat(path)
+                    found.append((stat.st_atime, os.path.relpath(path, self.root), stat.st_size))
+        for _, rel_path, size in sorted(found):
+            self._entries[rel_path] = size
+            self._total += size
+
+    def _paths(self, z, x, y):
+        rel_path = os.path.join(str(z), str(x), f"{y}.png")
+        path = os.path.join(self.root, rel_path)
+        return rel_path, path, path + '.json'
+
+    def _count(self, name):
+        with self._lock:
+            self.stats[name] += 1
+
+    def snapshot_stats(self):
+        """캐시 상태별 횟수와 현재 타일 수, 전체 크기(바이트)."""
+        with self._lock:
+            return dict(self.stats, bytes=self._total, tiles=len(self._entries))
+
+    def _touch(self, rel_path):
+        with self._lock:
+            if rel_path in self._entries:
+                self._entries.move_to_end(rel_path)
+
+    def _store(self, rel_path, path, meta_path, content, etag):
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        tmp_path = f"{path}.{threading.get_ident()}.tmp"
+        with open(tmp_path, 'wb') as f:
+            f.write(content)
+        os.replace(tmp_path, path)
+        self._write_meta(meta_path, etag)
+
+        with self._lock:
+            self._total -= self._entries.pop(rel_path, 0)
+            self._entries[rel_path] = len(content)
+            self._total += len(content)
+            while self._total > self.max_bytes and len(self._entries) > 1:
+                old_path, size = self._entries.popitem(last=False)
+                self._total -= size
+                self.stats['evicted'] += 1
+                for victim in (os.path.join(self.root, old_path), os.path.join(self.root, old_path) + '.json'):
+                    try:
+                        os.remove(victim)
+                    except OSError:
+                        pass
+
+    def _write_meta(self, meta_path, etag):
+        with open(meta_path, 'w', encoding='utf-8') as f:
+            json.dump({'etag': etag, 'fetched_at': time.time()}, f)
+
+    def _read_meta(self, meta_path):
+        try:
+            with open(meta_path, encoding='utf-8') as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return {'etag': None, 'fetched_at': 0}
+
+    def get(self, z, x, y):
+        """타일을 (내용, ETag, 캐시 상태)로 반환합니다. 가져올 수 없으면 (None, None, 'error')."""
+        rel_path, path, meta_path = self._paths(z, x, y)
+        cached = None
+        if os.path.exists(path):
+            meta = self._read_meta(meta_path)
+            with open(path, 'rb') as f:
+                cached = f.read()
+            if time.time() - meta['fetched_at'] < self.max_age:
+                self._touch(rel_path)
+                self._count('hit')
+                return cached, meta['etag'], 'HIT'
+        else:
+            meta = {'etag': None}
+
+        headers = {}
+        if cached is not None and meta.get('etag'):
+            headers['If-None-Match'] = meta['etag']
+        try:
+            response = self._session.get(self.upstream.format(z=z, x=x, y=y), headers=headers, timeout=10)
+        except requests.exceptions.RequestException:
+            response = None
+
+        if response is not None and response.status_code == 304 and cached is not None:
+            self._write_meta(meta_path, meta['etag'])
+            self._touch(rel_path)
+            self._count('revalidated')
+            return cached, meta['etag'], 'REVALIDATED'
+        if response is not None and response.status_code == 200:
+            etag = response.headers.get('ETag')
+            self._store(rel_path, path, meta_path, response.content, etag)
+            self._count('miss')
+            return response.content, etag, 'MISS'
+        if cached is not None:
+            # 원본 서버 장애 시 오래된 타일로 응답
+            self._touch(rel_path)
+            self._count('stale')
+            return cached, meta.get('etag'), 'STALE'
+        return None, None, 'error'
+
+
+def make_handler(cache, browser_max_age):
+    class TileHandler(BaseHTTPRequestHandler):
+        def do_GET(self):
+            if self.path == '/stats':
+                body = json.dumps(cache.snapshot_stats()).encode()
+                self.send_response(200)
+                self.send_header('Content-Type', 'application/json')
+                self.send_header('Content-Length', str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+                return
+
+            match = TILE_PATH.match(self.path.split('?', 1)[0])
+            if not match:
+                self.send_error(404)
+                return
+            z, x, y = (int(v) for v in match.groups())
+            content, etag, status = cache.get(z, x, y)
+            if content is None:
+                self.send_error(502, "타일을 가져올 수 없습니다")
+                return
+
+            # 브라우저의 조건부 요청 처리
+            if etag and self.headers.get('If-None-Match') == etag:
+                self.send_response(304)
+                self.send_header('ETag', etag)
+                self.end_headers()
+                return
+
+            self.send_response(200)
+            self.send_header('Content-Type', 'image/png')
+            self.send_header('Content-Length', str(len(content)))
+            self.send_header('Cache-Control', f'public, max-age={browser_max_age}')
+            self.send_header('Access-Control-Allow-Origin', '*')
+            self.send_header('X-Cache', status)
+            if etag:
+                self.send_header('ETag', etag)
+            self.end_headers()
+            self.wfile.write(content)
+
+        def log_message(self, format, *args):
+            pass
+
+    return TileHandler
+
+
+def serve(args, cache):
+    server = ThreadingHTTPServer((args.host, args.port), make_handler(cache, args.browser_max_age))
+    stats = cache.snapshot_stats()
+    print(f"타일 프록시 실행 중: http://{args.host}:{args.port}/{{z}}/{{x}}/{{y}}.png "
+          f"(캐시 {stats['tiles']}개, {stats['bytes'] / 1024 / 1024:.1f}MB)")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+
+
+def seed(args, cache):
+    tiles = list(tiles_in_bbox(KOREA_BBOX, args.min_zoom, args.max_zoom))
+    print(f"한국 범위 z{args.min_zoom}-{args.max_zoom}: 타일 {len(tiles)}개 사전 다운로드")
+    interval = 1.0 / args.rate if args.rate > 0 else 0
+    for i, (z, x, y) in enumerate(tiles, 1):
+        started = time.time()
+        _, _, status = cache.get(z, x, y)
+        if i % 500 == 0 or i == len(tiles):
+            print(f"  {i}/{len(tiles)} ({cache.snapshot_stats()})")
+        # 캐시에 있던 타일은 원본 서버를 호출하지 않으므로 대기하지 않음
+        if status in ('MISS', 'REVALIDATED'):
+            time.sleep(max(0.0, interval - (time.time() - started)))
+
+
+def main():
+    parser = argparse.ArgumentParser(description="지도 타일 캐싱 프록시")
+    parser.add_argument('command', choices=['serve', 'seed'])
+    parser.add_argument('--cache-dir', default=os.getenv('WEATHER_TILE_CACHE_DIR', DEFAULT_CACHE_DIR))
+    parser.add_argument('--upstream', default=os.getenv('WEATHER_TILE_UPSTREAM', DEFAULT_UPSTREAM),
+                        help="원본 타일 URL 템플릿 ({z}/{x}/{y} 포함)")
+    parser.add_argument('--max-mb', type=float, default=2048, help="디스크 캐시 최대 크기 (MB)")
+    parser.add_argument('--max-age', type=int, default=7 * 86400, help="재검증 없이 사용하는 기간 (초)")
+    parser.add_argument('--host', default='0.0.0.0')
+    parser.add_argument('--port', type=int, default=8765)
+    parser.add_argument('--browser-max-age', type=int, default=86400, help="브라우저 Cache-Control max-age (초)")
+    parser.add_argument('--min-zoom', type=int, default=6)
+    parser.add_argument('--max-zoom', type=int, default=13)
+    parser.add_argument('--rate', type=float, default=2.0, help="seed 시 초당 최대 원본 요청 수")
+    args = parser.parse_args()
+    if args.command == 'seed' and is_osm_upstream(args.upstream):
+        parser.error(f"{OSM_TILE_HOST}에서는 대량 사전 다운로드(seed)가 금지되어 있습니다. "
+                     "대량 다운로드를 허용하는 타일 서버를 --upstream으로 지정하세요")
+
+    cache = TileCache(args.cache_dir, int(args.max_mb * 1024 * 1024), args.max_age, args.upstream)
+    if args.command == 'serve':
+        serve(args, cache)
+    else:
+        seed(args, cache)
+
+
+if __name__ == "__main__":
+    main()
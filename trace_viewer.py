@@ -0,0 +1,103 @@
+"""기록된 실행 trace를 읽어 느린 실행과 단계별 소요 시간을 보여주는 CLI.
+
+사용법:
+    python trace_viewer.py                          # 가장 느린 실행 10개 + 단계별 p50/p95
+    python trace_viewer.py --top 3 --method GPS     # GPS 위치로 조회한 실행만
+    python trace_viewer.py --name live_current      # 라이브 모드 갱신만
+    python trace_viewer.py data/traces.jsonl        # 파일 지정 (기본값: WEATHER_TRACE_PATH)
+
+회전된 이전 파일(<경로>.1)이 있으면 함께 읽습니다.
+"""
+
+import argparse
+import json
+import os
+import sys
+from collections import defaultdict
+
+from weather_data import load_settings
+from weather_data.latency import percentile
+
+
+def read_traces(path):
+    """path.1과 path의 trace 기록을 오래된 것부터 읽습니다. 깨진 줄은 건너뜁니다."""
+    records = []
+    for name in (f"{path}.1", path):
+        if not os.path.exists(name):
+            continue
+        with open(name, encoding='utf-8') as f:
+            for line in f:
+                try:
+                    records.append(json.loads(line))
+                except ValueError:
+                    continue
+    return records
+
+
+def _format_attributes(attributes):
+    return " ".join(f"{key}={value}" for key, value in attributes.items())
+
+
+def print_tree(record, out=sys.stdout):
+    """trace 하나를 들여쓴 span 트리로 출력합니다."""
+    children = defaultdict(list)
+    for span in record['spans']:
+        children[span['parent_span_id']].append(span)
+
+    def walk(span, depth):
+        attributes = _format_attributes(span['attributes'])
+        print(f"{'  ' * depth}{span['name']:<{max(1, 32 - 2 * depth)}} "
+              f"+{span['start_offset_ms']:8.1f}ms {span['duration_ms']:8.1f}ms  {attributes}".rstrip(), file=out)
+        for child in sorted(children[span['span_id']], key=lambda child: child['start_offset_ms']):
+            walk(child, depth + 1)
+
+    for root in children[None]:
+        walk(root, 0)
+
+
+def span_summary(records):
+    """span 이름별 (횟수, p50, p95, 최대) 소요 시간(ms)."""
+    durations = defaultdict(list)
+    for record in records:
+        for span in record['spans']:
+            durations[span['name']].append(span['duration_ms'])
+    return {
+        name: (len(values), percentile(values, 0.5), percentile(values, 0.95), max(values))
+        for name, values in durations.items()
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="기록된 실행 trace에서 느린 실행과 단계별 소요 시간을 보여줍니다")
+    parser.add_argument('path', nargs='?', help="trace JSONL 파일 (기본값: WEATHER_TRACE_PATH)")
+    parser.add_argument('--top', type=int, default=10, help="트리로 보여줄 가장 느린 실행 수")
+    parser.add_argument('--name', help="이 이름의 trace만 (main, live_current, live_hourly)")
+    parser.add_argument('--method', help="이 위치 방식의 실행만 (GPS, IP, MAP, search, home)")
+    args = parser.parse_args()
+
+    path = args.path or load_settings()['trace_path']
+    records = read_traces(path)
+    if args.name:
+        records = [record for record in records if record['name'] == args.name]
+    if args.method:
+        records = [record for record in records if record['attributes'].get('location_method') == args.method]
+    if not records:
+        print(f"기록된 trace가 없습니다: {path}", file=sys.stderr)
+        return 1
+
+    slowest = sorted(records, key=lambda record: record['duration_ms'], reverse=True)[:args.top]
+    print(f"trace {len(records)}개 중 가장 느린 {len(slowest)}개\n")
+    for record in slowest:
+        print(f"[{record['trace_id'][:8]}] {record['duration_ms']:.1f}ms")
+        print_tree(record)
+        print()
+
+    print(f"{'단계':<32} {'횟수':>6} {'p50':>9} {'p95':>9} {'최대':>9}")
+    summary = span_summary(records)
+    for name, (count, p50, p95, worst) in sorted(summary.items(), key=lambda item: item[1][2], reverse=True):
+        print(f"{name:<32} {count:>6} {p50:>7.1f}ms {p95:>7.1f}ms {worst:>7.1f}ms")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,85 @@
+"""날씨 데이터 계층.
+
+Streamlit 없이 import할 수 있는 조회/캐시/변환/집계 코드입니다.
+app.py(UI), api.py, bulk_fetch.py, snapshot_job.py, 벤치마크가 모두 이 패키지를 사용합니다.
+
+    from weather_data import get_weather, get_forecast_data, aggregate_daily_forecast
+
+    weather = get_weather("서울")
+    daily = aggregate_daily_forecast(get_forecast_data(**weather['coord']))
+"""
+
+from .aggregation import (
+    aggregate_daily_forecast,
+    hourly_forecast_columns,
+    hourly_forecast_entries,
+    hourly_forecast_items,
+)
+from .air_quality import grade as air_quality_grade
+from .cache import AIR_QUALITY_TTL, CACHE_TTL, MissCache, resource, ttl_cache
+from .client import (
+    AIR_POLLUTION_URL,
+    BASE_URL,
+    FORECAST_URL,
+    GEOCODE_URL,
+    ONECALL_URL,
+    REVERSE_GEOCODE_URL,
+    api_get,
+    client_ip_from_headers,
+    count_api_calls,
+    get_http_session,
+    get_key_pool,
+    get_tracer,
+    get_latency_tracker,
+    get_location_by_ip,
+    get_not_found_cache,
+    ip_location_not_found_at,
+    onecall_enabled,
+)
+from .conditions import DEFAULT_LANGUAGE, LANGUAGES, condition_text, weather_description
+from .config import get_setting, load_settings, set_setting_source
+from .fanout import FanOut, get_fanout
+from .metrics import (
+    COMFORT_CLASSES,
+    comfort_label,
+    derived_metrics,
+    forecast_metrics,
+    items_metrics,
+    observation_metrics,
+)
+from .models import air_pollution_to_compact, onecall_to_forecast, onecall_to_weather, round_coord
+from .service import (
+    city_not_found_at,
+    geocode_city,
+    get_air_quality,
+    get_forecast_data,
+    get_onecall_data,
+    get_place_name,
+    get_weather,
+    get_weather_by_coords,
+    start_location_fetch,
+)
+from .prefetch import Prefetcher, city_key, get_prefetcher, prefetch_city
+from .render_memo import RenderMemo, get_render_memo, payload_digest
+from .tracing import Tracer, annotate, span, traced
+from .timeindex import WEEKDAY_NAMES, TimeIndex, build_time_index, date_labels, forecast_time_index
+from .sources import (
+    get_historical_weather,
+    get_history_store,
+    get_ip_database,
+    get_korean_cities,
+    get_nearby_index,
+    get_snapshot,
+    record_observation,
+    suggest_cities,
+)
+from .units import (
+    DEFAULT_UNITS,
+    UNIT_SYSTEMS,
+    convert_speed,
+    convert_temperature,
+    localize_items,
+    localized_forecast,
+    localized_weather,
+    unit_system,
+)
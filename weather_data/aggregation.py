@@ -0,0 +1,82 @@
+"""예보 집계 (일별 대표 항목, 시간별 항목).
+
+날짜와 시각은 모두 forecast_time_index()의 도시 현지 시간 기준입니다.
+"""
+
+import numpy as np
+
+from .conditions import DEFAULT_LANGUAGE
+from .metrics import comfort_label, forecast_metrics
+from .timeindex import forecast_time_index
+from .tracing import traced
+from .units import DEFAULT_UNITS, localized_forecast
+
+
+@traced()
+def aggregate_daily_forecast(forecast_data, days=7):
+    """예보를 날짜별 대표 항목 [(YYYY-MM-DD, item), ...]으로 묶어 최대 days일치를 반환합니다.
+    일별 예보(One Call)가 있으면 그대로 사용하고, 3시간 간격 예보는 날짜마다 정오 항목을 우선 선택합니다."""
+    if not forecast_data:
+        return []
+
+    if forecast_data.get('daily'):
+        # One Call 일별 예보 (하루 한 항목)
+        index = forecast_time_index(forecast_data, 'daily')
+        return list(zip(index.dates, forecast_data['daily']))[:days]
+
+    # 일별로 데이터 그룹화 (하루에 하나씩만 표시)
+    index = forecast_time_index(forecast_data)
+    daily_forecasts = {}
+    for date_key, hour, item in zip(index.dates, index.hours, forecast_data.get('list', [])):
+        # 각 날짜의 정오(12시) 데이터 우선 선택, 없으면 첫 데이터
+        if date_key not in daily_forecasts or hour == 12:
+            daily_forecasts[date_key] = item
+
+    return list(daily_forecasts.items())[:days]
+
+
+def hourly_forecast_entries(forecast_data, hours=24):
+    """향후 hours시간의 예보를 3시간 간격 [(위치, item), ...]으로 반환합니다.
+    위치는 forecast_time_index(forecast_data)에서 현지 시각을 찾을 때 씁니다.
+    One Call의 1시간 간격 예보는 3시간마다 하나씩 골라 같은 간격으로 맞춥니다."""
+    return [(i, forecast_data['list'][i]) for i in _hourly_positions(forecast_data, hours)]
+
+
+def _hourly_positions(forecast_data, hours):
+    if not forecast_data or not forecast_data.get('list'):
+        return range(0)
+    step = max(1, 3 // forecast_data.get('interval_hours', 3))
+    count = len(forecast_data['list']) if hours is None else min(len(forecast_data['list']), (hours // 3) * step)
+    return range(0, count, step)
+
+
+def hourly_forecast_items(forecast_data, hours=24):
+    """향후 hours시간의 예보를 3시간 간격 항목 목록으로 반환합니다."""
+    return [item for _, item in hourly_forecast_entries(forecast_data, hours)]
+
+
+def hourly_forecast_columns(forecast_data, hours=24, units=DEFAULT_UNITS, lang=DEFAULT_LANGUAGE):
+    """향후 hours시간(None이면 전체)의 3시간 간격 예보를 표시 단위의 컬럼으로 반환합니다.
+
+    반환: {'time', 'temp', 'feels_like', 'pop', 'humidity', 'wind_speed', 'description', 'comfort'}
+    - 같은 길이의 목록. 'time'은 'MM/DD HH:MM' 현지 시각, 'pop'은 %, 'comfort'는 '이모지 이름'
+    """
+    positions = list(_hourly_positions(forecast_data, hours))
+    if not positions:
+        return {name: [] for name in ('time', 'temp', 'feels_like', 'pop', 'humidity',
+                                      'wind_speed', 'description', 'comfort')}
+
+    items = forecast_data['list']
+    time_index = forecast_time_index(forecast_data)
+    shown = localized_forecast(forecast_data, units, lang)
+    comfort = forecast_metrics(forecast_data)['comfort'][positions]
+    return {
+        'time': [time_index.label(i) for i in positions],
+        'temp': np.round(shown['temp'][positions], 1).tolist(),
+        'feels_like': np.round(shown['feels_like'][positions], 1).tolist(),
+        'pop': [round(items[i].get('pop', 0) * 100) for i in positions],
+        'humidity': [items[i]['main']['humidity'] for i in positions],
+        'wind_speed': np.round(shown['wind_speed'][positions], 1).tolist(),
+        'description': [shown['description'][i] for i in positions],
+        'comfort': ["{1} {0}".format(*comfort_label(code)) for code in comfort],
+    }
@@ -0,0 +1,41 @@
+"""대기질(PM10, PM2.5)과 자외선 지수 등급.
+
+미세먼지는 환경부 예보 등급(좋음/보통/나쁨/매우나쁨, ㎍/㎥),
+자외선은 기상청 자외선 지수 등급(낮음/보통/높음/매우높음/위험)을 따릅니다.
+"""
+
+import math
+
+# 등급 표: (상한값 이하, 이름, 이모지, 색)
+PM10_GRADES = (
+    (30, '좋음', '😀', '#1c7ed6'),
+    (80, '보통', '🙂', '#37b24d'),
+    (150, '나쁨', '😷', '#f59f00'),
+    (math.inf, '매우나쁨', '🚨', '#e03131'),
+)
+PM25_GRADES = (
+    (15, '좋음', '😀', '#1c7ed6'),
+    (35, '보통', '🙂', '#37b24d'),
+    (75, '나쁨', '😷', '#f59f00'),
+    (math.inf, '매우나쁨', '🚨', '#e03131'),
+)
+UV_GRADES = (
+    (2, '낮음', '🟢', '#37b24d'),
+    (5, '보통', '🟡', '#f59f00'),
+    (7, '높음', '🟠', '#f76707'),
+    (10, '매우높음', '🔴', '#e03131'),
+    (math.inf, '위험', '🟣', '#7048e8'),
+)
+
+_GRADES = {'pm10': PM10_GRADES, 'pm2_5': PM25_GRADES, 'uvi': UV_GRADES}
+
+
+def grade(kind, value):
+    """kind('pm10', 'pm2_5', 'uvi') 값의 (이름, 이모지, 색). 값이 없으면 None."""
+    if value is None:
+        return None
+    # 미세먼지 등급은 정수 농도 기준이므로 반올림한 값으로 비교 (예: PM2.5 15.4 → 좋음)
+    value = round(value)
+    for upper, name, emoji, color in _GRADES[kind]:
+        if value <= upper:
+            return name, emoji, color
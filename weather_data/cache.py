@@ -0,0 +1,130 @@
+"""Streamlit 없이 쓰는 프로세스 내 캐시.
+
+- ttl_cache: st.cache_data 대신 쓰는 시간 제한 결과 캐시. 예외는 캐시하지 않습니다.
+- resource: st.cache_resource 대신 쓰는 공유 객체 캐시 (세션, 저장소, 설정 등).
+- MissCache: 찾지 못한 조회(404 등)를 짧게 기억하는 부정 캐시.
+
+캐시된 값은 모든 호출자가 같은 객체를 공유하므로 수정하지 말고 복사해서 사용해야 합니다.
+"""
+
+import functools
+import threading
+import time
+from collections import OrderedDict
+
+from .tracing import annotate
+
+# 날씨/예보 캐시 유지 시간 (초)
+CACHE_TTL = 600
+
+# 대기질 캐시 유지 시간 (초) - 관측값이 한 시간 단위로 갱신됨
+AIR_QUALITY_TTL = 3600
+
+# 찾은 IP 위치를 재사용하는 시간 (초) - 같은 세션이 버튼을 다시 눌러도 외부 IP 위치 서비스에 다시 묻지 않음
+IP_LOCATION_TTL = 300
+
+# 찾지 못한 조회를 기억하는 기본 시간 (초) - 오타가 고쳐질 수 있도록 일반 캐시보다 짧게 유지
+NOT_FOUND_TTL = 300
+
+
+def _make_key(args, kwargs):
+    return args + tuple(sorted(kwargs.items())) if kwargs else args
+
+
+def ttl_cache(ttl=CACHE_TTL, max_entries=1024):
+    """결과를 ttl초 동안 캐시하는 데코레이터. 가장 오래 사용하지 않은 항목부터 max_entries개까지 유지합니다."""
+    def decorator(func):
+        entries = OrderedDict()  # key -> (만료 시각, 값)
+        lock = threading.Lock()
+
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            key = _make_key(args, kwargs)
+            with lock:
+                entry = entries.get(key)
+                if entry is not None and entry[0] > time.monotonic():
+                    entries.move_to_end(key)
+                    annotate(**{f'cache.{func.__name__}': 'hit'})
+                    return entry[1]
+            annotate(**{f'cache.{func.__name__}': 'miss'})
+            # 실패하면 예외가 그대로 전파되어 캐시에 남지 않음
+            value = func(*args, **kwargs)
+            with lock:
+                entries[key] = (time.monotonic() + ttl, value)
+                entries.move_to_end(key)
+                while len(entries) > max_entries:
+                    entries.popitem(last=False)
+            return value
+
+        def clear():
+            with lock:
+                entries.clear()
+
+        wrapper.clear = clear
+        return wrapper
+    return decorator
+
+
+def resource(func=None, *, max_entries=None):
+    """인자별로 한 번만 만든 객체를 프로세스 전체에서 공유하는 데코레이터."""
+    def decorator(func):
+        entries = OrderedDict()
+        lock = threading.RLock()
+
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            key = _make_key(args, kwargs)
+            with lock:
+                if key in entries:
+                    entries.move_to_end(key)
+                    return entries[key]
+                value = func(*args, **kwargs)
+                entries[key] = value
+                if max_entries is not None:
+                    while len(entries) > max_entries:
+                        entries.popitem(last=False)
+                return value
+
+        def clear():
+            with lock:
+                entries.clear()
+
+        wrapper.clear = clear
+        return wrapper
+    return decorator(func) if func is not None else decorator
+
+
+class MissCache:
+    """찾지 못한 조회 키를 ttl초 동안 기억합니다 (부정 캐시).
+
+    시간 초과나 5xx 같은 일시적인 오류는 여기에 넣지 말아야 합니다.
+    그런 오류까지 기억하면 upstream이 회복된 뒤에도 '없음'으로 응답하게 됩니다.
+    """
+
+    def __init__(self, ttl=NOT_FOUND_TTL, max_entries=4096):
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self._entries = OrderedDict()  # key -> 기록 시각 (time.time())
+        self._lock = threading.Lock()
+
+    def add(self, key):
+        with self._lock:
+            self._entries[key] = time.time()
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def get(self, key):
+        """key를 찾지 못한 시각을 반환합니다. 기록이 없거나 만료되었으면 None."""
+        with self._lock:
+            missed_at = self._entries.get(key)
+            if missed_at is None:
+                return None
+            if time.time() - missed_at > self.ttl:
+                del self._entries[key]
+                return None
+            return missed_at
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
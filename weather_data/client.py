@@ -0,0 +1,440 @@
+"""OpenWeather / IP 위치 서비스 HTTP 클라이언트.
+
+fetch_* 함수는 실패하면 requests 예외를 던져 캐시에 남지 않도록 하고,
+성공한 응답에는 가져온 시각(fetched_at)을 붙여 CACHE_TTL 동안 캐시합니다.
+"""
+
+import contextlib
+import contextvars
+import ipaddress
+import time
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, TimeoutError as FutureTimeout, wait
+
+import requests
+
+from .cache import AIR_QUALITY_TTL, CACHE_TTL, IP_LOCATION_TTL, MissCache, resource, ttl_cache
+from .config import load_settings
+from .keypool import KeyPool
+from .latency import LatencyTracker, endpoint_of
+from .models import air_pollution_to_compact
+from .sources import get_ip_database, record_observation
+from .tracing import Tracer, span, traced
+
+# OpenWeather API 설정
+BASE_URL = "https://api.openweathermap.org/data/2.5/weather"
+FORECAST_URL = "https://api.openweathermap.org/data/2.5/forecast"
+ONECALL_URL = "https://api.openweathermap.org/data/3.0/onecall"
+GEOCODE_URL = "https://api.openweathermap.org/geo/1.0/direct"
+REVERSE_GEOCODE_URL = "https://api.openweathermap.org/geo/1.0/reverse"
+AIR_POLLUTION_URL = "https://api.openweathermap.org/data/2.5/air_pollution"
+
+# count_api_calls() 블록 안에서 보낸 OpenWeather 요청 수 (선행 조회의 호출 수 집계용)
+_api_call_count = contextvars.ContextVar('weather_api_call_count', default=None)
+
+
+@resource
+def get_http_session():
+    """연결을 재사용하는 공유 HTTP 세션을 반환합니다 (처음 사용할 때 생성)."""
+    from requests.adapters import HTTPAdapter
+    session = requests.Session()
+    adapter = HTTPAdapter(pool_connections=8, pool_maxsize=32)
+    session.mount('https://', adapter)
+    session.mount('http://', adapter)
+    return session
+
+
+@resource
+def get_key_pool():
+    """프로세스 전체가 공유하는 OpenWeather API 키 풀(키별 호출 한도)을 반환합니다."""
+    return KeyPool(load_settings()['api_keys'])
+
+
+@resource
+def get_latency_tracker():
+    """엔드포인트별 응답 시간 통계 (적응형 타임아웃과 헤지 요청에 사용)."""
+    settings = load_settings()
+    return LatencyTracker(
+        default_timeout=settings['timeout_max'],
+        min_timeout=settings['timeout_min'],
+        max_timeout=settings['timeout_max'],
+        hedge_percent=settings['hedge_percent']
+    )
+
+
+@resource
+def get_tracer():
+    """프로세스 전체가 공유하는 실행 추적기 (WEATHER_TRACE_SAMPLE_RATE 비율만 기록)."""
+    settings = load_settings()
+    return Tracer(settings['trace_path'], settings['trace_sample_rate'])
+
+
+@resource
+def _hedge_executor():
+    return ThreadPoolExecutor(max_workers=16, thread_name_prefix='weather-hedge')
+
+
+def _key_rejected(url, status_code):
+    """키 자체가 거부된 응답인지 확인합니다 (401 키 무효, 429 한도 초과).
+    One Call의 401은 키가 아니라 구독이 없다는 뜻이므로 제외합니다 (disable_onecall()이 처리)."""
+    return status_code == 429 or (status_code == 401 and url != ONECALL_URL)
+
+
+def _timed_get(url, params, timeout, endpoint, key):
+    """key로 요청을 보내고 응답 시간과 키 사용 결과를 기록합니다."""
+    tracker = get_latency_tracker()
+    started = time.perf_counter()
+    try:
+        response = get_http_session().get(url, params=dict(params, appid=key.key), timeout=timeout)
+    except requests.exceptions.Timeout:
+        tracker.record(endpoint, timeout, timed_out=True)
+        raise
+    tracker.record(endpoint, time.perf_counter() - started)
+    if _key_rejected(url, response.status_code):
+        get_key_pool().report(key, response.status_code)
+    return response
+
+
+def _hedged_get(url, params, timeout, endpoint, hedge_delay, key):
+    """hedge_delay 안에 응답이 없으면 (헤지 예산과 호출 한도 안에서) 같은 요청을 한 번 더 보내
+    먼저 성공한 응답을 반환합니다. 늦게 온 응답은 버립니다. 헤지 요청은 그때 한도가 남은 키로 보냅니다."""
+    tracker = get_latency_tracker()
+    executor = _hedge_executor()
+    primary = executor.submit(_timed_get, url, params, timeout, endpoint, key)
+    hedged = False
+    hedge_key = None
+    try:
+        try:
+            return primary.result(timeout=hedge_delay)
+        except FutureTimeout:
+            pass
+
+        def acquire_hedge_key():
+            nonlocal hedge_key
+            hedge_key = get_key_pool().try_acquire()
+            return hedge_key is not None
+
+        pending = {primary}
+        hedged = tracker.allow_hedge(endpoint, acquire=acquire_hedge_key)
+        if hedged:
+            pending.add(executor.submit(_timed_get, url, params, timeout, endpoint, hedge_key))
+
+        error = None
+        while pending:
+            done, pending = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                if future.exception() is None:
+                    if future is not primary:
+                        tracker.note_hedge_win(endpoint)
+                    return future.result()
+                error = future.exception()
+        raise error
+    finally:
+        tracker.note_request(hedged)
+
+
+def api_get(url, params, timeout=None):
+    """키별 호출 한도를 지키며 OpenWeather API를 호출합니다. params에 appid는 넣지 않습니다.
+
+    요청마다 한도가 남은 키 중 사용률이 가장 낮은 키를 쓰고, 키가 거부되면(401/429) 다른 키로 한 번씩 다시 보냅니다.
+    timeout을 주지 않으면 엔드포인트의 최근 p95로 타임아웃을 정하고, 응답이 p95보다 늦으면
+    헤지 요청을 보냅니다. 한도 때문에 timeout 안에 보낼 수 없으면 requests.exceptions.Timeout을 던집니다.
+    """
+    tracker = get_latency_tracker()
+    pool = get_key_pool()
+    if not len(pool):
+        raise requests.exceptions.RequestException("OpenWeather API 키가 설정되지 않았습니다.")
+    endpoint = endpoint_of(url)
+    hedge_delay = None
+    if timeout is None:
+        timeout = tracker.timeout(endpoint)
+        hedge_delay = tracker.hedge_delay(endpoint)
+
+    counter = _api_call_count.get()
+    for _ in range(len(pool)):
+        if counter is not None:
+            counter[0] += 1
+        with span('http', endpoint=endpoint) as current:
+            started = time.perf_counter()
+            key = pool.acquire(timeout=timeout)
+            if key is None:
+                raise requests.exceptions.Timeout("OpenWeather 호출 한도로 요청을 보내지 못했습니다.")
+            current.set(key=key.label, wait_ms=round((time.perf_counter() - started) * 1000, 3))
+            if hedge_delay is not None:
+                response = _hedged_get(url, params, timeout, endpoint, hedge_delay, key)
+            else:
+                try:
+                    response = _timed_get(url, params, timeout, endpoint, key)
+                finally:
+                    tracker.note_request()
+            current.set(status=response.status_code, bytes=len(response.content))
+        if not _key_rejected(url, response.status_code):
+            break
+    return response
+
+
+@contextlib.contextmanager
+def count_api_calls():
+    """블록 안에서 (같은 컨텍스트가) api_get으로 보낸 OpenWeather 요청 수를 셉니다. [횟수]를 넘겨줍니다."""
+    counter = [0]
+    token = _api_call_count.set(counter)
+    try:
+        yield counter
+    finally:
+        _api_call_count.reset(token)
+
+
+@resource
+def get_not_found_cache():
+    """찾지 못한 도시/좌표/IP 위치를 짧게 기억하는 프로세스 공유 부정 캐시를 반환합니다."""
+    return MissCache(load_settings()['not_found_ttl'])
+
+
+def is_not_found(error):
+    """입력 자체가 잘못되어 다시 보내도 같은 결과가 나오는 오류(400/404)인지 확인합니다.
+    시간 초과, 연결 오류, 429, 5xx는 일시적인 오류로 보고 False를 반환합니다."""
+    response = getattr(error, 'response', None)
+    return (isinstance(error, requests.exceptions.HTTPError)
+            and response is not None and response.status_code in (400, 404))
+
+
+def _is_transient_status(status_code):
+    return status_code == 429 or status_code >= 500
+
+
+def _params(**params):
+    # 항상 기준 형태(°C, m/s, 영어 설명)로 요청 - 표시 단위/언어는 units.py에서 변환하므로 캐시 항목이 하나
+    params.update(units='metric')
+    return params
+
+
+@resource
+def _get_onecall_status():
+    return {'available': load_settings()['use_onecall']}
+
+
+def onecall_enabled():
+    """One Call 3.0 모드가 켜져 있고 현재 키로 접근 가능한지 여부를 반환합니다."""
+    return _get_onecall_status()['available']
+
+
+def disable_onecall():
+    """키에 One Call 권한이 없을 때 호출합니다. 이후 요청은 기존 방식(/weather + /forecast)으로 처리됩니다."""
+    _get_onecall_status()['available'] = False
+
+
+@ttl_cache(CACHE_TTL)
+def fetch_onecall(lat, lon, bucket=None):
+    """One Call 3.0 응답을 가져옵니다.
+    bucket은 라이브 모드의 갱신 구간 번호로, 구간이 바뀌면 새로 요청하도록 캐시 키에만 쓰입니다."""
+    response = api_get(ONECALL_URL, _params(lat=lat, lon=lon, exclude='minutely,alerts'))
+    response.raise_for_status()
+    data = response.json()
+    data['fetched_at'] = time.time()
+    return data
+
+
+@ttl_cache(CACHE_TTL)
+def fetch_weather_by_coords(lat, lon, bucket=None):
+    """좌표의 현재 날씨를 가져옵니다."""
+    response = api_get(BASE_URL, _params(lat=lat, lon=lon))
+    response.raise_for_status()
+    weather_data = response.json()
+    weather_data['fetched_at'] = time.time()
+    record_observation(weather_data)
+    return weather_data
+
+
+@ttl_cache(CACHE_TTL)
+def fetch_weather_by_name(english_city):
+    """도시 이름으로 현재 날씨를 가져옵니다."""
+    response = api_get(BASE_URL, _params(q=english_city))
+    response.raise_for_status()
+    weather_data = response.json()
+    weather_data['fetched_at'] = time.time()
+    record_observation(weather_data)
+    return weather_data
+
+
+@ttl_cache(CACHE_TTL)
+def fetch_forecast(lat, lon, bucket=None):
+    """좌표의 5일 예보를 가져옵니다."""
+    response = api_get(FORECAST_URL, _params(lat=lat, lon=lon, cnt=40))  # 5일 * 8회 (3시간 간격)
+    response.raise_for_status()
+    forecast_data = response.json()
+    forecast_data['fetched_at'] = time.time()
+    return forecast_data
+
+
+@ttl_cache(AIR_QUALITY_TTL)
+def fetch_air_pollution(lat, lon):
+    """좌표의 현재 대기질을 가져옵니다 (필요한 값만 남긴 작은 dict로 캐시)."""
+    response = api_get(AIR_POLLUTION_URL, {'lat': lat, 'lon': lon})
+    response.raise_for_status()
+    air_quality = air_pollution_to_compact(response.json())
+    if air_quality is not None:
+        air_quality['fetched_at'] = time.time()
+    return air_quality
+
+
+@ttl_cache(86400)
+def fetch_geocode(query):
+    params = {'q': query, 'limit': 1}
+    response = api_get(GEOCODE_URL, params)
+    response.raise_for_status()
+    return response.json()
+
+
+@ttl_cache(86400)
+def fetch_reverse_geocode(lat, lon):
+    params = {'lat': lat, 'lon': lon, 'limit': 1}
+    response = api_get(REVERSE_GEOCODE_URL, params)
+    response.raise_for_status()
+    return response.json()
+
+
+def _public_ip(value):
+    """공인 IP 주소 문자열이면 정규화해 반환하고, 사설/루프백 주소나 형식이 틀리면 None."""
+    value = (value or '').strip()
+    if value.startswith('['):
+        value = value[1:].split(']', 1)[0]  # [IPv6]:포트
+    elif value.count(':') == 1:
+        value = value.split(':', 1)[0]  # IPv4:포트
+    try:
+        address = ipaddress.ip_address(value)
+    except ValueError:
+        return None
+    return str(address) if address.is_global else None
+
+
+def client_ip_from_headers(headers, trusted_hops=1):
+    """요청 헤더에서 사용자(브라우저)의 공인 IP 주소를 찾습니다. 없으면 None.
+    프록시는 X-Forwarded-For의 오른쪽 끝에 받은 연결의 주소를 덧붙이므로,
+    사용자가 임의로 넣을 수 있는 왼쪽 값 대신 앞단 프록시 trusted_hops개가 붙인 주소 중
+    가장 바깥 것(오른쪽에서 trusted_hops번째)을 사용합니다. 그다음 X-Real-IP를 확인합니다."""
+    values = {str(name).lower(): value for name, value in (headers or {}).items()}
+    candidates = []
+    forwarded = values.get('x-forwarded-for')
+    if forwarded and trusted_hops > 0:
+        hops = [hop.strip() for hop in forwarded.split(',') if hop.strip()]
+        if hops:
+            candidates.append(hops[max(0, len(hops) - trusted_hops)])
+    candidates.append(values.get('x-real-ip'))
+    for candidate in candidates:
+        ip = _public_ip(candidate)
+        if ip:
+            return ip
+    return None
+
+
+class _IPLocationUnavailable(Exception):
+    """외부 IP 위치 서비스가 모두 위치를 주지 않음. transient: 일시적인 오류가 섞였는지."""
+
+    def __init__(self, transient):
+        super().__init__(transient)
+        self.transient = transient
+
+
+@ttl_cache(IP_LOCATION_TTL)
+def _remote_ip_location(ip):
+    """외부 IP 위치 서비스들에 차례로 묻습니다. 찾은 위치만 IP별로 캐시하고, 못 찾으면 예외를 던집니다."""
+    # 한 서비스라도 일시적인 오류였다면 '위치 없음'으로 기억하지 않음
+    transient = False
+    # 서비스 URL에 넣을 주소 경로 (없으면 요청을 보낸 서버의 IP로 조회됨)
+    ip_path = f"{ip}/" if ip else ""
+
+    # 방법 1: ipapi.co (가장 정확하지만 요청 제한 있음)
+    try:
+        response = get_http_session().get(f'https://ipapi.co/{ip_path}json/', timeout=5)
+        if response.status_code == 200:
+            data = response.json()
+
+            lat = data.get('latitude')
+            lon = data.get('longitude')
+            city = data.get('city', 'Unknown')
+            country = data.get('country_name', 'Unknown')
+
+            if lat and lon:
+                return {
+                    'lat': lat,
+                    'lon': lon,
+                    'city': city,
+                    'country': country,
+                    'ip': data.get('ip', 'Unknown'),
+                    'source': 'ipapi.co'
+                }
+        elif _is_transient_status(response.status_code):
+            transient = True
+    except Exception:
+        transient = True
+
+    # 방법 2: ip-api.com (무료, 요청 제한 느슨)
+    try:
+        response = get_http_session().get(f'http://ip-api.com/json/{ip or ""}?fields=status,message,country,city,lat,lon,query', timeout=5)
+        if response.status_code == 200:
+            data = response.json()
+
+            if data.get('status') == 'success':
+                return {
+                    'lat': data.get('lat'),
+                    'lon': data.get('lon'),
+                    'city': data.get('city', 'Unknown'),
+                    'country': data.get('country', 'Unknown'),
+                    'ip': data.get('query', 'Unknown'),
+                    'source': 'ip-api.com'
+                }
+        elif _is_transient_status(response.status_code):
+            transient = True
+    except Exception:
+        transient = True
+
+    # 방법 3: ipinfo.io (무료 티어)
+    try:
+        response = get_http_session().get(f'https://ipinfo.io/{ip_path}json', timeout=5)
+        if response.status_code == 200:
+            data = response.json()
+
+            loc = data.get('loc', '').split(',')
+            if len(loc) == 2:
+                return {
+                    'lat': float(loc[0]),
+                    'lon': float(loc[1]),
+                    'city': data.get('city', 'Unknown'),
+                    'country': data.get('country', 'Unknown'),
+                    'ip': data.get('ip', 'Unknown'),
+                    'source': 'ipinfo.io'
+                }
+        elif _is_transient_status(response.status_code):
+            transient = True
+    except Exception:
+        transient = True
+
+    raise _IPLocationUnavailable(transient)
+
+
+@traced()
+def get_location_by_ip(ip=None):
+    """IP 주소를 기반으로 현재 위치(위도, 경도)를 가져옵니다.
+    ip(사용자 브라우저의 주소)가 주어지면 로컬 IP 데이터베이스에서 네트워크 요청 없이 먼저 찾고,
+    없을 때만 외부 IP 위치 서비스에 그 주소를 물어봅니다. ip가 없으면 서버 자신의 공인 IP로 찾습니다 (로컬 실행).
+    여러 무료 IP 위치 서비스를 시도하여 가장 정확한 위치를 반환하며, 찾은 위치는 IP_LOCATION_TTL 동안 재사용합니다.
+    모든 서비스가 응답했지만 위치를 주지 않았으면 잠시 동안 다시 묻지 않습니다."""
+    if ip:
+        database = get_ip_database()
+        location = database.lookup(ip) if database else None
+        if location:
+            return dict(location, ip=ip, source=database.source)
+
+    misses = get_not_found_cache()
+    if misses.get(('ip', ip)) is not None:
+        return None
+    try:
+        return _remote_ip_location(ip)
+    except _IPLocationUnavailable as e:
+        if not e.transient:
+            misses.add(('ip', ip))
+        return None
+
+
+def ip_location_not_found_at(ip=None):
+    """IP 위치를 최근에 찾지 못했다면 그 시각을, 아니면 None을 반환합니다."""
+    return get_not_found_cache().get(('ip', ip))
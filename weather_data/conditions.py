@@ -0,0 +1,90 @@
+"""OpenWeather 날씨 상태 ID → 언어별 설명.
+
+upstream에는 언어 파라미터 없이 요청하고(설명은 영어, 캐시 항목은 하나),
+화면에 보여줄 설명은 이 표에서 상태 ID로 찾습니다.
+https://openweathermap.org/weather-conditions
+"""
+
+# 지원 언어 코드 → 표시 이름
+LANGUAGES = {
+    'ko': '한국어',
+    'en': 'English',
+    'ja': '日本語',
+}
+
+DEFAULT_LANGUAGE = 'ko'
+
+# 상태 ID → (한국어, 영어, 일본어) - LANGUAGES 순서
+_CONDITION_TEXT = {
+    200: ('뇌우와 약한 비', 'thunderstorm with light rain', '弱い雨を伴う雷雨'),
+    201: ('뇌우와 비', 'thunderstorm with rain', '雨を伴う雷雨'),
+    202: ('뇌우와 강한 비', 'thunderstorm with heavy rain', '強い雨を伴う雷雨'),
+    210: ('약한 뇌우', 'light thunderstorm', '弱い雷雨'),
+    211: ('뇌우', 'thunderstorm', '雷雨'),
+    212: ('강한 뇌우', 'heavy thunderstorm', '強い雷雨'),
+    221: ('불규칙한 뇌우', 'ragged thunderstorm', '不規則な雷雨'),
+    230: ('뇌우와 약한 이슬비', 'thunderstorm with light drizzle', '弱い霧雨を伴う雷雨'),
+    231: ('뇌우와 이슬비', 'thunderstorm with drizzle', '霧雨を伴う雷雨'),
+    232: ('뇌우와 강한 이슬비', 'thunderstorm with heavy drizzle', '強い霧雨を伴う雷雨'),
+    300: ('약한 이슬비', 'light intensity drizzle', '弱い霧雨'),
+    301: ('이슬비', 'drizzle', '霧雨'),
+    302: ('강한 이슬비', 'heavy intensity drizzle', '強い霧雨'),
+    310: ('약한 이슬비와 비', 'light intensity drizzle rain', '弱い霧雨と雨'),
+    311: ('이슬비와 비', 'drizzle rain', '霧雨と雨'),
+    312: ('강한 이슬비와 비', 'heavy intensity drizzle rain', '強い霧雨と雨'),
+    313: ('소나기와 이슬비', 'shower rain and drizzle', 'にわか雨と霧雨'),
+    314: ('강한 소나기와 이슬비', 'heavy shower rain and drizzle', '強いにわか雨と霧雨'),
+    321: ('소나기성 이슬비', 'shower drizzle', 'にわか霧雨'),
+    500: ('약한 비', 'light rain', '小雨'),
+    501: ('비', 'moderate rain', '雨'),
+    502: ('강한 비', 'heavy intensity rain', '強い雨'),
+    503: ('매우 강한 비', 'very heavy rain', '非常に強い雨'),
+    504: ('극심한 비', 'extreme rain', '猛烈な雨'),
+    511: ('어는 비', 'freezing rain', '着氷性の雨'),
+    520: ('약한 소나기', 'light intensity shower rain', '弱いにわか雨'),
+    521: ('소나기', 'shower rain', 'にわか雨'),
+    522: ('강한 소나기', 'heavy intensity shower rain', '強いにわか雨'),
+    531: ('불규칙한 소나기', 'ragged shower rain', '不規則なにわか雨'),
+    600: ('약한 눈', 'light snow', '小雪'),
+    601: ('눈', 'snow', '雪'),
+    602: ('폭설', 'heavy snow', '大雪'),
+    611: ('진눈깨비', 'sleet', 'みぞれ'),
+    612: ('약한 소나기성 진눈깨비', 'light shower sleet', '弱いにわかみぞれ'),
+    613: ('소나기성 진눈깨비', 'shower sleet', 'にわかみぞれ'),
+    615: ('약한 비와 눈', 'light rain and snow', '弱い雨と雪'),
+    616: ('비와 눈', 'rain and snow', '雨と雪'),
+    620: ('약한 소낙눈', 'light shower snow', '弱いにわか雪'),
+    621: ('소낙눈', 'shower snow', 'にわか雪'),
+    622: ('강한 소낙눈', 'heavy shower snow', '強いにわか雪'),
+    701: ('박무', 'mist', '靄'),
+    711: ('연기', 'smoke', '煙'),
+    721: ('연무', 'haze', 'もや'),
+    731: ('모래 먼지 회오리', 'sand/dust whirls', '砂塵旋風'),
+    741: ('안개', 'fog', '霧'),
+    751: ('모래', 'sand', '砂'),
+    761: ('먼지', 'dust', 'ほこり'),
+    762: ('화산재', 'volcanic ash', '火山灰'),
+    771: ('돌풍', 'squalls', 'スコール'),
+    781: ('토네이도', 'tornado', '竜巻'),
+    800: ('맑음', 'clear sky', '快晴'),
+    801: ('구름 조금', 'few clouds', '晴れ時々曇り'),
+    802: ('구름 약간', 'scattered clouds', '雲が散在'),
+    803: ('구름 많음', 'broken clouds', '曇りがち'),
+    804: ('흐림', 'overcast clouds', '曇り'),
+}
+
+_LANGUAGE_INDEX = {code: i for i, code in enumerate(LANGUAGES)}
+
+
+def condition_text(condition_id, lang=DEFAULT_LANGUAGE, default=''):
+    """상태 ID의 lang 설명. 표에 없는 ID나 언어면 default(보통 upstream 설명)를 반환합니다."""
+    try:
+        return _CONDITION_TEXT[int(condition_id)][_LANGUAGE_INDEX[lang]]
+    except (KeyError, TypeError, ValueError):
+        return default
+
+
+def weather_description(item, lang=DEFAULT_LANGUAGE):
+    """/weather 또는 /forecast 항목의 대표 날씨 설명 (lang)."""
+    condition = item['weather'][0]
+    return condition_text(condition.get('id'), lang, condition.get('description', ''))
@@ -0,0 +1,109 @@
+"""데이터 계층 설정.
+
+환경 변수(.env 포함)에서 읽으며, Streamlit 앱은 set_setting_source()로
+Secrets를 우선 조회하도록 등록합니다. 설정은 처음 사용할 때 한 번만 읽습니다.
+"""
+
+import os
+
+from .cache import NOT_FOUND_TTL, resource
+
+PACKAGE_DIR = os.path.dirname(os.path.abspath(__file__))
+ROOT_DIR = os.path.dirname(PACKAGE_DIR)
+
+_setting_source = None
+
+
+def set_setting_source(lookup):
+    """환경 변수보다 먼저 확인할 설정 조회 함수(name -> 값 또는 None)를 등록합니다."""
+    global _setting_source
+    _setting_source = lookup
+
+
+def get_setting(name, default=None):
+    """등록된 설정 원본을 우선 확인하고, 없으면 환경 변수에서 값을 읽습니다."""
+    value = _setting_source(name) if _setting_source else None
+    if value is None:
+        value = os.getenv(name, default)
+    return value
+
+
+def parse_api_keys(value, calls_per_minute, calls_per_day=0):
+    """OPENWEATHER_API_KEYS 값을 [(키, 분당 한도, 하루 한도), ...]로 바꿉니다.
+    쉼표로 구분한 '키[:분당 한도[:하루 한도]]' 문자열 또는 (Secrets의) 같은 형식 문자열 목록을 받으며,
+    한도를 생략하면 calls_per_minute, calls_per_day를 사용합니다.
+    하루 한도 0은 제한 없음이지만, 분당 한도는 1 이상이어야 하며 아니면 ValueError를 던집니다."""
+    if not value:
+        return []
+    entries = value.split(',') if isinstance(value, str) else value
+    keys = []
+    for entry in entries:
+        parts = [part.strip() for part in str(entry).split(':')]
+        if not parts[0]:
+            continue
+        per_minute = int(parts[1]) if len(parts) > 1 and parts[1] else calls_per_minute
+        if per_minute <= 0:
+            raise ValueError(f"API 키 {parts[0][:4]}…의 분당 호출 한도는 1 이상이어야 합니다: {per_minute}")
+        keys.append((
+            parts[0],
+            per_minute,
+            int(parts[2]) if len(parts) > 2 and parts[2] else calls_per_day
+        ))
+    return keys
+
+
+@resource
+def load_settings():
+    """.env 로드와 설정 조회를 프로세스당 한 번만 수행하고 결과를 공유합니다."""
+    # 환경 변수 로드 (로컬 개발용, python-dotenv가 없으면 건너뜀)
+    try:
+        from dotenv import load_dotenv
+        load_dotenv()
+    except ImportError:
+        pass
+
+    # 키별 기본 한도 (무료 플랜 분당 60회, 하루 한도는 0 = 제한 없음)
+    calls_per_minute = int(get_setting("OPENWEATHER_CALLS_PER_MINUTE", "60"))
+    calls_per_day = int(get_setting("OPENWEATHER_CALLS_PER_DAY", "0"))
+    # 여러 키를 쓰면 OPENWEATHER_API_KEYS, 아니면 OPENWEATHER_API_KEY 하나
+    api_keys = parse_api_keys(get_setting("OPENWEATHER_API_KEYS"), calls_per_minute, calls_per_day)
+    if not api_keys:
+        api_keys = parse_api_keys([get_setting("OPENWEATHER_API_KEY") or ''], calls_per_minute, calls_per_day)
+
+    return {
+        'api_key': api_keys[0][0] if api_keys else None,
+        'api_keys': api_keys,
+        # One Call 3.0 사용 여부 (별도 구독이 필요하므로 기본값은 사용 안 함)
+        'use_onecall': str(get_setting("OPENWEATHER_USE_ONECALL", "false")).lower() in ("1", "true", "yes", "on"),
+        # 키별 OpenWeather 호출 한도 기본값
+        'calls_per_minute': calls_per_minute,
+        'calls_per_day': calls_per_day,
+        # 요청 타임아웃 범위(초) - 최근 p95의 3배를 이 범위 안에서 사용
+        'timeout_min': float(get_setting("OPENWEATHER_TIMEOUT_MIN", "2")),
+        'timeout_max': float(get_setting("OPENWEATHER_TIMEOUT_MAX", "10")),
+        # 헤지 요청 비율 상한(%) - p95가 지나도 응답이 없을 때 같은 요청을 한 번 더 보냄 (0이면 사용 안 함)
+        'hedge_percent': float(get_setting("OPENWEATHER_HEDGE_PERCENT", "5")),
+        # 가까운 관측값으로 좌표 조회에 응답하는 조건 - 반경(km), 최대 나이(초), 보간에 쓸 지점 수(0/1이면 가장 가까운 값만)
+        'nearby_radius_km': float(get_setting("WEATHER_NEARBY_RADIUS_KM", "3")),
+        'nearby_max_age': int(get_setting("WEATHER_NEARBY_MAX_AGE", "600")),
+        'nearby_idw_k': int(get_setting("WEATHER_NEARBY_IDW_K", "0")),
+        # 찾지 못한 도시/좌표/위치를 다시 요청하지 않고 기억하는 시간 (초)
+        'not_found_ttl': int(get_setting("WEATHER_NOT_FOUND_TTL", str(NOT_FOUND_TTL))),
+        # 사용자 IP 위치 조회용 로컬 데이터베이스 (ip_database.py build로 만든 .bin 또는 .mmdb)
+        'ip_db_path': get_setting("WEATHER_IP_DB", os.path.join(ROOT_DIR, "data", "ipdb.bin")),
+        # 앱 앞단의 프록시 수 - X-Forwarded-For의 오른쪽에서 이 번째 주소를 사용자 IP로 사용 (0이면 무시)
+        'trusted_proxy_hops': int(get_setting("WEATHER_TRUSTED_PROXY_HOPS", "1")),
+        # 선행 조회(prefetch): 세션당 분당 최대 횟수, 사용자 요청을 위해 남겨 둘 호출 한도
+        'prefetch_per_minute': int(get_setting("WEATHER_PREFETCH_PER_MINUTE", "6")),
+        'prefetch_min_spare': int(get_setting("WEATHER_PREFETCH_MIN_SPARE", "2")),
+        # 실행 추적 - 기록할 실행 비율(0~1, 0이면 끔)과 JSONL 파일 경로
+        'trace_sample_rate': float(get_setting("WEATHER_TRACE_SAMPLE_RATE", "0.1")),
+        'trace_path': get_setting("WEATHER_TRACE_PATH", os.path.join(ROOT_DIR, "data", "traces.jsonl")),
+        # 과거 날씨 기록 저장소 설정 (앱이 가져온 현재 날씨 관측값을 로컬에 누적)
+        'history_dir': get_setting("WEATHER_HISTORY_DIR", os.path.join(ROOT_DIR, "data", "history")),
+        'history_retention_days': int(get_setting("WEATHER_HISTORY_RETENTION_DAYS", "365")),
+        'history_downsample_days': int(get_setting("WEATHER_HISTORY_DOWNSAMPLE_DAYS", "30")),
+        # 한국 도시 날씨 스냅샷 설정 (snapshot_job.py가 주기적으로 생성)
+        'snapshot_path': get_setting("WEATHER_SNAPSHOT_PATH", os.path.join(ROOT_DIR, "data", "snapshot.json.gz")),
+        'snapshot_max_age': int(get_setting("WEATHER_SNAPSHOT_MAX_AGE", "1800")),
+    }
@@ -0,0 +1,45 @@
+"""여러 조회를 동시에 시작하는 공유 실행기.
+
+한 위치의 현재 날씨, 예보, 대기질처럼 서로 독립적인 upstream 조회를 동시에 보내
+화면 전체의 대기 시간이 가장 느린 호출 하나로 정해지도록 합니다.
+같은 함수와 인자로 이미 진행 중인 조회가 있으면 새로 보내지 않고 그 결과를 함께 기다립니다
+(ttl_cache는 진행 중인 호출을 합치지 않으므로, 여러 화면이 동시에 같은 좌표를 열어도 호출은 한 번).
+
+작업은 제출한 쪽의 contextvars를 복사해 실행하므로 trace span이 호출한 단계 아래에 기록됩니다.
+"""
+
+import contextvars
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+from .cache import resource
+
+
+class FanOut:
+    def __init__(self, workers=8):
+        self._executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix='weather-fanout')
+        self._inflight = {}  # (함수, 인자) -> Future
+        self._lock = threading.Lock()
+
+    def submit(self, func, *args):
+        """func(*args)를 백그라운드에서 시작하고 Future를 반환합니다."""
+        key = (func, args)
+        with self._lock:
+            future = self._inflight.get(key)
+            if future is not None:
+                return future
+            future = self._executor.submit(contextvars.copy_context().run, func, *args)
+            self._inflight[key] = future
+        future.add_done_callback(lambda done: self._forget(key, done))
+        return future
+
+    def _forget(self, key, future):
+        with self._lock:
+            if self._inflight.get(key) is future:
+                del self._inflight[key]
+
+
+@resource
+def get_fanout():
+    """프로세스 전체가 공유하는 동시 조회 실행기."""
+    return FanOut()
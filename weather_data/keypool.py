@@ -0,0 +1,146 @@
+"""여러 OpenWeather API 키의 호출 한도 관리.
+
+키마다 분당 토큰 버킷과 하루 호출 수를 따로 두고, 요청마다 한도가 남은 키 중
+오늘 사용률이 가장 낮은 키를 골라 호출을 고르게 나눕니다.
+401(키 무효)이나 429(한도 초과)를 받은 키는 잠시 쉬게 하고 다른 키로 넘어갑니다.
+"""
+
+import threading
+import time
+
+from rate_limiter import RateLimiter
+
+SECONDS_PER_DAY = 86400
+
+# 거부 응답별로 키를 쉬게 하는 시간 (초)
+REJECT_COOLDOWN = {
+    401: 600,  # 키가 무효이거나 아직 활성화되지 않음
+    429: 60,   # 분당 한도 초과 - 다음 분까지
+}
+
+
+def mask_key(key):
+    """진단 화면에 보여줄 키 표시 (앞 4자리와 뒤 2자리만)."""
+    return f"{key[:4]}…{key[-2:]}" if len(key) > 8 else "…"
+
+
+class ApiKey:
+    """키 하나의 한도와 사용량."""
+
+    def __init__(self, key, calls_per_minute, calls_per_day=0):
+        self.key = key
+        self.label = mask_key(key)
+        self.limiter = RateLimiter(calls_per_minute)
+        self.calls_per_minute = calls_per_minute
+        self.calls_per_day = calls_per_day  # 0이면 하루 한도 없음
+        self.day = None
+        self.today = 0
+        self.requests = 0
+        self.rejected = {}  # 상태 코드 -> 횟수
+        self.cooldown_until = 0.0
+
+    def _roll_day(self, now):
+        day = int(now // SECONDS_PER_DAY)  # OpenWeather 사용량과 같은 UTC 날짜 기준
+        if day != self.day:
+            self.day = day
+            self.today = 0
+
+    def usage(self, now):
+        """키 선택 순서 (오늘 하루 한도 대비 사용률, 오늘 요청 수). 작을수록 먼저 사용합니다."""
+        self._roll_day(now)
+        return (self.today / self.calls_per_day if self.calls_per_day else 0.0, self.today)
+
+    def available(self, now):
+        self._roll_day(now)
+        if now < self.cooldown_until:
+            return False
+        return not self.calls_per_day or self.today < self.calls_per_day
+
+
+class KeyPool:
+    """API 키 목록에 호출을 나눠 보내는 스케줄러.
+
+    keys: [(키, 분당 한도, 하루 한도), ...]
+    """
+
+    def __init__(self, keys):
+        self.keys = [ApiKey(*entry) for entry in keys]
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        return len(self.keys)
+
+    def _candidates(self, now):
+        return sorted((key for key in self.keys if key.available(now)), key=lambda key: key.usage(now))
+
+    def try_acquire(self):
+        """지금 바로 보낼 수 있는 키를 예약해 반환합니다. 없으면 None."""
+        with self._lock:
+            now = time.time()
+            for key in self._candidates(now):
+                if key.limiter.try_acquire():
+                    key.today += 1
+                    key.requests += 1
+                    return key
+        return None
+
+    def acquire(self, timeout=None):
+        """한도가 남은 키를 얻을 때까지 기다립니다. timeout(초) 안에 얻지 못하면 None."""
+        started = time.monotonic()
+        while True:
+            key = self.try_acquire()
+            if key is not None:
+                return key
+            now = time.time()
+            with self._lock:
+                waits = [key.limiter.wait_time() for key in self.keys if key.available(now)]
+                # 모든 키가 쉬는 중이면 가장 먼저 돌아오는 키를 기다림 (하루 한도를 다 쓴 키는 제외)
+                waits += [key.cooldown_until - now for key in self.keys
+                          if now < key.cooldown_until and (not key.calls_per_day or key.today < key.calls_per_day)]
+            if not waits:
+                return None
+            wait = max(0.001, min(waits))
+            if timeout is not None and time.monotonic() - started + wait > timeout:
+                return None
+            time.sleep(wait)
+
+    def spare_calls(self):
+        """지금 기다리지 않고 보낼 수 있는 호출 수 (쉬는 키와 하루 한도를 다 쓴 키는 제외)."""
+        now = time.time()
+        with self._lock:
+            spare = 0
+            for key in self.keys:
+                if not key.available(now):
+                    continue
+                tokens = key.limiter.available()
+                if key.calls_per_day:
+                    tokens = min(tokens, key.calls_per_day - key.today)
+                spare += tokens
+            return spare
+
+    def report(self, key, status_code):
+        """키로 보낸 요청의 응답 상태를 기록합니다. 거부 응답이면 키를 잠시 쉬게 합니다."""
+        cooldown = REJECT_COOLDOWN.get(status_code)
+        if cooldown is None:
+            return
+        with self._lock:
+            key.rejected[status_code] = key.rejected.get(status_code, 0) + 1
+            key.cooldown_until = max(key.cooldown_until, time.time() + cooldown)
+
+    def stats(self):
+        """키별 한도, 오늘/누적 요청 수, 거부 횟수, 남은 휴식 시간을 반환합니다."""
+        now = time.time()
+        with self._lock:
+            rows = []
+            for key in self.keys:
+                key._roll_day(now)
+                rows.append({
+                    'key': key.label,
+                    'calls_per_minute': key.calls_per_minute,
+                    'calls_per_day': key.calls_per_day,
+                    'today': key.today,
+                    'requests': key.requests,
+                    'rejected': dict(key.rejected),
+                    'cooldown_s': max(0.0, key.cooldown_until - now),
+                })
+            return rows
@@ -0,0 +1,120 @@
+"""엔드포인트별 응답 시간 추적, 적응형 타임아웃, 헤지 요청 예산.
+
+최근 응답 시간의 p95로 타임아웃(p95 × timeout_factor, min~max 범위)과
+헤지 지연(p95가 지나도 응답이 없으면 같은 요청을 한 번 더 보냄)을 계산합니다.
+헤지는 최근 요청 중 hedge_percent% 이내로만 허용해 호출량이 크게 늘지 않도록 합니다.
+"""
+
+import math
+import threading
+from collections import deque
+from urllib.parse import urlsplit
+
+
+def endpoint_of(url):
+    """통계를 모으는 단위 (호스트 + 경로, 쿼리 제외)."""
+    parts = urlsplit(url)
+    return parts.netloc + parts.path
+
+
+def percentile(values, q):
+    """정렬하지 않은 값 목록의 q 분위수 (최근접 순위 방식)."""
+    ordered = sorted(values)
+    return ordered[max(0, math.ceil(q * len(ordered)) - 1)]
+
+
+class LatencyTracker:
+    """엔드포인트별 최근 응답 시간과 헤지 사용량을 기록합니다.
+
+    window: 엔드포인트마다 보관할 최근 표본 수
+    min_samples: 이보다 표본이 적으면 기본 타임아웃을 쓰고 헤지하지 않음
+    """
+
+    def __init__(self, default_timeout=10.0, min_timeout=2.0, max_timeout=10.0,
+                 timeout_factor=3.0, hedge_percent=5.0, window=200, min_samples=20):
+        self.default_timeout = default_timeout
+        self.min_timeout = min_timeout
+        self.max_timeout = max_timeout
+        self.timeout_factor = timeout_factor
+        self.hedge_percent = hedge_percent
+        self.window = window
+        self.min_samples = min_samples
+        self._lock = threading.Lock()
+        self._samples = {}  # endpoint -> deque[초]
+        self._hedged = deque(maxlen=window)  # 최근 완료된 요청별 헤지 여부
+        self._inflight_hedges = 0
+        self._counts = {}  # endpoint -> {'requests', 'timeouts', 'hedges', 'hedge_wins'}
+
+    def _count(self, endpoint, key):
+        counts = self._counts.setdefault(endpoint, {'requests': 0, 'timeouts': 0, 'hedges': 0, 'hedge_wins': 0})
+        counts[key] += 1
+
+    def record(self, endpoint, seconds, timed_out=False):
+        """응답 시간을 기록합니다. 시간 초과는 타임아웃 값 그대로 기록해 p95가 올라가도록 합니다."""
+        with self._lock:
+            self._samples.setdefault(endpoint, deque(maxlen=self.window)).append(seconds)
+            self._count(endpoint, 'requests')
+            if timed_out:
+                self._count(endpoint, 'timeouts')
+
+    def p95(self, endpoint):
+        with self._lock:
+            samples = list(self._samples.get(endpoint, ()))
+        if len(samples) < self.min_samples:
+            return None
+        return percentile(samples, 0.95)
+
+    def timeout(self, endpoint):
+        """최근 p95에 비례하는 타임아웃(초). 표본이 부족하면 기본값."""
+        p95 = self.p95(endpoint)
+        if p95 is None:
+            return self.default_timeout
+        return min(self.max_timeout, max(self.min_timeout, p95 * self.timeout_factor))
+
+    def hedge_delay(self, endpoint):
+        """헤지 요청을 보내기까지 기다릴 시간(초). 헤지를 하지 않으면 None."""
+        if self.hedge_percent <= 0:
+            return None
+        return self.p95(endpoint)
+
+    def allow_hedge(self, endpoint, acquire=None):
+        """최근 요청 대비 헤지 비율이 hedge_percent% 미만이면 헤지 한 번을 예약하고 True를 반환합니다.
+        acquire가 있으면 예산 안일 때만 호출해 (호출 한도 토큰 등) 실패하면 헤지하지 않습니다.
+        True를 받은 호출자는 요청이 끝난 뒤 note_request(hedged=True)를 호출해야 합니다."""
+        with self._lock:
+            if len(self._hedged) < self.min_samples:
+                return False
+            if sum(self._hedged) + self._inflight_hedges >= len(self._hedged) * self.hedge_percent / 100:
+                return False
+            if acquire is not None and not acquire():
+                return False
+            self._inflight_hedges += 1
+            self._count(endpoint, 'hedges')
+            return True
+
+    def note_request(self, hedged=False):
+        """요청 하나가 끝났음을 기록합니다 (헤지 비율 계산용)."""
+        with self._lock:
+            self._hedged.append(hedged)
+            if hedged:
+                self._inflight_hedges -= 1
+
+    def note_hedge_win(self, endpoint):
+        with self._lock:
+            self._count(endpoint, 'hedge_wins')
+
+    def stats(self):
+        """엔드포인트별 표본 수, p50/p95(ms), 현재 타임아웃, 요청/시간 초과/헤지 횟수를 반환합니다."""
+        with self._lock:
+            snapshot = {endpoint: list(samples) for endpoint, samples in self._samples.items()}
+            counts = {endpoint: dict(values) for endpoint, values in self._counts.items()}
+        rows = {}
+        for endpoint, samples in snapshot.items():
+            rows[endpoint] = dict(
+                counts.get(endpoint, {}),
+                samples=len(samples),
+                p50_ms=percentile(samples, 0.5) * 1000,
+                p95_ms=percentile(samples, 0.95) * 1000,
+                timeout_s=self.timeout(endpoint)
+            )
+        return rows
@@ -0,0 +1,130 @@
+"""체감 지표 계산 (열지수, 풍속냉각, 이슬점, 체감온도, 쾌적도).
+
+기온(°C), 습도(%), 풍속(m/s) 배열을 받아 NumPy로 한 번에 계산하므로
+현재 날씨 한 건, 40개 예보 항목, 수백 개 도시를 같은 함수로 처리합니다.
+
+- 열지수: 미국 기상청(NWS) Rothfusz 회귀식과 보정항 (27°C 이상에서 사용)
+- 풍속냉각: 캐나다/미국 기상청 공식 (10°C 이하, 풍속 4.8km/h 초과에서 사용)
+- 이슬점: Magnus 공식
+- 쾌적도: 체감온도 구간 (33°C 이상은 폭염특보 기준과 같은 '매우 더움'),
+  이슬점 21°C 이상이면서 쾌적~따뜻한 구간은 '후텁지근'
+"""
+
+import numpy as np
+
+# 쾌적도 코드 → (이름, 이모지)
+COMFORT_CLASSES = (
+    ('매우 추움', '🥶'),
+    ('추움', '😰'),
+    ('쾌적', '😊'),
+    ('따뜻함', '🙂'),
+    ('더움', '🥵'),
+    ('매우 더움', '🔥'),
+    ('후텁지근', '😓'),
+)
+# 체감온도 구간 경계 (°C) - COMFORT_CLASSES 앞 6개와 순서가 같음
+COMFORT_BOUNDS = (0.0, 10.0, 20.0, 28.0, 33.0)
+MUGGY = 6
+MUGGY_DEW_POINT = 21.0
+
+HEAT_INDEX_MIN_TEMP = 26.7  # 80°F
+WIND_CHILL_MAX_TEMP = 10.0
+WIND_CHILL_MIN_WIND_KMH = 4.8
+
+
+def _array(values):
+    return np.atleast_1d(np.asarray(values, dtype=float))
+
+
+def dew_point(temp, humidity):
+    """이슬점(°C)."""
+    temp, humidity = _array(temp), np.clip(_array(humidity), 1.0, 100.0)
+    a, b = 17.62, 243.12
+    gamma = np.log(humidity / 100.0) + a * temp / (b + temp)
+    return b * gamma / (a - gamma)
+
+
+def heat_index(temp, humidity):
+    """열지수(°C). 덥지 않은 구간은 NWS의 단순식 값을 그대로 사용합니다."""
+    temp, humidity = _array(temp), _array(humidity)
+    t = temp * 9 / 5 + 32
+    rh = humidity
+    simple = 0.5 * (t + 61.0 + (t - 68.0) * 1.2 + rh * 0.094)
+    full = (-42.379 + 2.04901523 * t + 10.14333127 * rh - 0.22475541 * t * rh
+            - 0.00683783 * t * t - 0.05481717 * rh * rh + 0.00122874 * t * t * rh
+            + 0.00085282 * t * rh * rh - 0.00000199 * t * t * rh * rh)
+    # 건조할 때와 매우 습할 때의 보정
+    dry = (rh < 13) & (t >= 80) & (t <= 112)
+    full = np.where(dry, full - (13 - rh) / 4 * np.sqrt(np.clip(17 - np.abs(t - 95), 0, None) / 17), full)
+    humid = (rh > 85) & (t >= 80) & (t <= 87)
+    full = np.where(humid, full + (rh - 85) / 10 * (87 - t) / 5, full)
+    result = np.where((simple + t) / 2 >= 80, full, simple)
+    return (result - 32) * 5 / 9
+
+
+def wind_chill(temp, wind_speed):
+    """풍속냉각 체감온도(°C). 공식이 적용되지 않는 조건에서는 기온을 그대로 반환합니다."""
+    temp, wind_kmh = _array(temp), _array(wind_speed) * 3.6
+    v = np.power(np.clip(wind_kmh, 0, None), 0.16)
+    chill = 13.12 + 0.6215 * temp - 11.37 * v + 0.3965 * temp * v
+    applies = (temp <= WIND_CHILL_MAX_TEMP) & (wind_kmh > WIND_CHILL_MIN_WIND_KMH)
+    return np.where(applies, chill, temp)
+
+
+def comfort_codes(apparent, dew):
+    """체감온도와 이슬점으로 쾌적도 코드(COMFORT_CLASSES 인덱스) 배열을 만듭니다."""
+    codes = np.digitize(apparent, COMFORT_BOUNDS)
+    muggy = (codes >= 2) & (codes <= 3) & (dew >= MUGGY_DEW_POINT)
+    return np.where(muggy, MUGGY, codes)
+
+
+def derived_metrics(temp, humidity, wind_speed):
+    """기온(°C), 습도(%), 풍속(m/s) 배열(또는 값)로 체감 지표 배열을 계산합니다.
+
+    반환: {'dew_point', 'heat_index', 'wind_chill', 'apparent', 'comfort'} - 입력과 같은 길이의 배열
+    """
+    temp = _array(temp)
+    humidity = _array(humidity)
+    wind_speed = _array(wind_speed)
+    dew = dew_point(temp, humidity)
+    heat = heat_index(temp, humidity)
+    chill = wind_chill(temp, wind_speed)
+    # 더울 때는 열지수, 추울 때는 풍속냉각, 그 사이는 기온
+    apparent = np.where(temp >= HEAT_INDEX_MIN_TEMP, np.maximum(heat, temp), chill)
+    return {
+        'dew_point': dew,
+        'heat_index': heat,
+        'wind_chill': chill,
+        'apparent': apparent,
+        'comfort': comfort_codes(apparent, dew),
+    }
+
+
+def items_metrics(items):
+    """/weather 또는 /forecast 항목 형태 목록의 체감 지표 배열을 한 번에 계산합니다."""
+    count = len(items)
+    temp = np.fromiter((item['main']['temp'] for item in items), float, count)
+    humidity = np.fromiter((item['main'].get('humidity', 50) for item in items), float, count)
+    wind = np.fromiter(((item.get('wind') or {}).get('speed', 0) for item in items), float, count)
+    return derived_metrics(temp, humidity, wind)
+
+
+def observation_metrics(weather_data):
+    """현재 날씨 한 건의 체감 지표 {'dew_point', ..., 'comfort'} (Python 숫자)."""
+    return {name: values[0].item() for name, values in items_metrics([weather_data]).items()}
+
+
+def forecast_metrics(forecast_data, section='list'):
+    """예보 응답의 section('list' 또는 'daily') 항목 순서대로 체감 지표 배열을 반환합니다.
+    forecast_time_index()처럼 처음 한 번만 계산해 응답 dict에 붙여 둡니다."""
+    cache_key = f'_metrics_{section}'
+    metrics = forecast_data.get(cache_key)
+    if metrics is None:
+        metrics = items_metrics(forecast_data.get(section) or [])
+        forecast_data[cache_key] = metrics
+    return metrics
+
+
+def comfort_label(code):
+    """쾌적도 코드 → (이름, 이모지)."""
+    return COMFORT_CLASSES[int(code)]
@@ -0,0 +1,98 @@
+"""응답 형태 변환.
+
+앱과 다른 소비자는 모두 /weather, /forecast 응답 형태(dict)를 기준으로 사용하므로,
+One Call 3.0 응답은 여기서 같은 형태로 바꿉니다.
+"""
+
+
+def round_coord(value, digits=4):
+    """같은 위치가 같은 캐시 키를 쓰도록 좌표를 반올림합니다 (소수점 4자리 ≈ 11m)."""
+    return round(float(value), digits)
+
+
+def onecall_to_weather(data, lat, lon, name, country):
+    """One Call 응답을 /weather 응답과 같은 형태로 변환합니다."""
+    current = data['current']
+    today = (data.get('daily') or [{}])[0].get('temp', {})
+    return {
+        # 같은 좌표로 예보를 요청해 캐시를 재사용하도록 요청 좌표를 그대로 사용
+        'coord': {'lat': lat, 'lon': lon},
+        'weather': current['weather'],
+        'main': {
+            'temp': current['temp'],
+            'feels_like': current['feels_like'],
+            'temp_min': today.get('min', current['temp']),
+            'temp_max': today.get('max', current['temp']),
+            'humidity': current['humidity'],
+            'pressure': current['pressure']
+        },
+        'wind': {'speed': current.get('wind_speed', 0)},
+        'uvi': current.get('uvi'),
+        'dt': current['dt'],
+        'sys': {
+            'country': country,
+            # 극지방에서는 일출/일몰 값이 없을 수 있음
+            'sunrise': current.get('sunrise', current['dt']),
+            'sunset': current.get('sunset', current['dt'])
+        },
+        'timezone': data.get('timezone_offset', 0),
+        'name': name,
+        'cod': 200,
+        'fetched_at': data.get('fetched_at')
+    }
+
+
+def onecall_to_forecast(data):
+    """One Call 응답을 /forecast 응답과 같은 형태로 변환합니다.
+    'list'에는 1시간 간격 예보가, 'daily'에는 최대 8일치 일별 예보가 들어갑니다."""
+    hourly = [{
+        'dt': item['dt'],
+        'main': {
+            'temp': item['temp'],
+            'feels_like': item['feels_like'],
+            'temp_min': item['temp'],
+            'temp_max': item['temp'],
+            'humidity': item['humidity']
+        },
+        'wind': {'speed': item.get('wind_speed', 0)},
+        'weather': item['weather'],
+        'pop': item.get('pop', 0)
+    } for item in data.get('hourly', [])]
+
+    daily = [{
+        'dt': item['dt'],
+        'main': {
+            'temp': item['temp']['day'],
+            'feels_like': item['feels_like']['day'],
+            'temp_min': item['temp']['min'],
+            'temp_max': item['temp']['max'],
+            'humidity': item['humidity']
+        },
+        'wind': {'speed': item.get('wind_speed', 0)},
+        'weather': item['weather'],
+        'pop': item.get('pop', 0)
+    } for item in data.get('daily', [])]
+
+    return {
+        'list': hourly,
+        'daily': daily,
+        'interval_hours': 1,
+        'city': {'timezone': data.get('timezone_offset', 0)},
+        'fetched_at': data.get('fetched_at')
+    }
+
+
+def air_pollution_to_compact(data):
+    """/air_pollution 응답을 화면에 쓰는 값만 남긴 작은 dict로 줄입니다.
+    {'aqi': 1~5, 'pm2_5', 'pm10': ㎍/㎥, 'dt'} - 측정값이 없으면 None."""
+    entries = data.get('list') or []
+    if not entries:
+        return None
+    entry = entries[0]
+    components = entry.get('components', {})
+    return {
+        'aqi': entry.get('main', {}).get('aqi'),
+        'pm2_5': components.get('pm2_5'),
+        'pm10': components.get('pm10'),
+        'dt': entry.get('dt'),
+    }
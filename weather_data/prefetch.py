@@ -0,0 +1,137 @@
+"""선행 조회 (speculative prefetch).
+
+사용자가 곧 요청할 가능성이 높은 위치(자동완성 첫 후보)의
+현재 날씨와 예보를 백그라운드에서 미리 가져와 공유 캐시를 데워 둡니다.
+바로 다음 실행에서 쓰일 조회(GPS/IP 버튼 등)는 미리 시작해도 기다리는 시간이 줄지 않으므로 대상이 아닙니다.
+미리 가져온 값은 일반 조회와 같은 캐시(ttl_cache)에 들어가므로, 실제 요청은 그대로 같은 함수를 호출하면 됩니다.
+
+- 모든 호출은 api_get을 거치므로 키별 호출 한도를 지키며, 남은 한도가 min_spare 이하이면 선행 조회를 하지 않습니다
+- 세션마다 분당 per_minute회까지만 선행 조회합니다
+- 실제 요청이 아직 진행 중인 선행 조회를 만나면 끝날 때까지 기다린 뒤 캐시에서 받습니다 (같은 호출을 두 번 보내지 않음)
+- 캐시 유지 시간(CACHE_TTL) 안에 쓰이지 않은 선행 조회와 그 호출 수는 낭비로 집계합니다
+"""
+
+import threading
+import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor, wait
+
+from . import client, service
+from .cache import CACHE_TTL, resource
+from .config import load_settings
+from .sources import get_korean_cities
+
+PREFETCH_WINDOW = 60  # 세션별 한도를 세는 구간 (초)
+
+
+def city_key(city):
+    """도시 선행 조회의 키. 한글/영문 등 같은 upstream 이름으로 조회되는 입력은 같은 키가 됩니다
+    (get_weather가 찾지 못한 이름을 기억할 때와 같은 정규화)."""
+    return ('city', get_korean_cities().get(city, city).strip().lower())
+
+
+def _wait_all(pending):
+    for future in pending.values():
+        future.result()
+
+
+def prefetch_city(city):
+    """도시 이름의 현재 날씨와 (좌표를 알게 되면) 예보, 대기질을 캐시에 채웁니다."""
+    weather_data = service.get_weather(city)
+    if weather_data and weather_data.get('coord'):
+        _wait_all(service.start_location_fetch(weather_data['coord']['lat'], weather_data['coord']['lon']))
+
+
+class Prefetcher:
+    """선행 조회 작업 실행과 적중/낭비 집계.
+
+    per_minute: 세션마다 PREFETCH_WINDOW초 동안 시작할 수 있는 선행 조회 수
+    min_spare: spare_calls()가 이 값 이하이면 선행 조회를 건너뜀 (사용자 요청 몫)
+    spare_calls: 지금 기다리지 않고 보낼 수 있는 호출 수를 반환하는 함수
+    ttl: 이 시간 안에 쓰이지 않은 선행 조회는 낭비로 집계
+    """
+
+    def __init__(self, per_minute=6, min_spare=2, spare_calls=None, ttl=CACHE_TTL, workers=2):
+        self.per_minute = per_minute
+        self.min_spare = min_spare
+        self.spare_calls = spare_calls
+        self.ttl = ttl
+        self._executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix='weather-prefetch')
+        self._pending = {}   # 키 -> {'future', 'submitted', 'calls'}
+        self._sessions = {}  # 세션 ID -> 최근 시작 시각 deque
+        self._counts = dict.fromkeys(('submitted', 'hits', 'wasted', 'wasted_calls', 'calls', 'skipped'), 0)
+        self._lock = threading.Lock()
+
+    def _expire(self, now):
+        for key, entry in list(self._pending.items()):
+            if now - entry['submitted'] > self.ttl:
+                del self._pending[key]
+                self._counts['wasted'] += 1
+                self._counts['wasted_calls'] += entry['calls'] or 0
+        for session_id, started in list(self._sessions.items()):
+            while started and now - started[0] > PREFETCH_WINDOW:
+                started.popleft()
+            if not started:
+                del self._sessions[session_id]
+
+    def submit(self, session_id, key, task, *args):
+        """key로 식별되는 선행 조회 task(*args)를 백그라운드에서 시작합니다.
+        이미 진행 중이거나 한도에 걸리면 시작하지 않고 False를 반환합니다."""
+        now = time.monotonic()
+        with self._lock:
+            self._expire(now)
+            if key in self._pending:
+                return False
+            started = self._sessions.setdefault(session_id, deque())
+            if len(started) >= self.per_minute or (
+                    self.spare_calls is not None and self.spare_calls() <= self.min_spare):
+                self._counts['skipped'] += 1
+                return False
+            started.append(now)
+            entry = {'submitted': now, 'calls': None}
+            self._pending[key] = entry
+            self._counts['submitted'] += 1
+            entry['future'] = self._executor.submit(self._run, entry, task, args)
+        return True
+
+    def _run(self, entry, task, args):
+        with client.count_api_calls() as calls:
+            try:
+                task(*args)
+            finally:
+                with self._lock:
+                    entry['calls'] = calls[0]
+                    self._counts['calls'] += calls[0]
+
+    def claim(self, key, timeout=10.0):
+        """사용자가 key를 실제로 요청할 때 호출합니다. 선행 조회가 있었으면 끝날 때까지(최대 timeout초)
+        기다린 뒤 True를 반환합니다. 이후 일반 조회 함수는 데워진 캐시에서 응답합니다."""
+        with self._lock:
+            self._expire(time.monotonic())
+            entry = self._pending.pop(key, None)
+            if entry is None:
+                return False
+            self._counts['hits'] += 1
+        wait([entry['future']], timeout=timeout)
+        return True
+
+    def stats(self):
+        """시작한 선행 조회 수, 적중(실제 요청으로 쓰임)과 낭비(쓰이지 않고 만료) 수, 낭비된 호출 수,
+        한도로 건너뛴 수, 아직 결과를 기다리는 수, 적중률(적중 / (적중 + 낭비))."""
+        with self._lock:
+            self._expire(time.monotonic())
+            stats = dict(self._counts, pending=len(self._pending))
+        settled = stats['hits'] + stats['wasted']
+        stats['hit_rate'] = stats['hits'] / settled if settled else 0.0
+        return stats
+
+
+@resource
+def get_prefetcher():
+    """프로세스 전체가 공유하는 선행 조회 실행기."""
+    settings = load_settings()
+    return Prefetcher(
+        per_minute=settings['prefetch_per_minute'],
+        min_spare=settings['prefetch_min_spare'],
+        spare_calls=client.get_key_pool().spare_calls
+    )
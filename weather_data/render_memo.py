@@ -0,0 +1,75 @@
+"""화면 섹션 마크업 메모이제이션.
+
+Streamlit은 위젯 하나만 바뀌어도 스크립트 전체를 다시 실행하므로, 같은 날씨 데이터로
+헤더/상세/일출·일몰/예보 카드 HTML을 매번 새로 만들게 됩니다.
+섹션마다 입력 데이터와 표시 옵션의 해시를 키로 만들어 둔 마크업을 재사용하고,
+입력이 바뀐 섹션만 다시 만듭니다. 요소를 화면에 내보내는 일(st.markdown 등)은 매번 그대로 합니다.
+"""
+
+import hashlib
+import json
+import threading
+from collections import OrderedDict
+
+from .cache import resource
+from .tracing import annotate
+
+DEFAULT_MAX_ENTRIES = 256
+
+
+def _skip_derived(value):
+    # 응답 dict에 붙여 둔 파생 데이터(_time_index_*, _metrics_* 등)는 원본에서 계산되므로 키에서 제외
+    if isinstance(value, dict):
+        return {key: item for key, item in value.items() if not (isinstance(key, str) and key.startswith('_'))}
+    return value
+
+
+def payload_digest(*parts):
+    """입력 데이터와 옵션의 내용 해시 (dict 키 순서와 관계없이 같은 내용이면 같은 값)."""
+    encoded = json.dumps([_skip_derived(part) for part in parts], sort_keys=True,
+                         ensure_ascii=False, separators=(',', ':'), default=str)
+    return hashlib.blake2b(encoded.encode('utf-8'), digest_size=16).hexdigest()
+
+
+class RenderMemo:
+    """섹션 이름 + 입력 해시 → 만들어 둔 마크업 (최근 사용 순으로 max_entries개까지)."""
+
+    def __init__(self, max_entries=DEFAULT_MAX_ENTRIES):
+        self.max_entries = max_entries
+        self._entries = OrderedDict()
+        self._counts = {}  # 섹션 -> [적중, 미적중]
+        self._lock = threading.Lock()
+
+    def get(self, section, build, *parts):
+        """parts가 같으면 이전에 build(*parts)로 만든 결과를, 아니면 새로 만들어 반환합니다.
+        결과는 여러 세션이 공유하므로 변경하지 말아야 합니다."""
+        key = (section, payload_digest(*parts))
+        with self._lock:
+            counts = self._counts.setdefault(section, [0, 0])
+            if key in self._entries:
+                self._entries.move_to_end(key)
+                counts[0] += 1
+                annotate(**{f'render.{section}': 'hit'})
+                return self._entries[key]
+            counts[1] += 1
+        annotate(**{f'render.{section}': 'miss'})
+        value = build(*parts)
+        with self._lock:
+            self._entries[key] = value
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+        return value
+
+    def stats(self):
+        """섹션별 {'hits', 'misses', 'hit_rate'}."""
+        with self._lock:
+            return {
+                section: {'hits': hits, 'misses': misses, 'hit_rate': hits / (hits + misses)}
+                for section, (hits, misses) in self._counts.items()
+            }
+
+
+@resource
+def get_render_memo():
+    """프로세스 전체가 공유하는 섹션 마크업 메모 (세션이 달라도 같은 데이터면 재사용)."""
+    return RenderMemo()
@@ -0,0 +1,205 @@
+"""날씨 조회 진입점.
+
+스냅샷 → One Call → 기존 /weather, /forecast 순서로 가장 싼 원본부터 시도하며,
+실패하면 예외 대신 None을 반환합니다. 반환값은 캐시와 공유되므로 수정하지 마세요.
+"""
+
+import requests
+
+from . import client
+from .fanout import get_fanout
+from .models import onecall_to_forecast, onecall_to_weather, round_coord
+from .sources import get_korean_cities, get_nearby_index, get_snapshot, record_observation
+from .tracing import annotate, traced
+
+
+def get_onecall_data(lat, lon, bucket=None):
+    """현재/시간별/일별 날씨를 One Call 3.0 한 번의 요청으로 가져옵니다.
+    같은 좌표의 현재 날씨와 예보는 캐시된 같은 응답을 공유합니다."""
+    if not client.onecall_enabled():
+        return None
+
+    try:
+        return client.fetch_onecall(round_coord(lat), round_coord(lon), bucket)
+    except requests.exceptions.HTTPError as e:
+        # 키에 One Call 권한이 없으면 이후 요청은 기존 방식(/weather + /forecast)으로 처리
+        if e.response is not None and e.response.status_code in (401, 403):
+            client.disable_onecall()
+        return None
+    except requests.exceptions.RequestException:
+        return None
+
+
+def _place_from_geocode(results):
+    """Geocoding API 응답에서 이름(한글 우선), 국가, 좌표를 꺼냅니다."""
+    if not results:
+        return None
+    place = results[0]
+    return {
+        'name': place.get('local_names', {}).get('ko') or place.get('name', 'Unknown'),
+        'country': place.get('country', ''),
+        'lat': place['lat'],
+        'lon': place['lon']
+    }
+
+
+def geocode_city(query):
+    """도시 이름을 좌표로 변환합니다 (하루 동안 캐시)."""
+    try:
+        return _place_from_geocode(client.fetch_geocode(query))
+    except requests.exceptions.RequestException:
+        return None
+
+
+def get_place_name(lat, lon):
+    """좌표의 지명을 찾습니다. 약 1km 단위로 묶어 하루 동안 캐시합니다."""
+    try:
+        return _place_from_geocode(client.fetch_reverse_geocode(round_coord(lat, 2), round_coord(lon, 2)))
+    except requests.exceptions.RequestException:
+        return None
+
+
+def city_not_found_at(city):
+    """도시를 최근에 찾지 못했다면(404) 그 시각을, 아니면 None을 반환합니다."""
+    english_city = get_korean_cities().get(city, city)
+    return client.get_not_found_cache().get(('city', english_city.strip().lower()))
+
+
+@traced()
+def get_weather_by_coords(lat, lon, name=None, country=None, bucket=None):
+    """위도와 경도로 날씨 정보를 가져옵니다.
+    같은 좌표(소수점 4자리)는 10분 동안 캐시된 결과를 공유하며,
+    One Call 모드에서는 예보와 같은 요청을 공유하므로 추가 호출이 발생하지 않습니다.
+    근처(WEATHER_NEARBY_RADIUS_KM 안)에 충분히 최신인 관측값이 있으면 upstream 대신 그 값으로 응답하며,
+    이때 결과의 'nearby'에 출처 지점과 거리가 들어갑니다. 라이브 모드(bucket 지정)는 항상 새로 조회합니다."""
+    if bucket is None:
+        nearby = get_nearby_index().lookup(lat, lon, name, country)
+        if nearby:
+            annotate(source='nearby')
+            return nearby
+
+    if client.onecall_enabled():
+        lat, lon = round_coord(lat), round_coord(lon)
+        data = get_onecall_data(lat, lon, bucket)
+        if data and data.get('current'):
+            if name is None:
+                place = get_place_name(lat, lon) or {}
+                name = place.get('name', 'Unknown')
+                country = place.get('country', '')
+            weather_data = onecall_to_weather(data, lat, lon, name, country or '')
+            record_observation(weather_data)
+            annotate(source='onecall')
+            return weather_data
+
+    lat, lon = round_coord(lat), round_coord(lon)
+    misses = client.get_not_found_cache()
+    if misses.get(('coords', lat, lon)) is not None:
+        annotate(source='not_found_cache')
+        return None
+    annotate(source='api')
+    try:
+        return client.fetch_weather_by_coords(lat, lon, bucket)
+    except requests.exceptions.RequestException as e:
+        if client.is_not_found(e):
+            misses.add(('coords', lat, lon))
+        return None
+
+
+@traced()
+def get_forecast_data(lat, lon, bucket=None):
+    """위도와 경도로 날씨 예보를 가져옵니다.
+    기본은 5일간 3시간 간격이며, One Call 모드에서는 48시간 1시간 간격과 일별 예보를 함께 반환합니다.
+    같은 좌표는 10분 동안(라이브 모드에서는 같은 갱신 구간 동안) 캐시된 결과를 공유합니다.
+    라이브 모드(bucket 지정)는 최대 snapshot_max_age만큼 오래된 스냅샷을 쓰지 않고 항상 새로 조회합니다."""
+    # 스냅샷에 있는 한국 도시 좌표는 네트워크 호출 없이 응답
+    snapshot = get_snapshot() if bucket is None else None
+    if snapshot:
+        forecast_data = snapshot.forecast(lat, lon)
+        if forecast_data:
+            annotate(source='snapshot')
+            return forecast_data
+
+    if client.onecall_enabled():
+        data = get_onecall_data(lat, lon, bucket)
+        if data:
+            annotate(source='onecall')
+            return onecall_to_forecast(data)
+
+    annotate(source='api')
+    try:
+        return client.fetch_forecast(round_coord(lat), round_coord(lon), bucket)
+    except requests.exceptions.RequestException:
+        return None
+
+
+@traced()
+def get_weather(city):
+    """도시 이름으로 날씨 정보를 가져옵니다."""
+    # 한글 도시명을 영문으로 변환
+    korean_cities = get_korean_cities()
+    english_city = korean_cities.get(city, city)
+
+    # 최근에 찾지 못한 이름(오타 등)은 upstream에 다시 묻지 않음
+    misses = client.get_not_found_cache()
+    miss_key = ('city', english_city.strip().lower())
+    if misses.get(miss_key) is not None:
+        annotate(source='not_found_cache')
+        return None
+
+    # 한국 도시는 미리 계산된 스냅샷에서 바로 응답 (네트워크 호출 없음)
+    if city in korean_cities:
+        snapshot = get_snapshot()
+        if snapshot:
+            weather_data = snapshot.current(english_city)
+            if weather_data:
+                weather_data['snapshot_version'] = snapshot.version
+                annotate(source='snapshot')
+                return weather_data
+
+    # One Call 모드: 캐시된 지오코딩 + One Call 한 번으로 현재 날씨와 예보를 함께 확보
+    if client.onecall_enabled():
+        place = geocode_city(english_city)
+        if place:
+            weather_data = get_weather_by_coords(place['lat'], place['lon'], place['name'], place['country'])
+            if weather_data:
+                return weather_data
+
+    annotate(source='api')
+    try:
+        return client.fetch_weather_by_name(english_city)
+    except requests.exceptions.RequestException as e:
+        # 404만 '없음'으로 기억하고, 시간 초과나 5xx는 다음 요청에서 다시 시도
+        if client.is_not_found(e):
+            misses.add(miss_key)
+        return None
+
+
+@traced()
+def get_air_quality(lat, lon):
+    """좌표의 현재 대기질 {'aqi', 'pm2_5', 'pm10', 'dt', 'fetched_at'}을 가져옵니다.
+    대기질은 공간 변화가 완만하므로 약 1km(소수점 2자리) 단위로 묶어 한 시간 동안 캐시합니다."""
+    try:
+        return client.fetch_air_pollution(round_coord(lat, 2), round_coord(lon, 2))
+    except requests.exceptions.RequestException:
+        return None
+
+
+def start_location_fetch(lat, lon, bucket=None, weather=False, forecast=True, air=True):
+    """좌표의 예보와 대기질(weather=True이면 현재 날씨도) 조회를 동시에 시작합니다.
+    forecast/air가 False이면 그 조회는 시작하지 않습니다 (결과에도 키가 없음).
+
+    반환: {'forecast': Future, 'air': Future[, 'weather': Future]} - 각 결과는 get_* 함수의 반환값과 같습니다.
+    이미 같은 조회가 진행 중이면 그 Future를 함께 기다리므로 호출이 겹치지 않습니다.
+    좌표는 각 조회의 캐시 키와 같은 자릿수로 반올림해 넘기므로, 입력 좌표(GPS 등)로 시작한 조회와
+    응답의 좌표로 다시 시작한 조회가 같은 작업으로 합쳐집니다.
+    """
+    fanout = get_fanout()
+    lat, lon = round_coord(lat), round_coord(lon)
+    pending = {}
+    if forecast:
+        pending['forecast'] = fanout.submit(get_forecast_data, lat, lon, bucket)
+    if air:
+        pending['air'] = fanout.submit(get_air_quality, round_coord(lat, 2), round_coord(lon, 2))
+    if weather:
+        pending['weather'] = fanout.submit(get_weather_by_coords, lat, lon, None, None, bucket)
+    return pending
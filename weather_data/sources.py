@@ -0,0 +1,135 @@
+"""로컬 데이터 원본: 한국 도시 테이블, 도시 스냅샷, 과거 관측 기록, 최근 관측값 공간 인덱스, IP 위치 데이터베이스."""
+
+import os
+import time
+
+from history_store import HistoryStore, observation_from_weather
+from ip_database import open_ip_database
+from snapshot import SnapshotIndex, read_snapshot
+
+from .cache import resource
+from .config import load_settings
+from .spatial import NearbyIndex
+
+
+@resource
+def get_korean_cities():
+    """한글-영문 도시 매핑 테이블을 반환합니다.
+    약 320개 항목의 테이블은 처음 필요할 때 한 번만 불러와 프로세스 전체에서 공유합니다."""
+    from korean_cities import KOREAN_CITIES
+    return KOREAN_CITIES
+
+
+def suggest_cities(query, limit=5):
+    """입력값으로 시작하는(없으면 입력값을 포함하는) 한국 도시 이름을 짧은 것부터 최대 limit개 반환합니다.
+    영문 이름으로 입력해도 한글 이름으로 찾아 줍니다."""
+    query = query.strip()
+    if not query:
+        return []
+    lowered = query.lower()
+    prefix, contains = [], []
+    for korean, english in get_korean_cities().items():
+        if korean.startswith(query) or english.lower().startswith(lowered):
+            prefix.append(korean)
+        elif query in korean:
+            contains.append(korean)
+    return (sorted(prefix, key=len) + sorted(contains, key=len))[:limit]
+
+
+@resource(max_entries=2)
+def _load_snapshot_index(path, mtime):
+    """스냅샷 파일을 읽어 인덱스를 만듭니다. 파일 수정 시각이 바뀌면 새로 읽습니다."""
+    snapshot = read_snapshot(path)
+    return SnapshotIndex(snapshot, max_age=load_settings()['snapshot_max_age']) if snapshot else None
+
+
+def get_snapshot():
+    """사용 가능한(충분히 최신인) 스냅샷 인덱스를 반환합니다. 없으면 None."""
+    settings = load_settings()
+    path = settings['snapshot_path']
+    try:
+        mtime = os.path.getmtime(path)
+    except OSError:
+        return None
+    index = _load_snapshot_index(path, mtime)
+    if index is None or time.time() - index.generated_at > settings['snapshot_max_age']:
+        return None
+    return index
+
+
+@resource(max_entries=2)
+def _load_ip_database(path, mtime):
+    """IP 위치 데이터베이스를 엽니다. 파일 수정 시각이 바뀌면 새로 엽니다."""
+    try:
+        return open_ip_database(path)
+    except (OSError, ValueError, RuntimeError):
+        return None
+
+
+def get_ip_database():
+    """로컬 IP 위치 데이터베이스를 반환합니다. 파일이 없거나 열 수 없으면 None."""
+    path = load_settings()['ip_db_path']
+    try:
+        mtime = os.path.getmtime(path)
+    except OSError:
+        return None
+    return _load_ip_database(path, mtime)
+
+
+def _snapshot_points():
+    """공간 인덱스 후보로 쓸 스냅샷 도시 목록 [(위도, 경도, 가져온 시각, 날씨를 돌려주는 함수)]."""
+    snapshot = get_snapshot()
+    if not snapshot:
+        return []
+
+    def loader(english_city):
+        # 나이는 공간 인덱스가 항목별 fetched_at으로 다시 거르므로 여기서는 확인하지 않음
+        return lambda: dict(snapshot.current(english_city, fresh=False), snapshot_version=snapshot.version)
+
+    return [(current['lat'], current['lon'], fetched_at, loader(english_city))
+            for english_city, current, fetched_at in snapshot.points()]
+
+
+@resource
+def get_nearby_index():
+    """최근 관측값과 스냅샷 도시로 만든 공간 인덱스를 반환합니다 (프로세스 공유)."""
+    settings = load_settings()
+    return NearbyIndex(
+        radius_km=settings['nearby_radius_km'],
+        max_age=settings['nearby_max_age'],
+        idw_k=settings['nearby_idw_k'],
+        extra_points=_snapshot_points
+    )
+
+
+@resource
+def get_history_store():
+    """프로세스 전체에서 공유하는 과거 날씨 저장소를 반환합니다."""
+    settings = load_settings()
+    return HistoryStore(
+        settings['history_dir'],
+        retention_days=settings['history_retention_days'],
+        downsample_after_days=settings['history_downsample_days']
+    )
+
+
+def record_observation(weather_data):
+    """가져온 현재 날씨를 과거 기록 저장소와 공간 인덱스에 남깁니다.
+    같은 관측 시각의 중복은 저장소에서 무시되며, 기록 실패가 화면 표시를 막지 않도록 합니다."""
+    get_nearby_index().add(weather_data)
+    try:
+        coord = weather_data['coord']
+        get_history_store().record(coord['lat'], coord['lon'], observation_from_weather(weather_data))
+    except (KeyError, IndexError, TypeError, ValueError, OSError):
+        pass
+
+
+def get_historical_weather(lat, lon, days_ago):
+    """특정 날짜의 과거 날씨 요약을 가져옵니다.
+    OpenWeather의 무료 API는 과거 데이터를 제공하지 않으므로,
+    앱이 지금까지 기록한 관측값으로 현지 날짜 기준 하루 요약을 만듭니다 (추가 API 호출 없음).
+    기록이 없으면 None을 반환합니다."""
+    try:
+        return get_history_store().daily_summary(lat, lon, days_ago)
+    except (OSError, ValueError):
+        return None
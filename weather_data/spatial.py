@@ -0,0 +1,198 @@
+"""최근 관측값 공간 인덱스.
+
+GPS/IP 좌표 조회가 이미 최신 데이터가 있는 지점 근처라면 upstream에 묻지 않고
+가까운 관측값으로 응답합니다. 좌표는 단위 구 위의 3차원 점으로 바꿔 KD-트리에 넣으므로
+직선(현) 거리 순서가 대권 거리 순서와 같고, 고위도나 날짜 변경선 근처에서도 정확합니다.
+"""
+
+import heapq
+import math
+import threading
+import time
+
+EARTH_RADIUS_KM = 6371.0088
+
+
+def to_unit_vector(lat, lon):
+    lat, lon = math.radians(lat), math.radians(lon)
+    cos_lat = math.cos(lat)
+    return (cos_lat * math.cos(lon), cos_lat * math.sin(lon), math.sin(lat))
+
+
+def chord_to_km(chord):
+    return 2 * EARTH_RADIUS_KM * math.asin(min(1.0, chord / 2))
+
+
+def km_to_chord(km):
+    return 2 * math.sin(min(math.pi, km / EARTH_RADIUS_KM) / 2)
+
+
+class KDTree:
+    """3차원 점의 정적 KD-트리. points는 (x, y, z) 목록이고 결과는 points의 인덱스입니다."""
+
+    def __init__(self, points):
+        self.points = points
+        # 노드: (점 인덱스, 분할 축, 왼쪽, 오른쪽)
+        self.root = self._build(list(range(len(points))), 0)
+
+    def _build(self, indices, depth):
+        if not indices:
+            return None
+        axis = depth % 3
+        indices.sort(key=lambda i: self.points[i][axis])
+        mid = len(indices) // 2
+        return (
+            indices[mid],
+            axis,
+            self._build(indices[:mid], depth + 1),
+            self._build(indices[mid + 1:], depth + 1)
+        )
+
+    def nearest(self, target, k=1, max_distance=math.inf):
+        """target에서 max_distance 안에 있는 가장 가까운 k개를 [(거리, 인덱스), ...] 오름차순으로 반환합니다."""
+        heap = []  # (-거리, 인덱스) 최대 힙
+        bound = max_distance
+
+        def visit(node):
+            nonlocal bound
+            if node is None:
+                return
+            index, axis, left, right = node
+            point = self.points[index]
+            distance = math.dist(point, target)
+            if distance <= bound:
+                heapq.heappush(heap, (-distance, index))
+                if len(heap) > k:
+                    heapq.heappop(heap)
+                if len(heap) == k:
+                    bound = min(bound, -heap[0][0])
+            diff = target[axis] - point[axis]
+            near, far = (left, right) if diff < 0 else (right, left)
+            visit(near)
+            if abs(diff) <= bound:
+                visit(far)
+
+        visit(self.root)
+        return sorted((-negative, index) for negative, index in heap)
+
+
+class NearbyIndex:
+    """최근 관측값을 모아 "R km 안, T초 이내"의 가까운 값으로 좌표 조회에 응답합니다.
+
+    radius_km: 이 거리 안의 관측값만 사용
+    max_age: 가져온 지 이 시간(초)이 지난 관측값은 사용하지 않음
+    idw_k: 2 이상이면 가까운 k개의 기온/체감/습도/풍속을 거리 역가중 평균으로 보간
+    extra_points: 추가 후보 [(위도, 경도, 가져온 시각, 날씨를 돌려주는 함수)]를 반환하는 함수 (스냅샷 등)
+    """
+
+    def __init__(self, radius_km=3.0, max_age=600, idw_k=0, extra_points=None, rebuild_interval=1.0):
+        self.radius_km = radius_km
+        self.max_age = max_age
+        self.idw_k = idw_k
+        self.extra_points = extra_points
+        self.rebuild_interval = rebuild_interval
+        self._lock = threading.Lock()
+        self._observations = {}  # (위도, 경도) 반올림 -> (위도, 경도, 가져온 시각, 날씨 dict)
+        self._dirty = True
+        self._built_at = 0.0
+        self._tree = None
+        self._entries = []
+        self.hits = 0
+        self.misses = 0
+
+    def add(self, weather_data):
+        """upstream에서 가져온 현재 날씨를 후보에 넣습니다. 같은 좌표는 더 최신 값으로 바꿉니다."""
+        try:
+            lat, lon = float(weather_data['coord']['lat']), float(weather_data['coord']['lon'])
+        except (KeyError, TypeError, ValueError):
+            return
+        fetched_at = weather_data.get('fetched_at') or time.time()
+        key = (round(lat, 4), round(lon, 4))
+        with self._lock:
+            current = self._observations.get(key)
+            if current is None or current[2] < fetched_at:
+                self._observations[key] = (lat, lon, fetched_at, weather_data)
+                self._dirty = True
+
+    def _rebuild(self, now):
+        cutoff = now - self.max_age
+        self._observations = {key: obs for key, obs in self._observations.items() if obs[2] >= cutoff}
+        entries = [(lat, lon, fetched_at, (lambda data=data: data))
+                   for lat, lon, fetched_at, data in self._observations.values()]
+        if self.extra_points:
+            entries.extend(entry for entry in self.extra_points() if entry[2] >= cutoff)
+        self._entries = entries
+        self._tree = KDTree([to_unit_vector(lat, lon) for lat, lon, _, _ in entries]) if entries else None
+        self._dirty = False
+        self._built_at = now
+
+    def _current_tree(self):
+        now = time.time()
+        with self._lock:
+            # 새 관측값이 들어왔거나 오래된 값이 만료될 때가 되면 다시 만듦 (최소 간격 rebuild_interval초)
+            if (self._dirty or now - self._built_at > self.max_age / 4) and now - self._built_at >= self.rebuild_interval:
+                self._rebuild(now)
+            return self._tree, self._entries
+
+    def _count(self, name):
+        # 여러 세션의 스레드가 같은 인덱스를 공유하므로 잠금 안에서 갱신
+        with self._lock:
+            setattr(self, name, getattr(self, name) + 1)
+
+    def lookup(self, lat, lon, name=None, country=None):
+        """조건에 맞는 가까운 관측값으로 만든 날씨 dict를 반환합니다. 없으면 None.
+        결과의 좌표(와 지정한 경우 이름/국가)는 요청한 값을 유지하고 관측값만 빌려오며,
+        빌려온 지점은 'nearby'에 기록합니다."""
+        tree, entries = self._current_tree()
+        if tree is None:
+            self._count('misses')
+            return None
+
+        k = max(1, self.idw_k)
+        # 만료된 점이 섞여 있을 수 있으므로 여유 있게 찾은 뒤 걸러냄
+        found = tree.nearest(to_unit_vector(lat, lon), k=k * 2 + 2, max_distance=km_to_chord(self.radius_km))
+        cutoff = time.time() - self.max_age
+        neighbors = [(chord_to_km(chord), entries[i]) for chord, i in found if entries[i][2] >= cutoff][:k]
+        if not neighbors:
+            self._count('misses')
+            return None
+        self._count('hits')
+
+        distance_km, (source_lat, source_lon, fetched_at, get_data) = neighbors[0]
+        nearest = get_data()
+        # 요청한 위치로 표시하고, 값을 빌려온 지점은 nearby에 남김
+        place = {'coord': {'lat': lat, 'lon': lon}}
+        if name is not None:
+            place['name'] = name
+        if country is not None:
+            place['sys'] = dict(nearest.get('sys', {}), country=country)
+        source = {'source': nearest.get('name', ''), 'source_coord': {'lat': source_lat, 'lon': source_lon},
+                  'distance_km': distance_km}
+        if len(neighbors) == 1 or distance_km < 0.05:
+            return dict(nearest, **place, nearby=dict(source, points=1))
+
+        samples = [(distance, get_data()) for distance, (_, _, _, get_data) in neighbors]
+        weights = [1 / distance ** 2 for distance, _ in samples]
+        total = sum(weights)
+
+        def blend(read):
+            return sum(weight * read(data) for weight, (_, data) in zip(weights, samples)) / total
+
+        return dict(
+            nearest,
+            **place,
+            main=dict(
+                nearest['main'],
+                temp=blend(lambda data: data['main']['temp']),
+                feels_like=blend(lambda data: data['main']['feels_like']),
+                humidity=round(blend(lambda data: data['main']['humidity']))
+            ),
+            wind=dict(nearest.get('wind', {}), speed=round(blend(lambda data: data.get('wind', {}).get('speed', 0)), 1)),
+            # 보간에 쓴 값 중 가장 오래된 시각 (캐시 나이 계산이 낙관적이지 않도록)
+            fetched_at=min(entry[2] for _, entry in neighbors),
+            nearby=dict(source, points=len(samples))
+        )
+
+    def stats(self):
+        with self._lock:
+            return {'points': len(self._entries), 'hits': self.hits, 'misses': self.misses}
@@ -0,0 +1,84 @@
+"""예보 시각 인덱스.
+
+예보 항목의 dt(UTC 초)를 응답의 timezone(UTC 오프셋 초) 기준 현지 날짜/시/요일 배열로
+한 번만 변환합니다. datetime 객체를 항목마다 만들지 않고 정수 연산으로 계산하며,
+날짜 문자열과 요일 이름은 캐시된 표에서 가져옵니다.
+일별/시간별 집계, 화면, 헤드리스 API가 모두 이 인덱스를 사용하므로 같은 현지 시간을 보여줍니다.
+"""
+
+import functools
+from datetime import date
+from typing import NamedTuple, Tuple
+
+SECONDS_PER_DAY = 86400
+_EPOCH_ORDINAL = date(1970, 1, 1).toordinal()
+
+# date.weekday() 순서 (월요일 = 0)
+WEEKDAY_NAMES = ('월', '화', '수', '목', '금', '토', '일')
+
+_HOUR_LABELS = tuple(f"{hour:02d}:00" for hour in range(24))
+
+
+@functools.lru_cache(maxsize=1024)
+def day_labels(day_number):
+    """1970-01-01부터의 일 수 → (YYYY-MM-DD, MM/DD, 요일 번호)."""
+    day = date.fromordinal(_EPOCH_ORDINAL + day_number)
+    return day.isoformat(), f"{day.month:02d}/{day.day:02d}", day.weekday()
+
+
+@functools.lru_cache(maxsize=1024)
+def date_labels(date_key):
+    """'YYYY-MM-DD' → (MM/DD, 요일 이름)."""
+    day = date.fromisoformat(date_key)
+    return f"{day.month:02d}/{day.day:02d}", WEEKDAY_NAMES[day.weekday()]
+
+
+def _clock_label(seconds_of_day):
+    hour, minute = divmod(seconds_of_day // 60, 60)
+    return _HOUR_LABELS[hour] if minute == 0 else f"{hour:02d}:{minute:02d}"
+
+
+class TimeIndex(NamedTuple):
+    """예보 항목 순서대로 나열한 현지 시각 배열."""
+    dates: Tuple[str, ...]     # 'YYYY-MM-DD'
+    days: Tuple[str, ...]      # 'MM/DD'
+    weekdays: Tuple[int, ...]  # 0=월요일
+    hours: Tuple[int, ...]     # 0~23
+    clocks: Tuple[str, ...]    # 'HH:MM'
+
+    def label(self, i):
+        """'MM/DD HH:MM' 형식의 현지 시각."""
+        return f"{self.days[i]} {self.clocks[i]}"
+
+    def local_time(self, i):
+        """'YYYY-MM-DD HH:MM' 형식의 현지 시각."""
+        return f"{self.dates[i]} {self.clocks[i]}"
+
+
+def build_time_index(timestamps, timezone_offset=0):
+    """UTC 초 목록을 현지 시각 인덱스로 변환합니다."""
+    dates, days, weekdays, hours, clocks = [], [], [], [], []
+    for dt in timestamps:
+        day_number, seconds = divmod(int(dt) + timezone_offset, SECONDS_PER_DAY)
+        date_key, day_label, weekday = day_labels(day_number)
+        dates.append(date_key)
+        days.append(day_label)
+        weekdays.append(weekday)
+        hours.append(seconds // 3600)
+        clocks.append(_clock_label(seconds))
+    return TimeIndex(tuple(dates), tuple(days), tuple(weekdays), tuple(hours), tuple(clocks))
+
+
+def forecast_time_index(forecast_data, section='list'):
+    """예보 응답의 section('list' 또는 'daily') 항목에 대한 현지 시각 인덱스를 반환합니다.
+
+    같은 응답에 대해서는 처음 한 번만 계산해 응답 dict에 붙여 둡니다.
+    입력이 같으면 결과도 같으므로 캐시로 공유되는 응답에 붙여도 안전합니다.
+    """
+    cache_key = f'_time_index_{section}'
+    index = forecast_data.get(cache_key)
+    if index is None:
+        timezone_offset = forecast_data.get('city', {}).get('timezone', 0)
+        index = build_time_index((item['dt'] for item in forecast_data.get(section) or ()), timezone_offset)
+        forecast_data[cache_key] = index
+    return index
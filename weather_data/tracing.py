@@ -0,0 +1,176 @@
+"""실행 단위 추적 (span 트리).
+
+Streamlit rerun 한 번(main 실행)처럼 하나의 작업을 trace로 묶고, 그 안의 조회/집계/렌더링 단계를
+span으로 기록합니다. 표본으로 뽑힌 trace만 기록하며, 끝나면 JSON Lines 파일에 한 줄로 내보냅니다.
+필드 이름은 OpenTelemetry(trace_id, span_id, parent_span_id, attributes)를 따르므로
+trace_viewer.py로 보거나 다른 수집기로 옮기기 쉽습니다.
+
+현재 span은 contextvars로 전달하므로 같은 스레드(또는 같은 컨텍스트) 안에서만 부모-자식이 이어집니다.
+표본이 아닌 실행에서는 span()과 annotate()가 아무것도 하지 않습니다.
+"""
+
+import contextlib
+import contextvars
+import functools
+import json
+import os
+import random
+import threading
+import time
+from collections import deque
+
+_current_span = contextvars.ContextVar('weather_trace_span', default=None)
+
+
+class Span:
+    __slots__ = ('trace', 'name', 'span_id', 'parent_id', 'started', 'duration', 'attributes')
+
+    def __init__(self, trace, name, parent_id, attributes):
+        self.trace = trace
+        self.name = name
+        self.span_id = os.urandom(8).hex()
+        self.parent_id = parent_id
+        self.started = time.perf_counter()
+        self.duration = None
+        self.attributes = dict(attributes)
+
+    def set(self, **attributes):
+        self.attributes.update(attributes)
+
+
+class Trace:
+    def __init__(self, name):
+        self.trace_id = os.urandom(16).hex()
+        self.name = name
+        self.started_at = time.time()
+        self.spans = []
+
+    def to_record(self):
+        root = self.spans[0]
+        return {
+            'trace_id': self.trace_id,
+            'name': self.name,
+            'start_time': self.started_at,
+            'duration_ms': round(root.duration * 1000, 3),
+            'attributes': root.attributes,
+            'spans': [{
+                'span_id': span.span_id,
+                'parent_span_id': span.parent_id,
+                'name': span.name,
+                'start_offset_ms': round((span.started - root.started) * 1000, 3),
+                'duration_ms': round((span.duration or 0) * 1000, 3),
+                'attributes': span.attributes
+            } for span in self.spans]
+        }
+
+
+@contextlib.contextmanager
+def _open_span(trace, name, parent_id, attributes):
+    span = Span(trace, name, parent_id, attributes)
+    trace.spans.append(span)
+    token = _current_span.set(span)
+    try:
+        yield span
+    except BaseException as e:
+        span.set(error=type(e).__name__)
+        raise
+    finally:
+        span.duration = time.perf_counter() - span.started
+        _current_span.reset(token)
+
+
+class _NoopSpan:
+    def set(self, **attributes):
+        pass
+
+
+NOOP_SPAN = _NoopSpan()
+
+
+class Tracer:
+    """trace 표본 추출과 내보내기.
+
+    path: trace를 한 줄씩 추가할 JSONL 파일 (None이면 파일에 쓰지 않음)
+    sample_rate: 기록할 실행의 비율 (0~1)
+    max_bytes: 파일이 이보다 커지면 <path>.1로 옮기고 새로 시작
+    keep: 진단 화면용으로 메모리에 보관할 최근 trace 수
+    """
+
+    def __init__(self, path=None, sample_rate=0.1, max_bytes=10 * 1024 * 1024, keep=50):
+        self.path = path
+        self.sample_rate = sample_rate
+        self.max_bytes = max_bytes
+        self._recent = deque(maxlen=keep)
+        self._lock = threading.Lock()
+
+    @contextlib.contextmanager
+    def trace(self, name, force=False, **attributes):
+        """name으로 trace를 시작합니다. 이미 trace 안이면 그 안의 span이 됩니다.
+        force가 참이면 표본 비율과 관계없이 기록합니다."""
+        if _current_span.get() is not None:
+            with span(name, **attributes) as current:
+                yield current
+            return
+        if not force and (self.sample_rate <= 0 or random.random() >= self.sample_rate):
+            yield NOOP_SPAN
+            return
+
+        trace = Trace(name)
+        try:
+            with _open_span(trace, name, None, attributes) as root:
+                yield root
+        finally:
+            self._export(trace)
+
+    def _export(self, trace):
+        record = trace.to_record()
+        with self._lock:
+            self._recent.append(record)
+            if not self.path:
+                return
+            try:
+                os.makedirs(os.path.dirname(os.path.abspath(self.path)), exist_ok=True)
+                if os.path.exists(self.path) and os.path.getsize(self.path) > self.max_bytes:
+                    os.replace(self.path, f"{self.path}.1")
+                with open(self.path, 'a', encoding='utf-8') as f:
+                    f.write(json.dumps(record, ensure_ascii=False, separators=(',', ':')) + '\n')
+            except OSError:
+                pass
+
+    def recent(self):
+        """메모리에 보관한 최근 trace 기록 (오래된 것부터)."""
+        with self._lock:
+            return list(self._recent)
+
+
+@contextlib.contextmanager
+def span(name, **attributes):
+    """현재 trace 안에 자식 span을 엽니다. 기록 중인 trace가 없으면 아무것도 하지 않습니다."""
+    parent = _current_span.get()
+    if parent is None:
+        yield NOOP_SPAN
+        return
+    with _open_span(parent.trace, name, parent.span_id, attributes) as current:
+        yield current
+
+
+def annotate(**attributes):
+    """현재 span에 속성을 추가합니다 (캐시 적중 여부, 응답 크기, 데이터 출처 등)."""
+    current = _current_span.get()
+    if current is not None:
+        current.set(**attributes)
+
+
+def traced(name=None):
+    """함수 호출 전체를 span으로 기록하는 데코레이터."""
+    def decorator(func):
+        span_name = name or func.__name__
+
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            if _current_span.get() is None:
+                return func(*args, **kwargs)
+            with span(span_name):
+                return func(*args, **kwargs)
+        return wrapper
+    return decorator
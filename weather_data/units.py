@@ -0,0 +1,86 @@
+"""표시 단위/언어 변환.
+
+upstream 응답은 한 가지 기준 형태(°C, m/s, 상태 ID와 영어 설명)로만 가져와 캐시하고,
+사용자가 고른 단위와 언어는 화면에 그릴 때 여기서 변환합니다.
+단위나 언어를 바꿔도 upstream 요청이나 캐시 항목은 늘어나지 않습니다.
+
+예보는 항목 전체의 기온/풍속을 한 번의 배열 연산으로 변환하고,
+forecast_time_index()처럼 결과를 응답 dict에 붙여 둡니다.
+"""
+
+from typing import NamedTuple
+
+import numpy as np
+
+from .conditions import DEFAULT_LANGUAGE, weather_description
+
+
+class UnitSystem(NamedTuple):
+    """기준 단위(°C, m/s)에서 표시 단위로의 변환: 값 * scale + offset."""
+    label: str
+    temp_symbol: str
+    speed_symbol: str
+    temp_scale: float
+    temp_offset: float
+    speed_scale: float
+
+
+UNIT_SYSTEMS = {
+    'metric': UnitSystem('섭씨 (°C, m/s)', '°C', 'm/s', 1.0, 0.0, 1.0),
+    'imperial': UnitSystem('화씨 (°F, mph)', '°F', 'mph', 9 / 5, 32.0, 1 / 0.44704),
+    'standard': UnitSystem('켈빈 (K, m/s)', 'K', 'm/s', 1.0, 273.15, 1.0),
+}
+
+DEFAULT_UNITS = 'metric'
+
+# 변환하는 기온 필드 (항목의 'main' 안)
+TEMPERATURE_FIELDS = ('temp', 'feels_like', 'temp_min', 'temp_max')
+
+
+def unit_system(units=DEFAULT_UNITS):
+    return UNIT_SYSTEMS.get(units, UNIT_SYSTEMS[DEFAULT_UNITS])
+
+
+def convert_temperature(values, units=DEFAULT_UNITS):
+    """°C 값(또는 배열)을 units의 기온 단위로 변환합니다."""
+    system = unit_system(units)
+    return np.asarray(values, dtype=float) * system.temp_scale + system.temp_offset
+
+
+def convert_speed(values, units=DEFAULT_UNITS):
+    """m/s 값(또는 배열)을 units의 풍속 단위로 변환합니다."""
+    return np.asarray(values, dtype=float) * unit_system(units).speed_scale
+
+
+def localize_items(items, units=DEFAULT_UNITS, lang=DEFAULT_LANGUAGE):
+    """/weather 또는 /forecast 항목 목록을 표시용 컬럼으로 변환합니다.
+
+    반환: {'temp', 'feels_like', 'temp_min', 'temp_max', 'wind_speed'(배열), 'description'(목록)}
+    """
+    system = unit_system(units)
+    temps = np.array(
+        [[item['main'].get(field, item['main']['temp']) for field in TEMPERATURE_FIELDS] for item in items],
+        dtype=float
+    ).reshape(-1, len(TEMPERATURE_FIELDS))
+    temps = temps * system.temp_scale + system.temp_offset
+    wind = np.fromiter(((item.get('wind') or {}).get('speed', 0) for item in items), float, len(items))
+    columns = {field: temps[:, i] for i, field in enumerate(TEMPERATURE_FIELDS)}
+    columns['wind_speed'] = wind * system.speed_scale
+    columns['description'] = [weather_description(item, lang) for item in items]
+    return columns
+
+
+def localized_weather(weather_data, units=DEFAULT_UNITS, lang=DEFAULT_LANGUAGE):
+    """현재 날씨 한 건의 표시용 값 {'temp', ..., 'wind_speed', 'description'}."""
+    columns = localize_items([weather_data], units, lang)
+    return {name: values[0].item() if hasattr(values[0], 'item') else values[0] for name, values in columns.items()}
+
+
+def localized_forecast(forecast_data, units=DEFAULT_UNITS, lang=DEFAULT_LANGUAGE, section='list'):
+    """예보 응답 section 항목 순서대로 표시용 컬럼을 반환합니다 (단위/언어 조합마다 한 번만 계산)."""
+    cache_key = f'_localized_{section}_{units}_{lang}'
+    columns = forecast_data.get(cache_key)
+    if columns is None:
+        columns = localize_items(forecast_data.get(section) or [], units, lang)
+        forecast_data[cache_key] = columns
+    return columns